@@ -26,6 +26,8 @@ from .stem_player import StemPlayer
 from .gesture_controller import MixerGestureController
 from .keyboard_controller import MixerKeyboardController
 from .scene_manager import SceneManager
+from .scene_cache import SceneCache
+from .library_index import LibraryIndex
 
 __all__ = [
     "AdaptiveMixer",
@@ -34,4 +36,6 @@ __all__ = [
     "MixerGestureController",
     "MixerKeyboardController",
     "SceneManager",
+    "SceneCache",
+    "LibraryIndex",
 ]
@@ -0,0 +1,236 @@
+"""
+BlockSizeTuner — Picks the smallest stable audio block size for this machine.
+
+The mixer reports the wall-clock cost of every audio callback and whether the
+device signalled an underflow. A monitor thread periodically evaluates those
+measurements and walks a ladder of (block_size, latency) settings:
+
+    * step up when the 95th-percentile callback cost exceeds SAFETY_LOAD of the
+      block period, or underflows exceed MAX_UNDERFLOW_RATE;
+    * step down after STABLE_SECONDS of headroom, if the current cost would
+      still leave a margin at the smaller block. A level that failed is not
+      retried for RETRY_SECONDS.
+
+On a device with no persisted level, calibrate() picks the starting level
+from a few timed dry renders of the loaded scene instead of sitting at
+DEFAULT_LEVEL until the first STABLE_SECONDS have passed.
+
+A caller can set a minimum block size (set_min_block_size) that the ladder
+will not go below, e.g. while a pitch-shifting input bus runs at the engine's
+block size. The chosen level is persisted per output device in
+config/audio_tuning.yaml.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import yaml
+
+
+TUNING_CONFIG_PATH = "config/audio_tuning.yaml"
+
+
+class BlockSizeTuner:
+    # (block_size, sounddevice latency) from most to least aggressive
+    LEVELS = (
+        (256, "low"),
+        (512, "low"),
+        (1024, "low"),
+        (1024, "high"),
+        (2048, "high"),
+        (4096, "high"),
+    )
+    DEFAULT_LEVEL = 2           # 1024 / low — the historical fixed setting
+
+    SAFETY_LOAD = 0.6           # p95 cost must stay under this fraction of the period
+    STEP_DOWN_LOAD = 0.35       # predicted load at the smaller block must stay under this
+    MAX_UNDERFLOW_RATE = 0.002  # underflows per callback
+    WINDOW_SECONDS = 3.0        # minimum audio time per evaluation
+    STABLE_SECONDS = 30.0       # headroom required before stepping down
+    RETRY_SECONDS = 300.0       # back-off before retrying a level that failed
+    CALIBRATION_RENDERS = 3     # timed dry renders per level; the slowest counts
+
+    def __init__(self, sample_rate: int, device_name: str,
+                 config_path: str = TUNING_CONFIG_PATH):
+        self._sample_rate = sample_rate
+        self._device_name = device_name
+        self._config_path = config_path
+
+        self._persisted = False     # set by _load_level() if the device has a saved level
+        self._level = self._load_level()
+        self._min_level = 0
+        self._failed_at: dict = {}  # level -> monotonic time of last failure
+        self._stable_since = time.monotonic()
+
+        # Written by the audio callback only; read by evaluate()
+        self._costs = np.zeros(4096, dtype=np.float64)
+        self._count = 0
+        self._underflows = 0
+
+        self._eval_count = 0
+        self._eval_underflows = 0
+        self._lock = threading.Lock()
+
+    # ── Settings ───────────────────────────────────────────────────
+
+    @property
+    def block_size(self) -> int:
+        return self.LEVELS[self._active_level][0]
+
+    @property
+    def latency(self) -> str:
+        return self.LEVELS[self._active_level][1]
+
+    @property
+    def _active_level(self) -> int:
+        return max(self._level, self._min_level)
+
+    def set_min_block_size(self, block_size: int) -> Optional[tuple]:
+        """
+        Keep the ladder at or above `block_size` (0 lifts the floor).
+        Returns the new (block_size, latency) if the active setting changed,
+        else None. The persisted level is left alone.
+        """
+        with self._lock:
+            old = self.LEVELS[self._active_level]
+            self._min_level = next(
+                (i for i, (size, _) in enumerate(self.LEVELS) if size >= block_size),
+                len(self.LEVELS) - 1,
+            )
+            self._stable_since = time.monotonic()
+            new = self.LEVELS[self._active_level]
+            return new if new != old else None
+
+    # ── Measurement (audio thread) ─────────────────────────────────
+
+    def record(self, elapsed_seconds: float, underflow: bool):
+        """Record one callback. Called from the audio callback — no locks, no allocation."""
+        self._costs[self._count % len(self._costs)] = elapsed_seconds
+        self._count += 1
+        if underflow:
+            self._underflows += 1
+
+    # ── Evaluation (monitor thread) ────────────────────────────────
+
+    def evaluate(self) -> Optional[tuple]:
+        """
+        Inspect measurements since the last evaluation.
+        Returns the new (block_size, latency) if the stream should be
+        restarted, else None.
+        """
+        with self._lock:
+            count, underflows = self._count, self._underflows
+            n = count - self._eval_count
+            level = self._active_level
+            period = self.LEVELS[level][0] / self._sample_rate
+            if n * period < self.WINDOW_SECONDS:
+                return None
+
+            window = min(n, len(self._costs))
+            idx = (np.arange(count - window, count)) % len(self._costs)
+            p95 = float(np.percentile(self._costs[idx], 95))
+            underflow_rate = (underflows - self._eval_underflows) / n
+            self._eval_count, self._eval_underflows = count, underflows
+
+            now = time.monotonic()
+            load = p95 / period
+
+            if load > self.SAFETY_LOAD or underflow_rate > self.MAX_UNDERFLOW_RATE:
+                self._failed_at[level] = now
+                self._stable_since = now
+                if level + 1 < len(self.LEVELS):
+                    return self._change_level(
+                        level + 1,
+                        f"load {load:.0%}, underflows {underflow_rate:.2%}",
+                    )
+                return None
+
+            if level > self._min_level and now - self._stable_since >= self.STABLE_SECONDS:
+                lower = level - 1
+                lower_period = self.LEVELS[lower][0] / self._sample_rate
+                # Assume the cost does not shrink with the block (worst case)
+                predicted = p95 / lower_period
+                recently_failed = now - self._failed_at.get(lower, -1e9) < self.RETRY_SECONDS
+                if predicted < self.STEP_DOWN_LOAD and not recently_failed:
+                    self._stable_since = now
+                    return self._change_level(lower, f"predicted load {predicted:.0%}")
+            return None
+
+    @property
+    def needs_calibration(self) -> bool:
+        return not self._persisted
+
+    def calibrate(self, render: Callable[[int], None]) -> Optional[tuple]:
+        """
+        Time `render(block_size)` (one block's mixing work, without output)
+        at each level, most aggressive first, and start at the first level
+        whose cost stays under STEP_DOWN_LOAD of its period. The result is
+        persisted. Returns the new (block_size, latency) if it changed.
+        """
+        chosen = len(self.LEVELS) - 1
+        for level in range(self._min_level, len(self.LEVELS)):
+            block_size = self.LEVELS[level][0]
+            cost = 0.0
+            for _ in range(self.CALIBRATION_RENDERS):
+                t_start = time.perf_counter()
+                render(block_size)
+                cost = max(cost, time.perf_counter() - t_start)
+            load = cost / (block_size / self._sample_rate)
+            if load < self.STEP_DOWN_LOAD:
+                chosen = level
+                break
+        with self._lock:
+            self._persisted = True
+            self._stable_since = time.monotonic()
+            if chosen == self._level:
+                self._save_level()
+                return None
+            return self._change_level(chosen, f"calibrated, load {load:.0%}")
+
+    def reset_window(self):
+        """Discard measurements taken so far (e.g. across a stream restart)."""
+        with self._lock:
+            self._eval_count, self._eval_underflows = self._count, self._underflows
+
+    def _change_level(self, level: int, reason: str) -> tuple:
+        old = self.LEVELS[self._active_level]
+        self._level = level
+        new = self.LEVELS[level]
+        print(f"[BlockTuner] {old[0]}/{old[1]} -> {new[0]}/{new[1]} ({reason})")
+        self._save_level()
+        return new
+
+    # ── Persistence ────────────────────────────────────────────────
+
+    def _read_config(self) -> dict:
+        try:
+            with open(self._config_path, "r") as f:
+                return yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"[BlockTuner] Could not read {self._config_path}: {e}")
+            return {}
+
+    def _load_level(self) -> int:
+        entry = self._read_config().get("devices", {}).get(self._device_name)
+        if entry:
+            setting = (entry.get("block_size"), entry.get("latency"))
+            if setting in self.LEVELS:
+                self._persisted = True
+                return self.LEVELS.index(setting)
+        return self.DEFAULT_LEVEL
+
+    def _save_level(self):
+        cfg = self._read_config()
+        cfg.setdefault("devices", {})[self._device_name] = {
+            "block_size": self.block_size,
+            "latency": self.latency,
+        }
+        try:
+            with open(self._config_path, "w") as f:
+                yaml.dump(cfg, f, default_flow_style=False)
+        except Exception as e:
+            print(f"[BlockTuner] Could not save {self._config_path}: {e}")
@@ -0,0 +1,83 @@
+"""
+intensity_beds — Pre-mixed stereo beds, one per intensity level.
+
+In many scenes each intensity level is just a fixed set of stems at their
+default volumes. For scenes that opt in with `"premix_beds": true` in
+scene.json, the scene cache sums those stems once per level (0..highest
+`intensity` in layer_groups). The mixer then plays one bed instead of N
+stems and crossfades between two beds on set_intensity().
+
+A bed reproduces exactly what set_intensity() would do with live stems:
+a stem in a layer group is on when its group's intensity is <= the level,
+an ungrouped stem is on when it is always_on.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from .stem_fx import PEDALBOARD_AVAILABLE
+
+
+def bed_levels(config: dict) -> list:
+    """Intensity levels a scene can have beds for."""
+    groups = config.get("layer_groups", {}).values()
+    if not groups:
+        return []
+    return list(range(0, max(g.get("intensity", 0) for g in groups) + 1))
+
+
+def bed_members(config: dict, level: int) -> dict:
+    """Stems audible at `level` after set_intensity(level): stem_id -> volume."""
+    stems_cfg = config.get("stems", {})
+    on = {}
+    for group in config.get("layer_groups", {}).values():
+        for stem_id in group.get("stems", []):
+            on[stem_id] = group.get("intensity", 0) <= level
+    for stem_id, stem_cfg in stems_cfg.items():
+        if stem_id not in on:
+            on[stem_id] = stem_cfg.get("always_on", False)
+    return {
+        stem_id: stems_cfg.get(stem_id, {}).get("default_volume", 0.5)
+        for stem_id, is_on in on.items() if is_on and stem_id in stems_cfg
+    }
+
+
+def render_beds(config: dict, stems: dict, baked: set, gains: Optional[dict] = None) -> dict:
+    """
+    Sum decoded stems into one planar bed per intensity level.
+
+    Args:
+        stems: stem_id -> planar array, as held by the scene cache.
+        baked: stem ids whose effects are already in their audio.
+        gains: stem_id -> loudness trim the live stems play with (see stem_analysis).
+
+    Returns level -> planar float32 array, or {} if the scene cannot be
+    represented by beds (missing stems, live effects, uneven lengths).
+    """
+    name = config.get("name", "scene")
+    levels = bed_levels(config)
+    if not levels or not stems:
+        return {}
+
+    live_fx = [s for s in config.get("effects", {}) if s in stems and s not in baked]
+    if live_fx and PEDALBOARD_AVAILABLE:
+        print(f"[IntensityBeds] {name}: live effects on {', '.join(live_fx)}, using live stems")
+        return {}
+    if len({a.shape for a in stems.values()}) > 1:
+        print(f"[IntensityBeds] {name}: stems differ in length, using live stems")
+        return {}
+
+    shape = next(iter(stems.values())).shape
+    beds = {}
+    for level in levels:
+        members = bed_members(config, level)
+        missing = [s for s in members if s not in stems]
+        if missing:
+            print(f"[IntensityBeds] {name}: missing {', '.join(missing)}, using live stems")
+            return {}
+        bed = np.zeros(shape, dtype=np.float32)
+        for stem_id, volume in members.items():
+            bed += stems[stem_id] * np.float32(volume * (gains or {}).get(stem_id, 1.0))
+        beds[level] = bed
+    return beds
@@ -11,10 +11,17 @@ Key mapping (all require Ctrl modifier):
     Ctrl+Right            : Increase intensity
     Ctrl+Left             : Decrease intensity
     Ctrl+space            : Panic (fade all to silence)
+    Ctrl+R                : Start/stop session recording
+    Ctrl+B                : Save the replay buffer (last few minutes)
 
 Function keys (no modifier needed — not used by existing system):
     F1-F9                 : Load scene by index
     F10                   : Cycle to next scene
+
+Scene loads go through the mixer's latest-wins loader, so rapid presses only
+swap in the last requested scene. Scenes reachable from a single key press
+(the next F10 scene and the F1-F9 scenes) are preloaded into the mixer's
+scene cache in the background.
 """
 
 from .mixer import AdaptiveMixer
@@ -30,6 +37,19 @@ class MixerKeyboardController:
     def set_available_scenes(self, scene_dirs: list):
         """Set the list of available scene directories for cycling."""
         self._available_scenes = scene_dirs
+        self._preload_likely_scenes()
+
+    def _preload_likely_scenes(self):
+        """Preload the next F10 scene first, then the scenes bound to F1-F9."""
+        if not self._available_scenes:
+            return
+        likely = [
+            self._available_scenes[self._scene_cycle_idx % len(self._available_scenes)]
+        ]
+        for scene_dir in self._available_scenes[:9]:
+            if scene_dir not in likely:
+                likely.append(scene_dir)
+        self._mixer.preload_scenes(likely)
 
     def handle_ctrl_key(self, key: str):
         """
@@ -87,6 +107,21 @@ class MixerKeyboardController:
             print("[MixerKeys] PANIC — all silent")
             return
 
+        # Ctrl+R: start/stop session recording
+        if key_lower == "r":
+            recorder = self._mixer.recorder
+            if recorder.is_recording:
+                recorder.stop_recording()
+            else:
+                recorder.start_recording()
+            return
+
+        # Ctrl+B: save the last few minutes
+        if key_lower == "b":
+            path = self._mixer.recorder.save_replay()
+            print(f"[MixerKeys] Saving replay: {path}" if path else "[MixerKeys] Replay buffer disabled")
+            return
+
 
     def handle_function_key(self, key: str):
         """
@@ -103,25 +138,19 @@ class MixerKeyboardController:
                 scene_dir = self._available_scenes[
                     self._scene_cycle_idx % len(self._available_scenes)
                 ]
-                import threading
-                t = threading.Thread(
-                    target=self._mixer.load_scene, args=(scene_dir,), daemon=True
-                )
-                t.start()
+                self._mixer.request_scene(scene_dir)
                 self._scene_cycle_idx = (
                     self._scene_cycle_idx + 1
                 ) % len(self._available_scenes)
                 print(f"[MixerKeys] Loading scene: {scene_dir}")
+                self._preload_likely_scenes()
             return
 
         if key_lower.startswith("f") and key_lower[1:].isdigit():
             scene_idx = int(key_lower[1:]) - 1
             if 0 <= scene_idx < len(self._available_scenes):
                 scene_dir = self._available_scenes[scene_idx]
-                import threading
-                t = threading.Thread(
-                    target=self._mixer.load_scene, args=(scene_dir,), daemon=True
-                )
-                t.start()
+                self._mixer.request_scene(scene_dir)
                 print(f"[MixerKeys] Loading scene: {scene_dir}")
+                self._preload_likely_scenes()
             return
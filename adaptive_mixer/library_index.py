@@ -0,0 +1,272 @@
+"""
+LibraryIndex — In-memory search over scenes and their stems.
+
+Built from SceneManager's metadata entries and kept up to date scene by
+scene as the library changes, so lookups never walk the scene list:
+
+    * a token index over scene names, stem ids, layers and descriptions,
+      searched by prefix (a sorted token list + bisect),
+    * a BPM index sorted by tempo, searched by range (bisect),
+    * exact-match indexes on key, layer and stem role.
+
+    index.find_stems(role="drums", bpm_min=110, bpm_max=130)
+    index.find_stems(text="str")       # "strings", "Dissonant strings", ...
+
+A stem's role comes from its scene.json "role" if given, otherwise from
+its id (demucs-style stems are already named bass/drums/vocals/...).
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+from typing import Optional
+
+
+ROLE_KEYWORDS = {
+    "drums": ("drums", "drum", "percussion", "perc", "kick", "snare", "beat"),
+    "bass": ("bass", "sub"),
+    "vocals": ("vocals", "vocal", "vox", "choir", "voice"),
+    "guitar": ("guitar", "gtr"),
+    "piano": ("piano", "keys"),
+    "strings": ("strings", "string", "violin", "cello"),
+    "brass": ("brass", "horn", "trumpet"),
+    "pad": ("pad", "drone"),
+    "melody": ("melody", "lead", "arp"),
+}
+_ROLE_BY_WORD = {w: role for role, words in ROLE_KEYWORDS.items() for w in words}
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(*texts) -> set:
+    tokens = set()
+    for text in texts:
+        if text:
+            tokens.update(_TOKEN_RE.findall(str(text).lower()))
+    return tokens
+
+
+def stem_role(stem_id: str, stem_info: dict) -> str:
+    """The stem's role: explicit "role", else the first role word in its id, else "other"."""
+    role = stem_info.get("role")
+    if role:
+        return str(role).lower()
+    for word in _TOKEN_RE.findall(stem_id.lower()):
+        if word in _ROLE_BY_WORD:
+            return _ROLE_BY_WORD[word]
+    return "other"
+
+
+class LibraryIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear_locked()
+
+    def _clear_locked(self):
+        self._scenes: dict = {}       # scene_id -> scene record
+        self._stems: dict = {}        # (scene_id, stem_id) -> stem record
+        self._scene_stems: dict = {}  # scene_id -> [stem keys]
+        self._sort_keys: dict = {}    # stem key -> (scene name, stem id) for result order
+
+        # token -> {record key}; scene keys are plain ids, stem keys are tuples
+        self._postings: dict = {}
+        self._sorted_tokens: Optional[list] = None  # rebuilt lazily after changes
+        self._by_bpm: list = []       # sorted [(bpm, scene_id)]
+        self._by_key: dict = {}       # key -> {scene_id}
+        self._by_layer: dict = {}     # layer -> {stem key}
+        self._by_role: dict = {}      # role -> {stem key}
+
+    # ── Updates (scanning thread) ──────────────────────────────────
+
+    def rebuild(self, scenes: dict):
+        """Replace the whole index with SceneManager entries {scene_id: info}."""
+        with self._lock:
+            self._clear_locked()
+        for scene_id, info in scenes.items():
+            self.update_scene(scene_id, info)
+
+    def update_scene(self, scene_id: str, info: dict):
+        """Add or re-index one scene from its SceneManager entry."""
+        with self._lock:
+            self._remove_locked(scene_id)
+            bpm = info.get("bpm")
+            key = info.get("key")
+            scene = {
+                "id": scene_id,
+                "name": info.get("name", scene_id),
+                "path": info.get("path"),
+                "bpm": bpm,
+                "key": key,
+                "tokens": _tokens(info.get("name"), scene_id),
+            }
+            self._scenes[scene_id] = scene
+            self._post(scene["tokens"], scene_id)
+            if isinstance(bpm, (int, float)):
+                bisect.insort(self._by_bpm, (float(bpm), scene_id))
+            if key:
+                self._by_key.setdefault(str(key).lower(), set()).add(scene_id)
+
+            keys = []
+            for stem_id, stem_info in info.get("stems", {}).items():
+                stem_key = (scene_id, stem_id)
+                layer = stem_info.get("layer")
+                role = stem_role(stem_id, stem_info)
+                self._stems[stem_key] = {
+                    "scene_id": scene_id,
+                    "stem_id": stem_id,
+                    "scene_name": scene["name"],
+                    "path": scene["path"],
+                    "layer": layer,
+                    "role": role,
+                    "bpm": bpm,
+                    "key": key,
+                    "description": stem_info.get("description"),
+                    "tokens": _tokens(stem_id, layer, role, stem_info.get("description")),
+                }
+                self._sort_keys[stem_key] = (scene["name"].lower(), stem_id)
+                self._post(self._stems[stem_key]["tokens"], stem_key)
+                if layer:
+                    self._by_layer.setdefault(str(layer).lower(), set()).add(stem_key)
+                self._by_role.setdefault(role, set()).add(stem_key)
+                keys.append(stem_key)
+            self._scene_stems[scene_id] = keys
+
+    def remove_scene(self, scene_id: str):
+        with self._lock:
+            self._remove_locked(scene_id)
+
+    def _post(self, tokens: set, record_key):
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = postings = set()
+                self._sorted_tokens = None
+            postings.add(record_key)
+
+    def _unpost(self, tokens: set, record_key):
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(record_key)
+                if not postings:
+                    del self._postings[token]
+                    self._sorted_tokens = None
+
+    def _remove_locked(self, scene_id: str):
+        scene = self._scenes.pop(scene_id, None)
+        if scene is None:
+            return
+        self._unpost(scene["tokens"], scene_id)
+        if isinstance(scene["bpm"], (int, float)):
+            i = bisect.bisect_left(self._by_bpm, (float(scene["bpm"]), scene_id))
+            if i < len(self._by_bpm) and self._by_bpm[i][1] == scene_id:
+                del self._by_bpm[i]
+        if scene["key"]:
+            self._by_key.get(str(scene["key"]).lower(), set()).discard(scene_id)
+        for stem_key in self._scene_stems.pop(scene_id, []):
+            stem = self._stems.pop(stem_key)
+            del self._sort_keys[stem_key]
+            self._unpost(stem["tokens"], stem_key)
+            if stem["layer"]:
+                self._by_layer.get(str(stem["layer"]).lower(), set()).discard(stem_key)
+            self._by_role.get(stem["role"], set()).discard(stem_key)
+
+    # ── Queries (any thread) ───────────────────────────────────────
+
+    def find_scenes(self, text: str = "", key: Optional[str] = None,
+                    bpm_min: Optional[float] = None, bpm_max: Optional[float] = None) -> list:
+        """Scene ids matching every filter, sorted by name. `text` matches name prefixes."""
+        with self._lock:
+            ids = self._scene_filter_locked(key, bpm_min, bpm_max)
+            for token in _tokens(text):
+                matched = self._prefix_locked(token)
+                ids = matched if ids is None else ids & matched
+            if ids is None:
+                ids = self._scenes.keys()
+            scene_ids = {i for i in ids if isinstance(i, str) and i in self._scenes}
+            return sorted(scene_ids, key=lambda i: self._scenes[i]["name"].lower())
+
+    def find_stems(self, text: str = "", role: Optional[str] = None,
+                   layer: Optional[str] = None, key: Optional[str] = None,
+                   bpm_min: Optional[float] = None, bpm_max: Optional[float] = None,
+                   limit: Optional[int] = None) -> list:
+        """
+        Stems matching every filter, sorted by scene then stem id. `text`
+        matches prefixes of the stem id, layer, role, description or the
+        scene's name. Each result is a dict with scene_id, stem_id,
+        scene_name, path, layer, role, bpm, key and description.
+        """
+        with self._lock:
+            keys = None
+            if role:
+                keys = set(self._by_role.get(role.lower(), ()))
+            if layer:
+                matched = self._by_layer.get(layer.lower(), set())
+                keys = set(matched) if keys is None else keys & matched
+            scene_ids = self._scene_filter_locked(key, bpm_min, bpm_max)
+            for token in _tokens(text):
+                matched = set()
+                for k in self._prefix_locked(token):
+                    if isinstance(k, tuple):
+                        matched.add(k)
+                    elif scene_ids is None or k in scene_ids:
+                        # Scene name hit: all of its stems match
+                        matched.update(self._scene_stems.get(k, ()))
+                keys = matched if keys is None else keys & matched
+            if keys is None:
+                keys = self._stems.keys() if scene_ids is None else \
+                    [k for sid in scene_ids for k in self._scene_stems.get(sid, ())]
+            elif scene_ids is not None:
+                keys = [k for k in keys if k[0] in scene_ids]
+
+            if limit is None:
+                result = sorted(keys, key=self._sort_keys.__getitem__)
+            else:
+                result = heapq.nsmallest(limit, keys, key=self._sort_keys.__getitem__)
+            return [self._public(self._stems[k]) for k in result]
+
+    def get_roles(self) -> list:
+        with self._lock:
+            return sorted(r for r, keys in self._by_role.items() if keys)
+
+    def get_layers(self) -> list:
+        with self._lock:
+            return sorted(layer for layer, keys in self._by_layer.items() if keys)
+
+    def get_keys(self) -> list:
+        with self._lock:
+            return sorted(k for k, ids in self._by_key.items() if ids)
+
+    def stem_count(self) -> int:
+        return len(self._stems)
+
+    def _scene_filter_locked(self, key, bpm_min, bpm_max) -> Optional[set]:
+        """Scene ids passing the key/BPM filters, or None if neither is given."""
+        ids = None
+        if bpm_min is not None or bpm_max is not None:
+            lo = -math.inf if bpm_min is None else float(bpm_min)
+            hi = math.inf if bpm_max is None else math.nextafter(float(bpm_max), math.inf)
+            # (bpm,) sorts before every (bpm, scene_id), so the range is [lo, hi)
+            lo = bisect.bisect_left(self._by_bpm, (lo,))
+            hi = bisect.bisect_left(self._by_bpm, (hi,))
+            ids = {sid for _, sid in self._by_bpm[lo:hi]}
+        if key:
+            matched = self._by_key.get(key.lower(), set())
+            ids = set(matched) if ids is None else ids & matched
+        return ids
+
+    def _prefix_locked(self, prefix: str) -> set:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        matched = set()
+        i = bisect.bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            matched |= self._postings[tokens[i]]
+            i += 1
+        return matched
+
+    @staticmethod
+    def _public(stem: dict) -> dict:
+        return {k: v for k, v in stem.items() if k != "tokens"}
@@ -0,0 +1,171 @@
+"""
+MemoryAccountant — One ledger for all decoded audio held by the process.
+
+Scene stems, extra stems, SFX buffers, pygame sounds and cached scenes all
+register what they hold here. Entries list the numpy arrays they reference,
+so an array shared between holders (a cached scene that is also playing, an
+extra stem taken from a cached scene) is counted once, under the first
+category in CATEGORIES that holds it.
+
+With a budget set, going over it evicts cold entries — least recently used
+first, cached scenes before sounds — through the evict callback each
+evictable holder registers. Only entries that would actually free memory are
+evicted; callbacks may refuse (return False), e.g. for a pinned scene.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+MB = 1024 * 1024
+
+
+class _Entry:
+    __slots__ = ("arrays", "nbytes", "evict", "last_used")
+
+    def __init__(self, arrays: tuple, nbytes: int, evict: Optional[Callable[[], bool]]):
+        self.arrays = arrays
+        self.nbytes = nbytes
+        self.evict = evict
+        self.last_used = time.monotonic()
+
+
+class MemoryAccountant:
+    # Report order; shared arrays are attributed to the first holder
+    CATEGORIES = ("scene_stems", "extra_stems", "buffers", "sfx", "pygame_sounds", "cached_scenes")
+    # Evicted first to last
+    EVICT_ORDER = ("cached_scenes", "sfx", "pygame_sounds")
+
+    def __init__(self, budget_mb: float = 0):
+        """
+        Args:
+            budget_mb: Global ceiling for tracked audio memory (0 = no limit).
+        """
+        self._budget_bytes = int(budget_mb * MB)
+        self._lock = threading.Lock()
+        self._entries: dict = {}  # (category, key) -> _Entry
+        self._enforce_lock = threading.Lock()  # one enforce() at a time; re-entry returns
+
+    def set_budget(self, budget_mb: float):
+        self._budget_bytes = int(budget_mb * MB)
+        self.enforce()
+
+    # ── Registration (any thread) ──────────────────────────────────
+
+    def track(self, category: str, key: str, arrays=(), nbytes: int = 0,
+              evict: Optional[Callable[[], bool]] = None):
+        """
+        Register (or replace) what `key` holds: numpy arrays and/or a raw byte
+        count for memory that is not a numpy array. `evict()` should release
+        the memory and return True, or return False if it cannot right now.
+        Must not be called while holding a lock an evict callback takes.
+        """
+        with self._lock:
+            self._entries[(category, key)] = _Entry(tuple(arrays), nbytes, evict)
+        self.enforce()
+
+    def untrack(self, category: str, key: str):
+        with self._lock:
+            self._entries.pop((category, key), None)
+
+    def touch(self, category: str, key: str):
+        """Mark an entry as just used (keeps it off the eviction shortlist)."""
+        entry = self._entries.get((category, key))
+        if entry is not None:
+            entry.last_used = time.monotonic()
+
+    # ── Budget ─────────────────────────────────────────────────────
+
+    def enforce(self):
+        """Evict cold entries until the total is within budget."""
+        if self._budget_bytes <= 0:
+            return
+        # Evict callbacks may re-enter (e.g. through track()); another thread
+        # already enforcing will also see what we just added
+        if not self._enforce_lock.acquire(blocking=False):
+            return
+        try:
+            refused = set()
+            while True:
+                with self._lock:
+                    if self._total_locked() <= self._budget_bytes:
+                        return
+                    victim = self._pick_victim_locked(refused)
+                    if victim is None:
+                        return
+                    evict = self._entries[victim].evict
+                try:
+                    evicted = evict()
+                except Exception as e:
+                    print(f"[MemoryAccountant] Evicting {victim[1]} failed: {e}")
+                    evicted = False
+                if evicted:
+                    self.untrack(*victim)
+                    print(f"[MemoryAccountant] Over budget, evicted {victim[0]}: {victim[1]}")
+                else:
+                    refused.add(victim)
+        finally:
+            self._enforce_lock.release()
+
+    def _pick_victim_locked(self, refused: set):
+        held_elsewhere = {}
+        for entry_key, entry in self._entries.items():
+            for a in entry.arrays:
+                held_elsewhere.setdefault(id(a), set()).add(entry_key)
+
+        for category in self.EVICT_ORDER:
+            candidates = sorted(
+                (e.last_used, k) for k, e in self._entries.items()
+                if k[0] == category and e.evict is not None and k not in refused
+            )
+            for _, entry_key in candidates:
+                entry = self._entries[entry_key]
+                frees = entry.nbytes + sum(
+                    a.nbytes for a in entry.arrays if held_elsewhere[id(a)] == {entry_key}
+                )
+                if frees > 0:
+                    return entry_key
+        return None
+
+    def _total_locked(self) -> int:
+        seen = set()
+        total = 0
+        for entry in self._entries.values():
+            total += entry.nbytes
+            for a in entry.arrays:
+                if id(a) not in seen:
+                    seen.add(id(a))
+                    total += a.nbytes
+        return total
+
+    # ── Reporting ──────────────────────────────────────────────────
+
+    def report(self) -> dict:
+        """
+        {"total_mb", "budget_mb", "categories": {name: {"count", "mb"}}}
+        Shared arrays are counted once (see CATEGORIES).
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+        order = {c: i for i, c in enumerate(self.CATEGORIES)}
+        entries.sort(key=lambda item: order.get(item[0][0], len(order)))
+
+        seen = set()
+        categories = {c: {"count": 0, "mb": 0.0} for c in self.CATEGORIES}
+        total = 0
+        for (category, _), entry in entries:
+            nbytes = entry.nbytes
+            for a in entry.arrays:
+                if id(a) not in seen:
+                    seen.add(id(a))
+                    nbytes += a.nbytes
+            row = categories.setdefault(category, {"count": 0, "mb": 0.0})
+            row["count"] += 1
+            row["mb"] += nbytes / MB
+            total += nbytes
+        return {
+            "total_mb": total / MB,
+            "budget_mb": self._budget_bytes / MB,
+            "categories": categories,
+        }
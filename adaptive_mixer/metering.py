@@ -0,0 +1,147 @@
+"""
+LevelMeters — Per-stem and master peak/RMS levels measured in the audio callback.
+
+Every METER_SECONDS (a few times per GUI poll) the callback measures the
+chunks it has just mixed (two reductions and a dot product on data already
+in cache) and applies meter ballistics: peaks hold and fall, RMS is smoothed
+over RMS_SECONDS. In the blocks between, measure() returns at once, so
+metering costs no passes over the audio there. After a metered block the
+levels are published into one of two preallocated buffers.
+
+Publishing is lock-free: the callback is the only writer and brackets every
+publish with a sequence counter, so the GUI poll copies the front buffer
+and simply retries if a publish happened meanwhile. The audio thread never
+waits on the GUI.
+"""
+
+import math
+import time
+
+import numpy as np
+
+
+class LevelMeters:
+    PEAK_FALL_DB_PER_SECOND = 12.0
+    RMS_SECONDS = 0.3         # RMS smoothing time constant
+    METER_SECONDS = 0.04      # metered block interval; the GUI polls every 100 ms
+
+    def __init__(self, sample_rate: int = 44100, capacity: int = 64):
+        self._sample_rate = sample_rate
+        self._capacity = capacity
+
+        # Writer state: one row per slot plus the master row at the end.
+        # Columns: peak, mean square, metered-this-block flag.
+        self._state = np.zeros((capacity + 1, 3), dtype=np.float64)
+        self._buffers = (
+            np.zeros((capacity + 1, 3), dtype=np.float64),
+            np.zeros((capacity + 1, 3), dtype=np.float64),
+        )
+        self._front = 0
+        self._seq = 0
+
+        self._slots: dict = {}             # name -> row (writer side)
+        self._names: tuple = ()            # published alongside the buffer
+        self._pending_names: tuple = None  # handed over by set_names()
+
+        self._since_metered = 0.0  # seconds of audio since the last metered block
+        self._due = False          # meter the current block
+        self._interval = 0.0
+        self._peak_decay = 1.0
+        self._rms_alpha = 1.0
+
+    # ── Configuration (any thread) ─────────────────────────────────
+
+    def set_names(self, names: list):
+        """Set the metered stems. Takes effect at the start of the next block."""
+        self._pending_names = tuple(names)[: self._capacity]
+
+    # ── Measurement (audio thread) ─────────────────────────────────
+
+    def begin_block(self, frames: int):
+        if self._pending_names is not None:
+            names, self._pending_names = self._pending_names, None
+            self._slots = {name: i for i, name in enumerate(names)}
+            self._state[:] = 0.0
+            self._publish(names)
+        self._since_metered += frames / self._sample_rate
+        self._due = self._since_metered >= self.METER_SECONDS
+        if not self._due:
+            return
+        # Ballistics span the whole interval since the last metered block
+        seconds, self._since_metered = self._since_metered, 0.0
+        if seconds != self._interval:
+            self._interval = seconds
+            self._peak_decay = 10.0 ** (-self.PEAK_FALL_DB_PER_SECOND * seconds / 20.0)
+            self._rms_alpha = 1.0 - math.exp(-seconds / self.RMS_SECONDS)
+        self._state[:, 2] = 0.0
+
+    def measure(self, name: str, chunk: np.ndarray):
+        """Meter a stem's contribution to this block (post-fader, post-fx)."""
+        if not self._due:
+            return
+        slot = self._slots.get(name)
+        if slot is not None:
+            self._measure_row(slot, chunk)
+
+    def measure_master(self, mix: np.ndarray):
+        if self._due:
+            self._measure_row(self._capacity, mix)
+
+    def end_block(self):
+        """Let unmetered rows fall, then publish."""
+        if not self._due:
+            return
+        idle = self._state[:, 2] == 0.0
+        self._state[idle, 0] *= self._peak_decay
+        self._state[idle, 1] *= 1.0 - self._rms_alpha
+        self._publish(self._names)
+
+    def _measure_row(self, row: int, chunk: np.ndarray):
+        flat = chunk.reshape(-1)
+        peak = max(float(flat.max()), -float(flat.min()))
+        mean_sq = float(np.dot(flat, flat)) / flat.size
+        st = self._state[row]
+        st[0] = max(peak, st[0] * self._peak_decay)
+        st[1] += self._rms_alpha * (mean_sq - st[1])
+        st[2] = 1.0
+
+    def _publish(self, names: tuple):
+        back = 1 - self._front
+        self._seq += 1                      # odd: publish in progress
+        np.copyto(self._buffers[back], self._state)
+        self._names = names
+        self._front = back
+        self._seq += 1                      # even: consistent
+
+    # ── Reading (GUI thread) ───────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        """
+        Latest published levels (linear, 1.0 = full scale):
+            {"stems": {name: {"peak", "rms", "live"}}, "master": {"peak", "rms"}}
+        "live" is False for stems that were not rendered in the last block
+        (e.g. while pre-mixed intensity beds play); their levels are falling.
+        """
+        while True:
+            seq = self._seq
+            if seq % 2:
+                time.sleep(0)
+                continue
+            names = self._names
+            levels = self._buffers[self._front].copy()
+            if seq == self._seq:
+                break
+
+        stems = {
+            name: {
+                "peak": float(levels[i, 0]),
+                "rms": math.sqrt(levels[i, 1]),
+                "live": bool(levels[i, 2]),
+            }
+            for i, name in enumerate(names)
+        }
+        master = {
+            "peak": float(levels[self._capacity, 0]),
+            "rms": math.sqrt(levels[self._capacity, 1]),
+        }
+        return {"stems": stems, "master": master}
@@ -7,16 +7,32 @@ applies effects, and outputs to hardware.
 
 import numpy as np
 import sounddevice as sd
-import json
 import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
-from .stem_player import StemPlayer
+from .stem_player import DecodeCancelled, StemPlayer
 from .beat_clock import BeatClock
+from .scene_cache import CachedScene, SceneCache
+from .scene_pack import ScenePack, is_scene_pack, load_scene_config, scene_exists
+from .stem_analysis import scene_analyses, scene_gains, scene_waveform
+from .stem_fx import build_stem_effects, decode_stem_with_fx
+from .stem_store import resolve_stem_path
+from .intensity_beds import bed_levels, bed_members, render_beds
+from .scene_loader import SceneLoader
+from .block_tuner import BlockSizeTuner
+from .quality_governor import QualityGovernor
+from .metering import LevelMeters
+from .session_recorder import SessionRecorder
+from .music_deck import MusicDeck
+from .sfx_pool import SfxPool
+from .sections import SectionSequencer
+from .memory import MemoryAccountant
 
 try:
-    from pedalboard import Pedalboard, Reverb, LowpassFilter
+    from pedalboard import Pedalboard, Reverb
     PEDALBOARD_AVAILABLE = True
 except ImportError:
     PEDALBOARD_AVAILABLE = False
@@ -25,27 +41,53 @@ except ImportError:
 class AdaptiveMixer:
     SAMPLE_RATE = 44100
     CHANNELS = 2
-    BLOCK_SIZE = 1024  # ~23ms latency @ 44100 Hz
+    BLOCK_SIZE = 1024  # ~23ms latency @ 44100 Hz; adjusted at runtime when auto-tuning
+    INPUT_BUS_MIN_BLOCK = 2048  # auto-tune floor with an input bus; PitchShift garbles smaller blocks
     DEFAULT_FADE_SECONDS = 2.0
 
-    def __init__(self, sample_rate: int = 44100):
+    def __init__(self, sample_rate: int = 44100, cache_budget_mb: float = 1024,
+                 auto_tune_block_size: bool = False, replay_minutes: float = 5.0,
+                 memory_budget_mb: float = 0):
         self.SAMPLE_RATE = sample_rate
         self._lock = threading.Lock()
         self._stream: Optional[sd.OutputStream] = None
-        self._running = False
+        self._running = False      # scene transport: stems and the beat clock advance
+        self._stream_open = False  # device stream; may run with the scene stopped
 
         self.clock = BeatClock(bpm=120, time_signature=(4, 4))
 
         self._stems: dict = {}
         self._layer_groups: dict = {}
         self._scene_config: Optional[dict] = None
+        self._scene_dir: Optional[str] = None
+        # Analysis sidecars of the current scene's stems, for the waveform overview
+        self._scene_analyses: list = []
+        # Named sections of the current scene; None if scene.json defines none
+        self._sequencer: Optional[SectionSequencer] = None
+
+        # Ledger of all decoded audio; evicts cold scenes/sounds over budget
+        self.memory = MemoryAccountant(memory_budget_mb)
+
+        # Decoded scenes kept for fast switching / background preloading
+        self.scene_cache = SceneCache(
+            budget_mb=cache_budget_mb,
+            sample_rate=sample_rate,
+            channels=self.CHANNELS,
+            memory=self.memory,
+        )
+        # Latest-wins queue for scene switches; _commit_lock serializes swaps
+        self.scene_loader = SceneLoader(self)
+        self._commit_lock = threading.Lock()
 
         # Extra stems: loaded from other scenes, not affected by intensity
         # key = "scene_id::stem_id", value = StemPlayer
         self._extra_stems: dict = {}
         self._extra_stem_info: dict = {}  # key -> {"scene_name": str, "stem_id": str, "scene_dir": str}
+        self._pending_extra: dict = {}  # key -> Future while add_extra_stem_async decodes
+        self._decode_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="stem-decode")
 
         self._master_volume: float = 0.8
+        self._intensity: int = 0  # last level passed to set_intensity()
 
         # Master effects chain
         self._master_effects = None
@@ -57,101 +99,249 @@ class AdaptiveMixer:
         self._stem_effects: dict = {}
         self._pending_actions: list = []
 
+        # Pre-mixed intensity beds (see intensity_beds). While _bed_mode is set
+        # the callback plays beds and only advances the live stems, whose
+        # volumes keep tracking the same state so switching back is seamless.
+        self._beds: dict = {}  # level -> StemPlayer
+        self._bed_mode: bool = False
+
+        # Overload handling: sheds effects/stems when callbacks run hot
+        self._governor = QualityGovernor()
+
+        # Peak/RMS meters filled in by the callback, read by the view's poll
+        self._meters = LevelMeters(sample_rate)
+
+        # Background music tracks, mixed after the master effects
+        self.music_deck = MusicDeck(sample_rate, self.CHANNELS)
+
+        # Soundboard one-shots, mixed dry next to the music deck
+        self.sfx = SfxPool(sample_rate, self.CHANNELS, memory=self.memory)
+
+        # Session recording / replay buffer of the master output
+        self.recorder = SessionRecorder(sample_rate, self.CHANNELS, replay_minutes=replay_minutes)
+        self._replay_enabled = replay_minutes > 0
+        self.memory.track("buffers", "recorder", nbytes=self.recorder.nbytes)
+
+        # Block-size auto-tuning (see BlockSizeTuner)
+        self._auto_tune = auto_tune_block_size
+        self._tuner: Optional[BlockSizeTuner] = None
+        self._tune_thread: Optional[threading.Thread] = None
+        self._latency = 'low'
+        # Output gain ramped once per block; used to restart the stream without a click
+        self._out_gain: float = 1.0
+        self._out_gain_target: float = 1.0
+        self._stream_lock = threading.Lock()  # tuner thread vs set_input_bus()
+
+        # Voice FX input bus; when set the stream is full-duplex (see set_input_bus)
+        self._input_bus = None
+
     # ── Scene Loading ──────────────────────────────────────────────
 
-    def load_scene(self, scene_dir: str, crossfade_seconds: float = 2.0):
+    def load_scene(self, scene_dir: str, crossfade_seconds: float = 2.0,
+                   cancelled: Optional[Callable[[], bool]] = None):
         """
-        Load a scene from a directory containing scene.json and stem audio files.
+        Load a scene from a directory containing scene.json and stem audio files,
+        or from a .scenepack file (see scene_pack).
         Fades out current scene before loading the new one.
 
+        Stems are taken from the scene cache, so switching back to a recently
+        used (or preloaded) scene does not decode anything.
+
+        If `cancelled` is given it is polled while decoding and fading out;
+        once it returns True, DecodeCancelled is raised and the current scene
+        is left in place.
+
         NOTE: This method blocks for crossfade_seconds when switching scenes.
-        Call from a background thread if UI responsiveness is required.
+        Call from a background thread if UI responsiveness is required, or use
+        request_scene() which queues the load and coalesces rapid requests.
         """
-        import time
+        prepared = self._prepare_scene(scene_dir, cancelled)
+        with self._commit_lock:
+            self._commit_scene(prepared, crossfade_seconds, cancelled)
 
-        scene_path = Path(scene_dir)
-        config_path = scene_path / "scene.json"
+    def request_scene(self, scene_dir: str, crossfade_seconds: float = 2.0):
+        """
+        Queue a scene load on the background loader. Returns immediately.
+        A newer request supersedes any load that has not been swapped in yet.
+        """
+        self.scene_loader.request(scene_dir, crossfade_seconds)
+
+    def get_load_state(self) -> dict:
+        """Return the scene loader status (see SceneLoader.get_status)."""
+        return self.scene_loader.get_status()
 
-        if not config_path.exists():
+    def _prepare_scene(self, scene_dir: str,
+                       cancelled: Optional[Callable[[], bool]] = None) -> dict:
+        """Decode (or fetch from cache) a scene and build its players and effects."""
+        if not scene_exists(scene_dir):
             raise FileNotFoundError(f"No scene.json found in {scene_dir}")
 
-        with open(config_path, "r") as f:
-            config = json.load(f)
+        cached = self.scene_cache.get(scene_dir, cancelled)
+        return self._build_players(scene_dir, cached)
 
-        # Fade out current stems if playing
+    def _build_players(self, scene_dir: str, cached: CachedScene) -> dict:
+        """Wrap a decoded scene's arrays in players and build its live effects."""
+        scene_path = Path(scene_dir)
+        config = cached.config
+        gains = scene_gains(scene_dir, config)
+
+        stems = {}
+        for stem_id, stem_config in config.get("stems", {}).items():
+            data = cached.stems.get(stem_id)
+            if data is None:
+                continue
+            stem = StemPlayer(
+                str(scene_path / stem_config["file"]),
+                sample_rate=self.SAMPLE_RATE,
+                channels=self.CHANNELS,
+                data=data,
+            )
+            stem.loop = True
+            stem.gain = gains.get(stem_id, 1.0)
+            stems[stem_id] = stem
+
+        # Per-stem effects — only for stems whose effects were not baked in
+        stem_effects = {}
+        for stem_id, fx_config in config.get("effects", {}).items():
+            if stem_id in cached.baked:
+                continue
+            board = build_stem_effects(fx_config)
+            if board is not None:
+                stem_effects[stem_id] = board
+
+        beds = {}
+        for level, data in cached.beds.items():
+            bed = StemPlayer(str(scene_path / f"bed_{level}"), sample_rate=self.SAMPLE_RATE,
+                             channels=self.CHANNELS, data=data)
+            bed.loop = True
+            beds[level] = bed
+
+        return {
+            "scene_dir": scene_dir,
+            "config": config,
+            "stems": stems,
+            "stem_effects": stem_effects,
+            "beds": beds,
+            # Read here, off the Tk thread, so the GUI can redraw from memory
+            "analyses": [] if is_scene_pack(scene_dir) else scene_analyses(scene_dir, config),
+        }
+
+    def _commit_scene(self, prepared: dict, crossfade_seconds: float,
+                      cancelled: Optional[Callable[[], bool]] = None):
+        """Fade out the current scene and swap in a prepared one. Caller holds _commit_lock."""
+        scene_dir = prepared["scene_dir"]
+        config = prepared["config"]
+        stems = prepared["stems"]
+
+        # Fade out current stems if playing. Waits only while something is
+        # still audible, so a fade already started by a superseded load is
+        # not waited out twice.
         was_playing = self._running
+        self._leave_beds()
+        faded = {}  # stem -> volume it was fading out from
         if was_playing and self._stems:
             with self._lock:
                 for stem in self._stems.values():
-                    stem.mute(fade_seconds=crossfade_seconds)
-            time.sleep(crossfade_seconds + 0.1)
+                    if not stem._muted:
+                        faded[stem] = stem._target_volume
+                        stem.mute(fade_seconds=crossfade_seconds)
+            deadline = time.monotonic() + crossfade_seconds + 0.1
+            while time.monotonic() < deadline:
+                if cancelled is not None and cancelled():
+                    self._cancel_fade_out(faded, crossfade_seconds)
+                    raise DecodeCancelled(scene_dir)
+                if not any(s.current_volume > 0.001 for s in self._stems.values()):
+                    break
+                time.sleep(0.02)
+
+        if cancelled is not None and cancelled():
+            self._cancel_fade_out(faded, crossfade_seconds)
+            raise DecodeCancelled(scene_dir)
+
+        for stem_id, stem in stems.items():
+            stem_config = config.get("stems", {}).get(stem_id, {})
+            if stem_config.get("always_on", False):
+                stem.unmute(
+                    volume=stem_config.get("default_volume", 0.5),
+                    fade_seconds=2.0 if was_playing else 0.0,
+                )
+            else:
+                stem._muted = True
+                stem._current_volume = 0.0
+                stem._target_volume = 0.0
+
+        # Play from a bed if the starting state matches one intensity level
+        beds = prepared["beds"]
+        on = {sid for sid, stem in stems.items() if not stem._muted}
+        start_level = next(
+            (lvl for lvl in bed_levels(config)
+             if lvl in beds and set(bed_members(config, lvl)) == on),
+            None,
+        )
+        if start_level is not None:
+            beds[start_level].unmute(1.0, fade_seconds=2.0 if was_playing else 0.0)
+
+        fx_order = self._fx_order(config, prepared["stem_effects"])
+
+        sequencer = None
+        if config.get("sections") and stems:
+            total = min(stem._total_frames for stem in stems.values())
+            sequencer = SectionSequencer.from_config(config, self.SAMPLE_RATE, total)
 
         with self._lock:
-            self._stems.clear()
-            self._stem_effects.clear()
+            self._stems = stems
+            self._stem_effects = prepared["stem_effects"]
+            self._sequencer = sequencer
+            self._beds = beds
+            self._bed_mode = start_level is not None
+            self._governor.set_effect_order(fx_order)
 
             self._scene_config = config
+            self._scene_analyses = prepared["analyses"]
             self.clock.bpm = config.get("bpm", 120)
             ts = config.get("time_signature", [4, 4])
             self.clock.beats_per_bar = ts[0]
             self.clock.beat_unit = ts[1]
 
-            for stem_id, stem_config in config.get("stems", {}).items():
-                file_path = scene_path / stem_config["file"]
-                if not file_path.exists():
-                    print(f"[AdaptiveMixer] Warning: Stem file not found: {file_path}")
-                    continue
-
-                try:
-                    stem = StemPlayer(
-                        str(file_path),
-                        sample_rate=self.SAMPLE_RATE,
-                        channels=self.CHANNELS,
-                    )
-                    stem.loop = True
-
-                    if stem_config.get("always_on", False):
-                        stem.unmute(
-                            volume=stem_config.get("default_volume", 0.5),
-                            fade_seconds=2.0 if was_playing else 0.0,
-                        )
-                    else:
-                        stem._muted = True
-                        stem._current_volume = 0.0
-                        stem._target_volume = 0.0
-
-                    self._stems[stem_id] = stem
-                except Exception as e:
-                    print(f"[AdaptiveMixer] Error loading stem '{stem_id}': {e}")
-
             self._layer_groups = config.get("layer_groups", {})
 
-            # Per-stem effects
-            if PEDALBOARD_AVAILABLE:
-                for stem_id, fx_config in config.get("effects", {}).items():
-                    effects = []
-                    if "reverb_room_size" in fx_config:
-                        effects.append(Reverb(
-                            room_size=fx_config["reverb_room_size"],
-                            wet_level=fx_config.get("reverb_wet", 0.3),
-                            dry_level=fx_config.get("reverb_dry", 0.7),
-                        ))
-                    if "low_pass_hz" in fx_config:
-                        effects.append(LowpassFilter(
-                            cutoff_frequency_hz=fx_config["low_pass_hz"]
-                        ))
-                    if effects:
-                        self._stem_effects[stem_id] = Pedalboard(effects)
-
-            for stem in self._stems.values():
-                stem.reset_cursor()
-
             # Reset extra stem cursors so they restart with the new scene
             for stem in self._extra_stems.values():
                 stem.reset_cursor()
+            self._update_meter_names()
+
+        if self._scene_dir and self._scene_dir != scene_dir:
+            self.scene_cache.unpin(self._scene_dir)
+        self.scene_cache.pin(scene_dir)
+        self._scene_dir = scene_dir
+        self.memory.track(
+            "scene_stems", "current",
+            arrays=[s._data for s in stems.values()] + [b._data for b in beds.values()],
+        )
 
         print(f"[AdaptiveMixer] Loaded scene: {config.get('name', scene_dir)}")
 
+    @staticmethod
+    def _fx_order(config: dict, stem_effects: dict) -> list:
+        """Live-effect stems ordered for the governor, lowest priority first."""
+        stem_configs = config.get("stems", {})
+        return sorted(
+            stem_effects,
+            key=lambda sid: stem_configs.get(sid, {}).get(
+                "priority", stem_configs.get(sid, {}).get("default_volume", 0.5)
+            ),
+        )
+
+    def _cancel_fade_out(self, faded: dict, fade_seconds: float):
+        """Bring the current scene back after a cancelled _commit_scene started fading it out."""
+        with self._lock:
+            for stem, volume in faded.items():
+                stem.unmute(volume, fade_seconds=fade_seconds)
+
+    def preload_scenes(self, scene_dirs: list):
+        """Decode likely-next scenes in the background (most likely first)."""
+        self.scene_cache.preload(scene_dirs)
+
     def get_current_scene_name(self) -> str:
         if self._scene_config:
             return self._scene_config.get("name", "Unknown")
@@ -164,53 +354,131 @@ class AdaptiveMixer:
         Add a stem from any scene directory as an extra overlay track.
         Returns the key used to reference this extra stem.
         Extra stems are not affected by set_intensity() — volume is static.
+
+        Decodes on the calling thread; use add_extra_stem_async() from the GUI.
         """
-        scene_path = Path(scene_dir)
-        config_path = scene_path / "scene.json"
-        if not config_path.exists():
-            raise FileNotFoundError(f"No scene.json in {scene_dir}")
+        key, stem, info = self._load_extra_stem(scene_dir, stem_id)
+        self._insert_extra_stem(key, stem, info, volume, fade_seconds=0.5, align=False)
+        return key
+
+    def add_extra_stem_async(self, scene_dir: str, stem_id: str, volume: float = 0.5,
+                             fade_seconds: float = 0.5,
+                             callback: Optional[Callable[[Future], None]] = None) -> Future:
+        """
+        Decode an extra stem on the background pool and fade it in once ready,
+        aligned to the shared scene cursor. Returns a Future whose result is
+        the extra stem key (None if it was removed before it was ready);
+        `callback(future)` runs on the pool thread when done.
+        Re-requesting a key that is still decoding returns the pending Future.
+        """
+        key = self._extra_stem_key(scene_dir, stem_id)
+        with self._lock:
+            pending = self._pending_extra.get(key)
+            if pending is not None:
+                if callback:
+                    pending.add_done_callback(callback)
+                return pending
+
+            def _task():
+                try:
+                    _, stem, info = self._load_extra_stem(scene_dir, stem_id)
+                    with self._lock:
+                        # remove_extra_stem() while decoding withdraws the request
+                        wanted = self._pending_extra.get(key) is future
+                    if not wanted:
+                        return None
+                    self._insert_extra_stem(key, stem, info, volume, fade_seconds, align=True)
+                    return key
+                finally:
+                    with self._lock:
+                        if self._pending_extra.get(key) is future:
+                            del self._pending_extra[key]
+
+            future = self._decode_pool.submit(_task)
+            self._pending_extra[key] = future
+        if callback:
+            future.add_done_callback(callback)
+        return future
+
+    def get_pending_extra_stem_keys(self) -> list:
+        """Keys of extra stems that are still decoding."""
+        with self._lock:
+            return list(self._pending_extra.keys())
 
-        with open(config_path, "r") as f:
-            config = json.load(f)
+    @staticmethod
+    def _extra_stem_key(scene_dir: str, stem_id: str) -> str:
+        return f"{Path(scene_dir).name}::{stem_id}"
+
+    def _load_extra_stem(self, scene_dir: str, stem_id: str) -> tuple:
+        """Read scene.json and decode one stem. Returns (key, StemPlayer, info)."""
+        scene_path = Path(scene_dir)
+        config = load_scene_config(scene_dir)
 
         stem_config = config.get("stems", {}).get(stem_id)
         if not stem_config:
             raise KeyError(f"Stem '{stem_id}' not found in {scene_dir}")
 
-        file_path = scene_path / stem_config["file"]
-        if not file_path.exists():
-            raise FileNotFoundError(f"Stem file not found: {file_path}")
-
-        scene_name = config.get("name", scene_path.name)
-        key = f"{scene_path.name}::{stem_id}"
-
-        stem = StemPlayer(str(file_path), sample_rate=self.SAMPLE_RATE, channels=self.CHANNELS)
+        if not is_scene_pack(scene_dir) and not resolve_stem_path(scene_dir, stem_config).exists():
+            raise FileNotFoundError(f"Stem file not found: {scene_path / stem_config['file']}")
+
+        # Reuse the decoded array if the whole scene is already cached;
+        # either way the stem carries the same baked effects as in its scene
+        data = None
+        if self.scene_cache.contains(scene_dir):
+            data = self.scene_cache.get(scene_dir).stems.get(stem_id)
+        if data is None and is_scene_pack(scene_dir):
+            data = ScenePack(scene_dir).stem(stem_id, self.CHANNELS)
+        if data is None:
+            data, _ = decode_stem_with_fx(
+                scene_dir, stem_config, config.get("effects", {}).get(stem_id),
+                self.SAMPLE_RATE, self.CHANNELS,
+            )
+
+        stem = StemPlayer(str(scene_path / stem_config["file"]), sample_rate=self.SAMPLE_RATE,
+                          channels=self.CHANNELS, data=data)
         stem.loop = True
-        stem.unmute(volume=volume, fade_seconds=0.5)
+        stem.gain = scene_gains(scene_dir, config).get(stem_id, 1.0)
 
+        info = {
+            "scene_name": config.get("name", scene_path.name),
+            "stem_id": stem_id,
+            "scene_dir": scene_dir,
+        }
+        return self._extra_stem_key(scene_dir, stem_id), stem, info
+
+    def _insert_extra_stem(self, key: str, stem: StemPlayer, info: dict,
+                           volume: float, fade_seconds: float, align: bool):
         with self._lock:
+            if align:
+                # Join at the same position as the music already playing
+                ref = next(iter(self._stems.values()), None) or \
+                    next(iter(self._extra_stems.values()), None)
+                if ref is not None and stem._total_frames > 0:
+                    stem._cursor = ref._cursor % stem._total_frames
+            stem.unmute(volume=volume, fade_seconds=fade_seconds)
+
             # Remove old version if re-adding
             if key in self._extra_stems:
                 old = self._extra_stems[key]
                 old.mute(fade_seconds=0.0)
             self._extra_stems[key] = stem
-            self._extra_stem_info[key] = {
-                "scene_name": scene_name,
-                "stem_id": stem_id,
-                "scene_dir": scene_dir,
-            }
+            self._extra_stem_info[key] = info
+            self._update_meter_names()
 
+        self.memory.track("extra_stems", key, arrays=[stem._data])
         print(f"[AdaptiveMixer] Extra stem added: {key}")
-        return key
 
     def remove_extra_stem(self, key: str):
-        """Remove an extra stem by key."""
+        """Remove an extra stem by key (also withdraws a pending async add)."""
         with self._lock:
+            self._pending_extra.pop(key, None)
             if key in self._extra_stems:
                 self._extra_stems[key].mute(fade_seconds=0.5)
                 del self._extra_stems[key]
                 self._extra_stem_info.pop(key, None)
+                self._update_meter_names()
                 print(f"[AdaptiveMixer] Extra stem removed: {key}")
+        self.memory.untrack("extra_stems", key)
 
     def set_extra_stem_volume(self, key: str, volume: float, fade_seconds: float = 0.05):
         """Set volume for an extra stem (static — only changed by direct call)."""
@@ -241,74 +509,332 @@ class AdaptiveMixer:
     # ── Playback Control ───────────────────────────────────────────
 
     def start(self):
-        """Start the audio output stream and beat clock."""
+        """Start (or resume) the scene and beat clock, opening the stream if needed."""
         if self._running:
             return
 
+        if self._stream_open:
+            # Opened earlier for SFX/music without a scene to calibrate with;
+            # the callback leaves the scene's effects alone until _running is set
+            change = self._calibrate_block_size()
+            if change:
+                self._restart_stream(*change)
+
         self._running = True
         self.clock.start()
         self.clock.on_bar(self._process_pending_actions)
+        self.open_stream()
+
+    def stop(self):
+        """Stop the scene and beat clock. The stream stays open while something else needs it."""
+        self._running = False
+        self.clock.stop()
+        self.release_stream()
+
+    def open_stream(self):
+        """
+        Open the device stream without starting the scene, for sources mixed
+        next to it (SFX, the music deck, the voice input bus).
+        """
+        with self._stream_lock:
+            if self._stream_open:
+                return
+            self._stream_open = True
+
+        if self._auto_tune:
+            if self._tuner is None:
+                self._tuner = BlockSizeTuner(self.SAMPLE_RATE, self._output_device_name())
+                if self._input_bus is not None:
+                    self._tuner.set_min_block_size(self.INPUT_BUS_MIN_BLOCK)
+            self._calibrate_block_size()
+            self.BLOCK_SIZE = self._tuner.block_size
+            self._latency = self._tuner.latency
 
+        try:
+            self._open_stream()
+        except Exception:
+            self._stream_open = False
+            raise
+        if self._replay_enabled:
+            self.recorder.open()
+        print("[AdaptiveMixer] Audio stream started.")
+
+        if self._tuner is not None:
+            self._tune_thread = threading.Thread(target=self._tune_loop, daemon=True)
+            self._tune_thread.start()
+
+    def _calibrate_block_size(self) -> Optional[tuple]:
+        """First run on this device: pick the tuner's starting level from dry renders of the scene."""
+        if self._tuner is None or not self._tuner.needs_calibration or not self._stems:
+            return None
+        change = self._tuner.calibrate(self._dry_render)
+        # Calibration ran the live chains on scratch audio; start them clean
+        for board in list(self._stem_effects.values()) + [self._master_effects]:
+            if board is not None:
+                board.reset()
+        return change
+
+    def _dry_render(self, frames: int):
+        """One block's stem mixing and effects from the scene's start, advancing no cursor."""
+        mix = np.zeros((self.CHANNELS, frames), dtype=np.float32)
+        with self._lock:
+            for stem_id, stem in self._stems.items():
+                data = stem._data
+                if data is None or data.shape[1] < frames:
+                    continue
+                chunk = data[:, :frames] * np.float32(stem.gain)
+                board = self._stem_effects.get(stem_id)
+                if board is not None:
+                    chunk = board(chunk, self.SAMPLE_RATE, reset=False)
+                mix += chunk
+        if self._master_effects and PEDALBOARD_AVAILABLE:
+            mix = self._master_effects(mix, self.SAMPLE_RATE, reset=False)
+        np.clip(mix, -1.0, 1.0, out=mix)
+
+    def release_stream(self, force: bool = False):
+        """Close the device stream unless the scene, the music deck or an input bus still uses it."""
+        with self._stream_lock:
+            if not force and (self._running or self._input_bus is not None
+                              or self.music_deck.is_active):
+                return
+            self._stream_open = False
+            if self._stream:
+                self._stream.stop()
+                self._stream.close()
+                self._stream = None
+
+    @property
+    def is_stream_open(self) -> bool:
+        return self._stream_open
+
+    def _open_stream(self):
+        bus = self._input_bus
+        if bus is not None:
+            try:
+                self._stream = sd.Stream(
+                    samplerate=self.SAMPLE_RATE,
+                    blocksize=self.BLOCK_SIZE,
+                    channels=(1, self.CHANNELS),
+                    device=(bus.input_device, None),
+                    dtype='float32',
+                    callback=self._duplex_callback,
+                    latency=self._latency,
+                )
+                self._stream.start()
+                return
+            except Exception as e:
+                print(f"[AdaptiveMixer] Full-duplex stream failed, dropping input bus: {e}")
+                self._input_bus = None
+                self._update_meter_names()
         self._stream = sd.OutputStream(
             samplerate=self.SAMPLE_RATE,
             blocksize=self.BLOCK_SIZE,
             channels=self.CHANNELS,
             dtype='float32',
             callback=self._audio_callback,
-            latency='low',
+            latency=self._latency,
         )
         self._stream.start()
-        print("[AdaptiveMixer] Audio stream started.")
 
-    def stop(self):
-        """Stop audio output and clock."""
-        self._running = False
-        self.clock.stop()
-        if self._stream:
-            self._stream.stop()
-            self._stream.close()
-            self._stream = None
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def input_bus(self):
+        return self._input_bus
+
+    def set_input_bus(self, bus):
+        """
+        Route a microphone through the engine: `bus.process_block(mono)` is
+        called from the audio callback with each block of input and its
+        output is mixed into the master (after the master effects). This
+        replaces the voice FX processor's own stream, so mic and mixer share
+        one device stream and clock. Pass None to go back to output-only.
+        Raises ValueError if the bus wants a different output device than
+        the mixer plays on, since the shared stream can only open one.
+        """
+        if bus is self._input_bus:
+            return
+        if bus is not None and not self._is_output_device(getattr(bus, "output_device", None)):
+            raise ValueError("voice output device differs from the mixer's output device")
+        self._input_bus = bus
+        self._update_meter_names()
+        block_size, latency = self.BLOCK_SIZE, self._latency
+        if self._tuner is not None:
+            self._tuner.set_min_block_size(self.INPUT_BUS_MIN_BLOCK if bus is not None else 0)
+            block_size, latency = self._tuner.block_size, self._tuner.latency
+        if self._stream_open:
+            self._restart_stream(block_size, latency)
+
+    @classmethod
+    def _is_output_device(cls, device) -> bool:
+        """True if `device` (index, name or None for the default) is the mixer's output device."""
+        if device is None:
+            return True
+        try:
+            return sd.query_devices(device)["name"] == cls._output_device_name()
+        except Exception:
+            return False
 
-    def _audio_callback(self, outdata: np.ndarray, frames: int, time_info, status):
+    @staticmethod
+    def _output_device_name() -> str:
+        try:
+            return sd.query_devices(kind='output')["name"]
+        except Exception:
+            return "default"
+
+    def _tune_loop(self):
+        """Monitor thread: re-evaluates the block size while the stream runs."""
+        while self._stream_open:
+            time.sleep(1.0)
+            change = self._tuner.evaluate()
+            if change and self._stream_open:
+                self._restart_stream(*change)
+
+    def _restart_stream(self, block_size: int, latency: str):
+        """Reopen the stream with new settings, fading out and back in around the swap."""
+        with self._stream_lock:
+            self._out_gain_target = 0.0
+            time.sleep(3 * self.BLOCK_SIZE / self.SAMPLE_RATE + 0.01)
+
+            old = self._stream
+            self.BLOCK_SIZE = block_size
+            self._latency = latency
+            if old:
+                old.stop()
+                old.close()
+
+            self._out_gain = 0.0
+            self._out_gain_target = 1.0
+            try:
+                self._open_stream()
+            except Exception as e:
+                print(f"[AdaptiveMixer] Stream restart failed: {e}")
+                self._stream = None
+                return
+        if self._tuner is not None:
+            self._tuner.reset_window()
+        print(f"[AdaptiveMixer] Stream restarted: block {block_size}, latency {latency}")
+
+    def _duplex_callback(self, indata: np.ndarray, outdata: np.ndarray, frames: int,
+                         time_info, status):
+        """sounddevice Stream callback used while an input bus is attached."""
+        self._audio_callback(outdata, frames, time_info, status, mic=indata[:, 0])
+
+    def _audio_callback(self, outdata: np.ndarray, frames: int, time_info, status,
+                        mic: Optional[np.ndarray] = None):
         """
         sounddevice OutputStream callback.
         Runs in a C-level thread — must be fast and must NOT do I/O.
         """
+        t_start = time.perf_counter()
         if status:
             print(f"[AdaptiveMixer] Audio callback status: {status}")
 
         try:
-            mix = np.zeros((frames, self.CHANNELS), dtype=np.float32)
-
-            with self._lock:
-                for stem_id, stem in self._stems.items():
-                    chunk = stem.read_chunk(frames)
+            # Planar (channels, frames) throughout — pedalboard's native layout
+            mix = np.zeros((self.CHANNELS, frames), dtype=np.float32)
+            meters = self._meters
+            meters.begin_block(frames)
+
+            gov = self._governor
+            bypassed = gov.bypassed_stem_fx if gov.level > 1 else ()
+            drop_low = gov.drop_low_gain
+
+            # Scene stems only advance while the scene plays; SFX, the deck
+            # and the voice bus keep running on an open stream regardless
+            if self._running:
+                with self._lock:
+                    # One timeline plan per block, shared by every scene stem and bed
+                    plan = self._sequencer.plan(frames) if self._sequencer else None
+
+                    if self._bed_mode:
+                        # At most two beds audible (during a crossfade)
+                        for stem in self._stems.values():
+                            if plan:
+                                stem.skip_plan(plan)
+                            else:
+                                stem.skip(frames)
+                        for bed in self._beds.values():
+                            if bed.is_audible:
+                                mix += bed.read_plan(plan) if plan else bed.read_chunk(frames)
+                            elif plan:
+                                bed.skip_plan(plan)
+                            else:
+                                bed.skip(frames)
+                    else:
+                        for stem_id, stem in self._stems.items():
+                            if drop_low and self._is_low_gain(stem):
+                                if plan:
+                                    stem.skip_plan(plan)
+                                else:
+                                    stem.skip(frames)
+                                continue
+
+                            chunk = stem.read_plan(plan) if plan else stem.read_chunk(frames)
+
+                            if (stem_id in self._stem_effects and stem.is_audible
+                                    and stem_id not in bypassed):
+                                chunk = self._stem_effects[stem_id](chunk, self.SAMPLE_RATE,
+                                                                   reset=False)
+
+                            meters.measure(stem_id, chunk)
+                            mix += chunk
+
+                    for key, stem in self._extra_stems.items():
+                        if drop_low and self._is_low_gain(stem):
+                            stem.skip(frames)
+                            continue
+                        chunk = stem.read_chunk(frames)
+                        meters.measure(key, chunk)
+                        mix += chunk
 
-                    if stem_id in self._stem_effects and stem.is_audible:
-                        fx = self._stem_effects[stem_id]
-                        chunk_t = chunk.T.copy()
-                        chunk_t = fx(chunk_t, self.SAMPLE_RATE, reset=False)
-                        chunk = chunk_t.T
+            mix *= self._master_volume
 
-                    mix += chunk
+            if (self._running and self._master_effects and PEDALBOARD_AVAILABLE
+                    and not gov.bypass_master_fx):
+                mix = self._master_effects(mix, self.SAMPLE_RATE, reset=False)
 
-                for stem in self._extra_stems.values():
-                    mix += stem.read_chunk(frames)
+            music = self.music_deck.render(frames)
+            if music is not None:
+                mix += music
+            sfx = self.sfx.render(frames)
+            if sfx is not None:
+                mix += sfx
 
-            mix *= self._master_volume
+            bus = self._input_bus
+            if mic is not None and bus is not None:
+                voice = bus.process_block(mic.copy())
+                meters.measure("voice", voice)
+                mix += voice
 
-            if self._master_effects and PEDALBOARD_AVAILABLE:
-                mix_t = mix.T.copy()
-                mix_t = self._master_effects(mix_t, self.SAMPLE_RATE, reset=False)
-                mix = mix_t.T
+            if self._out_gain != 1.0 or self._out_gain_target != 1.0:
+                target = self._out_gain_target
+                mix *= np.linspace(self._out_gain, target, frames, dtype=np.float32)
+                self._out_gain = target
 
             np.clip(mix, -1.0, 1.0, out=mix)
-            outdata[:] = mix
+            meters.measure_master(mix)
+            meters.end_block()
+            if self.recorder.armed:
+                self.recorder.push(mix)
+            # The only interleave in the engine
+            outdata[:] = mix.T
 
         except Exception as e:
             outdata.fill(0)
             print(f"[AdaptiveMixer] Audio callback error: {e}")
 
+        elapsed = time.perf_counter() - t_start
+        self._governor.update(elapsed, frames / self.SAMPLE_RATE)
+        if self._tuner is not None:
+            self._tuner.record(elapsed, bool(status) and status.output_underflow)
+
+    def _is_low_gain(self, stem: StemPlayer) -> bool:
+        limit = self._governor.LOW_GAIN
+        return stem.current_volume < limit and stem._target_volume < limit
+
     # ── Layer / Stem Control ───────────────────────────────────────
 
     def set_layer_volume(self, layer_name: str, volume: float,
@@ -326,6 +852,7 @@ class AdaptiveMixer:
             self._apply_layer_volume(layer_name, volume, fade_seconds)
 
     def _apply_layer_volume(self, layer_name: str, volume: float, fade_seconds: float):
+        self._leave_beds()
         group = self._layer_groups.get(layer_name, {})
         for stem_id in group.get("stems", []):
             if stem_id in self._stems:
@@ -337,6 +864,7 @@ class AdaptiveMixer:
     def set_stem_volume(self, stem_id: str, volume: float,
                         fade_seconds: float = DEFAULT_FADE_SECONDS):
         """Set volume for a specific stem."""
+        self._leave_beds()
         if stem_id in self._stems:
             if volume > 0:
                 self._stems[stem_id].unmute(volume, fade_seconds)
@@ -345,6 +873,7 @@ class AdaptiveMixer:
 
     def toggle_stem(self, stem_id: str, fade_seconds: float = DEFAULT_FADE_SECONDS):
         """Toggle a stem on/off."""
+        self._leave_beds()
         if stem_id in self._stems:
             stem = self._stems[stem_id]
             default_vol = 0.5
@@ -361,7 +890,11 @@ class AdaptiveMixer:
         Set overall intensity level.
         level 0 = base only, 1 = + peaceful, 2 = + tension, 3 = + combat
         Extra stems are NOT affected by intensity changes.
+
+        With pre-mixed beds active this crossfades two beds instead of
+        ramping every stem in the mix.
         """
+        self._intensity = level
         for layer_name, group in self._layer_groups.items():
             group_intensity = group.get("intensity", 0)
             for stem_id in group.get("stems", []):
@@ -375,6 +908,33 @@ class AdaptiveMixer:
                     else:
                         self._stems[stem_id].mute(fade_seconds)
 
+        if self._bed_mode:
+            bed_level = min(level, max(self._beds))
+            if bed_level not in self._beds:
+                self._leave_beds()
+                return
+            # Same fade as the live stems above, so the two stay in step
+            with self._lock:
+                for lvl, bed in self._beds.items():
+                    if lvl == bed_level:
+                        bed.unmute(1.0, fade_seconds)
+                    else:
+                        bed.mute(fade_seconds)
+
+    def _leave_beds(self):
+        """Switch from pre-mixed beds to live stems, e.g. once a single stem is touched."""
+        if not self._bed_mode:
+            return
+        with self._lock:
+            self._bed_mode = False
+            for bed in self._beds.values():
+                bed.mute(fade_seconds=0.0)
+        print("[AdaptiveMixer] Switched to live stems")
+
+    @property
+    def using_intensity_beds(self) -> bool:
+        return self._bed_mode
+
     # ── Master Controls ────────────────────────────────────────────
 
     def set_master_volume(self, volume: float):
@@ -382,16 +942,19 @@ class AdaptiveMixer:
 
     def panic(self, fade_seconds: float = 1.0):
         """Emergency: fade everything to silence."""
+        self._leave_beds()
         with self._lock:
             for stem in self._stems.values():
                 stem.mute(fade_seconds)
             for stem in self._extra_stems.values():
                 stem.mute(fade_seconds)
+        self.sfx.stop_all()
 
     # ── Quantized Action Processing ────────────────────────────────
 
     def _process_pending_actions(self, bar_number: int):
         """Called by BeatClock on each bar boundary."""
+        self._governor.flush_log()
         actions = self._pending_actions.copy()
         self._pending_actions.clear()
         for action in actions:
@@ -410,12 +973,195 @@ class AdaptiveMixer:
             stem = next(iter(self._stems.values()))
             return stem._cursor / self.SAMPLE_RATE, stem._total_frames / self.SAMPLE_RATE
 
+    def get_scene_waveform(self, width: int) -> Optional[tuple]:
+        """
+        (mins, maxs) overview of the current scene, `width` points each, from
+        its stems' analysis sidecars (read when the scene was built). None if
+        there are none (or for packs).
+        """
+        return scene_waveform(self._scene_analyses, width)
+
     def seek(self, position_seconds: float):
         """Seek all stems to position_seconds (clamped to valid range)."""
         with self._lock:
-            for stem in self._stems.values():
+            for stem in list(self._stems.values()) + list(self._beds.values()):
                 frame = int(position_seconds * self.SAMPLE_RATE)
                 stem._cursor = max(0, min(frame, stem._total_frames - 1))
+            if self._sequencer:
+                self._sequencer.seek(int(position_seconds * self.SAMPLE_RATE))
+
+    # ── Sections ───────────────────────────────────────────────────
+
+    def jump_to_section(self, name: str):
+        """
+        Move playback to a named section of the current scene. The jump
+        happens on the current section's next bar line (or at its end if
+        its exit rule is "end"), with a short crossfade.
+        """
+        if self._sequencer is None:
+            print("[AdaptiveMixer] Current scene has no sections")
+            return
+        try:
+            self._sequencer.jump_to(name)
+        except KeyError as e:
+            print(f"[AdaptiveMixer] {e}")
+            return
+        print(f"[AdaptiveMixer] Queued jump to section '{name}'")
+
+    def get_section_names(self) -> list:
+        return self._sequencer.get_section_names() if self._sequencer else []
+
+    def get_current_section(self) -> Optional[str]:
+        return self._sequencer.current if self._sequencer else None
+
+    # ── Session snapshot / warm start ──────────────────────────────
+
+    def get_session_state(self) -> dict:
+        """Compact, JSON-able engine state (see core.session_snapshot)."""
+        with self._lock:
+            stems = {
+                sid: {"volume": round(s._target_volume, 3), "muted": s._muted}
+                for sid, s in self._stems.items()
+            }
+            extras = [
+                {"scene_dir": info["scene_dir"], "stem_id": info["stem_id"],
+                 "volume": round(self._extra_stems[key]._target_volume, 3)}
+                for key, info in self._extra_stem_info.items()
+                if key in self._extra_stems and not self._extra_stems[key]._muted
+            ]
+        return {
+            "scene_dir": self._scene_dir,
+            "intensity": self._intensity,
+            "master_volume": round(self._master_volume, 3),
+            "section": self.get_current_section(),
+            "stems": stems,
+            "extra_stems": extras,
+            "running": self._running,
+        }
+
+    def restore_session(self, state: dict) -> bool:
+        """
+        Warm start from get_session_state(). Only the stems that were audible
+        are decoded before playback resumes; the rest of the scene and the
+        extra stems are decoded on the background pool and join in sync.
+        Returns False if the snapshot's scene no longer exists.
+        """
+        scene_dir = state.get("scene_dir")
+        if not scene_dir or not scene_exists(scene_dir):
+            return False
+
+        t_start = time.perf_counter()
+        stem_state = state.get("stems", {})
+        audible = [sid for sid, s in stem_state.items()
+                   if not s.get("muted") and s.get("volume", 0.0) > 0.001]
+
+        partial = None
+        if self.scene_cache.contains(scene_dir) or is_scene_pack(scene_dir):
+            # Cached or mapped: the whole scene is ready without decoding
+            prepared = self._prepare_scene(scene_dir)
+        else:
+            partial = self._decode_scene_stems(scene_dir, audible)
+            prepared = self._build_players(scene_dir, partial)
+
+        with self._commit_lock:
+            self._commit_scene(prepared, crossfade_seconds=0.0)
+            if self._apply_stem_state(stem_state):
+                self._leave_beds()
+            section = state.get("section")
+            with self._lock:
+                if self._sequencer and section in self._sequencer.get_section_names():
+                    self._sequencer.restart_at(section)
+        self.scene_loader.mark_loaded(scene_dir)
+        self._intensity = state.get("intensity", 0)
+        self.set_master_volume(state.get("master_volume", self._master_volume))
+        if state.get("running", True):
+            self.start()
+        print(f"[AdaptiveMixer] Warm start: {len(prepared['stems'])} stems ready in "
+              f"{time.perf_counter() - t_start:.1f}s")
+
+        # Audible extra stems first, then whatever the scene still lacks
+        for extra in state.get("extra_stems", []):
+            self.add_extra_stem_async(extra["scene_dir"], extra["stem_id"],
+                                      volume=extra.get("volume", 0.5))
+        if partial is not None:
+            # Own thread: it waits on decodes queued behind the extra stems on the pool
+            threading.Thread(target=self._complete_scene, args=(scene_dir, partial),
+                             daemon=True).start()
+        return True
+
+    def _decode_scene_stems(self, scene_dir: str, stem_ids: list) -> CachedScene:
+        """Decode just `stem_ids` of a scene, in parallel. The result is not cached."""
+        config = load_scene_config(scene_dir)
+        stem_configs = config.get("stems", {})
+        fx_config = config.get("effects", {})
+
+        futures = {
+            sid: self._decode_pool.submit(
+                decode_stem_with_fx, scene_dir, stem_configs[sid], fx_config.get(sid),
+                self.SAMPLE_RATE, self.CHANNELS,
+            )
+            for sid in stem_ids if sid in stem_configs
+        }
+        stems, baked = {}, set()
+        for sid, future in futures.items():
+            try:
+                stems[sid], is_baked = future.result()
+                if is_baked:
+                    baked.add(sid)
+            except Exception as e:
+                print(f"[AdaptiveMixer] Error decoding stem '{sid}': {e}")
+        return CachedScene(scene_dir, config, stems, baked)
+
+    def _complete_scene(self, scene_dir: str, partial: CachedScene):
+        """Background half of a warm start: decode the remaining stems, cache the full scene."""
+        rest = [sid for sid in partial.config.get("stems", {}) if sid not in partial.stems]
+        remaining = self._decode_scene_stems(scene_dir, rest) if rest else None
+        stems = dict(partial.stems)
+        baked = set(partial.baked)
+        if remaining is not None:
+            stems.update(remaining.stems)
+            baked |= remaining.baked
+        beds = {}
+        if partial.config.get("premix_beds"):
+            beds = render_beds(partial.config, stems, baked, scene_gains(scene_dir, partial.config))
+        self.scene_cache.put(scene_dir, CachedScene(scene_dir, partial.config, stems, baked, beds))
+
+        if remaining is None or self._scene_dir != scene_dir:
+            return
+        added = self._build_players(scene_dir, remaining)
+        with self._lock:
+            if self._scene_dir != scene_dir:
+                return
+            ref = next(iter(self._stems.values()), None)
+            for sid, stem in added["stems"].items():
+                if ref is not None and stem._total_frames > 0:
+                    stem._cursor = ref._cursor % stem._total_frames
+                self._stems[sid] = stem
+            for sid, board in added["stem_effects"].items():
+                self._stem_effects.setdefault(sid, board)
+            self._governor.set_effect_order(self._fx_order(self._scene_config, self._stem_effects))
+            self._update_meter_names()
+            arrays = [s._data for s in self._stems.values()]
+        self.memory.track("scene_stems", "current", arrays=arrays)
+        self.scene_loader.mark_loaded(scene_dir)  # the view adds rows for the new stems
+        print(f"[AdaptiveMixer] Warm start complete: {len(added['stems'])} more stems loaded")
+
+    def _apply_stem_state(self, stem_state: dict) -> bool:
+        """Set stem volumes/mutes from a snapshot instantly. Returns True if anything changed."""
+        changed = False
+        with self._lock:
+            for sid, stem in self._stems.items():
+                saved = stem_state.get(sid)
+                if saved is None:
+                    continue
+                if saved.get("muted", True):
+                    changed |= not stem._muted
+                    stem.mute(fade_seconds=0.0)
+                else:
+                    volume = saved.get("volume", 0.5)
+                    changed |= stem._muted or abs(stem._target_volume - volume) > 1e-3
+                    stem.unmute(volume, fade_seconds=0.0)
+        return changed
 
     def get_stem_status(self) -> dict:
         """Return current volume/mute status of all stems."""
@@ -429,6 +1175,35 @@ class AdaptiveMixer:
             }
         return status
 
+    def get_levels(self) -> dict:
+        """
+        Latest peak/RMS per stem (scene stems and extra stem keys) and for the
+        master output. Never blocks the audio thread; see LevelMeters.snapshot.
+        """
+        return self._meters.snapshot()
+
+    def get_memory_report(self) -> dict:
+        """
+        Decoded audio held by the process, by holder:
+            {"total_mb", "budget_mb", "categories": {name: {"count", "mb"}}}
+        See MemoryAccountant.report.
+        """
+        return self.memory.report()
+
+    def _update_meter_names(self):
+        names = list(self._stems) + list(self._extra_stems)
+        if self._input_bus is not None:
+            names.append("voice")
+        self._meters.set_names(names)
+
+    def get_quality_status(self) -> dict:
+        """Return the overload governor's current rung on the quality ladder."""
+        return {
+            "level": self._governor.level,
+            "max_level": self._governor.max_level,
+            "description": self._governor.describe(),
+        }
+
     def get_layer_names(self) -> list:
         return list(self._layer_groups.keys())
 
@@ -440,3 +1215,6 @@ class AdaptiveMixer:
     def cleanup(self):
         """Release all resources."""
         self.stop()
+        self.release_stream(force=True)
+        self.recorder.close()
+        self._decode_pool.shutdown(wait=False)
@@ -0,0 +1,340 @@
+"""
+MusicDeck — Streams library tracks through the mixer's own output stream.
+
+Background music used to play through pygame.mixer.music, a second device
+stream that could not prefetch and left a gap between tracks. The deck
+lives inside AdaptiveMixer instead:
+
+    * A decoder thread reads each track ahead of playback in blocks
+      (resampling to the mixer rate if needed) into a per-voice ring.
+    * When a track's file runs out, the decoder asks for the next track and
+      keeps writing into the same ring, so playback continues gaplessly.
+    * play() while a track is playing starts a second voice. Once it has
+      buffered PRIME_SECONDS of audio, the callback starts an equal-power
+      crossfade on both voices at the same sample.
+
+render() is called from the audio callback. It only reads from the rings:
+the decoder thread does all file I/O.
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+from .resample import LinearResampler, PolyphaseResampler, make_resampler
+
+
+class _Voice:
+    """One continuous stream of tracks: a ring filled by the decoder, drained by render()."""
+
+    def __init__(self, path: str, channels: int, capacity: int):
+        self.ring = np.zeros((channels, capacity), dtype=np.float32)
+        self.written = 0  # advanced by the decoder thread only
+        self.read = 0     # advanced by the audio thread only
+
+        # Decoder-side state
+        self.path = path
+        self.file: Optional[sf.SoundFile] = None
+        self.resampler: Optional[Union[PolyphaseResampler, LinearResampler]] = None
+        self.boundaries: deque = deque([(0, path)])  # (frame, path) where each track starts
+        self.eof_at: Optional[int] = None            # frame where the stream ends
+
+        # Audio-thread state
+        self.current_path: Optional[str] = None
+        self.started = False
+        self.stopping = False     # fading out after stop()
+        self.done = False
+        self.fade_pos = 0.0       # 0..1, mapped through an equal-power curve
+        self.fade_step = 0.0      # per sample
+        self.underruns = 0
+
+
+class MusicDeck:
+    PRIME_SECONDS = 0.5       # buffered before a voice starts playing
+    RING_SECONDS = 6.0
+    DECODE_FRAMES = 8192
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2):
+        self._sample_rate = sample_rate
+        self._channels = channels
+
+        self._lock = threading.Lock()  # control threads vs decoder thread
+        self._wake = threading.Event()
+        self._voices: tuple = ()       # replaced, never mutated, so render() can iterate safely
+        self._decoder: Optional[threading.Thread] = None
+        self._next_provider: Optional[Callable[[str], Optional[str]]] = None
+
+        # Deck gain = volume * fade level, ramped per sample in render()
+        self._volume = 0.7
+        self._fade = 1.0
+        self._fade_target = 1.0
+        self._fade_step = 0.0
+        self._applied_gain = 0.0
+        self._paused = False
+        self._pause_when_silent = False
+
+    # ── Control (any non-audio thread) ─────────────────────────────
+
+    def set_next_provider(self, provider: Optional[Callable[[str], Optional[str]]]):
+        """`provider(path)` returns the track to play gaplessly after `path`, or None."""
+        self._next_provider = provider
+
+    def play(self, path: str, crossfade_seconds: float = 0.0):
+        """Start a track. Crossfades from whatever is playing once the new track is buffered."""
+        voice = _Voice(path, self._channels, int(self.RING_SECONDS * self._sample_rate))
+        with self._lock:
+            active = [v for v in self._voices if not v.done and not v.stopping]
+            if not active or crossfade_seconds <= 0.0:
+                for v in active:
+                    v.done = True
+                active = []
+            voice.fade_step = 1.0 / max(1.0, crossfade_seconds * self._sample_rate) if active else 0.0
+            voice.fade_pos = 0.0 if active else 1.0
+            fading = tuple(v for v in self._voices if v.stopping and not v.done)
+            self._voices = fading + tuple(active) + (voice,)
+            self._paused = False
+            self._pause_when_silent = False
+            if self._fade_target == 0.0:
+                self.fade_to(1.0, 0.0)
+        self._ensure_decoder()
+        self._wake.set()
+
+    def stop(self, fade_seconds: float = 0.05):
+        step = 1.0 / max(1.0, fade_seconds * self._sample_rate)
+        with self._lock:
+            for v in self._voices:
+                if v.started and not self._paused:
+                    v.stopping = True
+                    v.fade_step = -step
+                else:
+                    v.done = True
+            self._paused = False
+
+    def pause(self, fade_seconds: float = 0.05):
+        if self.is_active and not self._paused:
+            self.fade_to(0.0, fade_seconds, pause=True)
+
+    def resume(self, fade_seconds: float = 0.05):
+        if self._paused:
+            self._paused = False
+            self.fade_to(1.0, fade_seconds)
+
+    def fade_to(self, level: float, seconds: float, pause: bool = False):
+        """Ramp the deck's fade level; optionally pause once it reaches silence."""
+        self._pause_when_silent = pause
+        self._fade_target = max(0.0, min(1.0, level))
+        frames = seconds * self._sample_rate
+        if frames <= 0:
+            self._fade = self._fade_target
+            self._fade_step = 0.0
+        else:
+            self._fade_step = (self._fade_target - self._fade) / frames
+
+    def set_volume(self, level: float):
+        self._volume = max(0.0, min(1.0, level))
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    @property
+    def is_active(self) -> bool:
+        return any(not v.done and not v.stopping for v in self._voices)
+
+    @property
+    def is_paused(self) -> bool:
+        return self._paused
+
+    @property
+    def is_fading(self) -> bool:
+        return self._fade_step != 0.0
+
+    @property
+    def fading_out(self) -> bool:
+        return self._fade_step < 0.0
+
+    @property
+    def current_path(self) -> Optional[str]:
+        """Track currently audible (the incoming one once a crossfade starts)."""
+        for v in reversed(self._voices):
+            if not v.done and not v.stopping and v.started:
+                return v.current_path
+        return None
+
+    def get_underruns(self) -> int:
+        return sum(v.underruns for v in self._voices)
+
+    # ── Rendering (audio thread) ───────────────────────────────────
+
+    def render(self, frames: int) -> Optional[np.ndarray]:
+        """Return the deck's planar output for this block, or None when silent."""
+        voices = self._voices
+        if not voices or self._paused:
+            return None
+
+        prime = int(self.PRIME_SECONDS * self._sample_rate)
+        out = None
+        for voice in voices:
+            if voice.done:
+                continue
+            if not voice.started:
+                buffered = voice.written - voice.read
+                if buffered < prime and voice.eof_at is None:
+                    continue
+                self._start_voice(voice, voices)
+            chunk = self._read_voice(voice, frames)
+            if chunk is None:
+                continue
+            out = chunk if out is None else out + chunk
+
+        gain_start = self._applied_gain
+        self._advance_fade(frames)
+        gain_end = self._volume * self._fade
+        self._applied_gain = gain_end
+        if out is None:
+            return None
+        if gain_start == gain_end:
+            out *= np.float32(gain_end)
+        else:
+            out *= np.linspace(gain_start, gain_end, frames, dtype=np.float32)
+        return out
+
+    def _start_voice(self, voice: _Voice, voices: tuple):
+        """Start an incoming voice and fade the others out from the same sample."""
+        voice.started = True
+        if voice.fade_step > 0.0:
+            for other in voices:
+                if other is not voice and not other.done:
+                    other.fade_step = -voice.fade_step
+
+    def _read_voice(self, voice: _Voice, frames: int) -> Optional[np.ndarray]:
+        size = voice.ring.shape[1]
+        available = voice.written - voice.read
+        n = min(frames, available)
+
+        chunk = np.zeros((self._channels, frames), dtype=np.float32)
+        start = voice.read % size
+        first = min(n, size - start)
+        chunk[:, :first] = voice.ring[:, start: start + first]
+        chunk[:, first:n] = voice.ring[:, : n - first]
+        voice.read += n
+
+        while voice.boundaries and voice.boundaries[0][0] <= voice.read:
+            voice.current_path = voice.boundaries.popleft()[1]
+
+        if voice.eof_at is not None and voice.read >= voice.eof_at:
+            voice.done = True
+        elif n < frames:
+            voice.underruns += 1
+
+        if voice.fade_step != 0.0 or voice.fade_pos < 1.0:
+            pos = voice.fade_pos + voice.fade_step * np.arange(1, frames + 1)
+            np.clip(pos, 0.0, 1.0, out=pos)
+            chunk *= np.sin(pos * (np.pi / 2)).astype(np.float32)
+            voice.fade_pos = float(pos[-1])
+            if voice.fade_pos <= 0.0:
+                voice.done = True
+            elif voice.fade_pos >= 1.0:
+                voice.fade_step = 0.0
+        return chunk
+
+    def _advance_fade(self, frames: int):
+        if self._fade_step == 0.0:
+            return
+        fade = self._fade + self._fade_step * frames
+        if (self._fade_step > 0 and fade >= self._fade_target) or \
+                (self._fade_step < 0 and fade <= self._fade_target):
+            fade = self._fade_target
+            self._fade_step = 0.0
+            if fade == 0.0 and self._pause_when_silent:
+                self._paused = True
+                self._pause_when_silent = False
+        self._fade = fade
+
+    # ── Decoder thread ─────────────────────────────────────────────
+
+    def _ensure_decoder(self):
+        if self._decoder is None or not self._decoder.is_alive():
+            self._decoder = threading.Thread(target=self._decode_loop, daemon=True)
+            self._decoder.start()
+
+    def _decode_loop(self):
+        while True:
+            busy = False
+            with self._lock:
+                self._voices = tuple(v for v in self._voices if not v.done)
+                voices = self._voices
+                if not voices:
+                    # Idle: play() starts a new decoder (see _ensure_decoder)
+                    self._decoder = None
+                    return
+            for voice in voices:
+                try:
+                    busy |= self._fill(voice)
+                except Exception as e:
+                    print(f"[MusicDeck] Error decoding {voice.path}: {e}")
+                    voice.eof_at = voice.written
+                    self._close(voice)
+            if not busy:
+                self._wake.wait(timeout=0.05)
+                self._wake.clear()
+
+    def _fill(self, voice: _Voice) -> bool:
+        """Decode one block into the voice's ring if there is room. Returns True if work was done."""
+        if voice.done or voice.eof_at is not None:
+            self._close(voice)
+            return False
+        if voice.file is None:
+            self._open(voice, voice.path)
+
+        # The ring holds resampled frames: room for one decoded block at the
+        # output rate, plus a block of headroom for the resampler's flush
+        size = voice.ring.shape[1]
+        needed = -(-self.DECODE_FRAMES * self._sample_rate // voice.file.samplerate)
+        if size - (voice.written - voice.read) < needed + self.DECODE_FRAMES:
+            return False
+
+        block = voice.file.read(self.DECODE_FRAMES, dtype="float32", always_2d=True).T
+        if block.shape[1] == 0:
+            # The resampler's filter delay still holds the end of the track
+            self._write(voice, voice.resampler.flush())
+            self._close(voice)
+            nxt = self._next_provider(voice.path) if self._next_provider else None
+            if nxt is None:
+                voice.eof_at = voice.written
+                return False
+            # Gapless: the next track continues in the same ring
+            voice.path = nxt
+            self._open(voice, nxt)
+            voice.boundaries.append((voice.written, nxt))
+            return True
+
+        if block.shape[0] == 1:
+            block = np.repeat(block, self._channels, axis=0)
+        elif block.shape[0] > self._channels:
+            block = block[: self._channels]
+        self._write(voice, voice.resampler.process(block))
+        return True
+
+    @staticmethod
+    def _write(voice: _Voice, block: np.ndarray):
+        size = voice.ring.shape[1]
+        n = block.shape[1]
+        start = voice.written % size
+        first = min(n, size - start)
+        voice.ring[:, start: start + first] = block[:, :first]
+        voice.ring[:, : n - first] = block[:, first:]
+        voice.written += n
+
+    def _open(self, voice: _Voice, path: str):
+        voice.file = sf.SoundFile(path)
+        voice.resampler = make_resampler(voice.file.samplerate, self._sample_rate, self._channels)
+
+    @staticmethod
+    def _close(voice: _Voice):
+        if voice.file is not None:
+            voice.file.close()
+            voice.file = None
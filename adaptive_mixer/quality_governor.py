@@ -0,0 +1,104 @@
+"""
+QualityGovernor — Walks a quality ladder when the audio callback runs hot.
+
+The mixer reports how long each callback took relative to the block period.
+When the load stays above DEGRADE_LOAD the governor steps one rung down the
+ladder; when it stays below RESTORE_LOAD for RESTORE_SECONDS it steps back up.
+The gap between the two thresholds (plus a hold time after every step) gives
+hysteresis so the mixer does not flap between levels.
+
+Ladder (level 0 is full quality):
+    1            bypass the master reverb
+    2 .. 1+N     bypass per-stem effects, lowest-priority stem first
+    2+N          drop low-gain stems from the mix (cursors keep advancing)
+"""
+
+from collections import deque
+from typing import Optional
+
+
+class QualityGovernor:
+    DEGRADE_LOAD = 0.75     # fraction of the block period
+    RESTORE_LOAD = 0.40
+    DEGRADE_BLOCKS = 4      # consecutive hot blocks before stepping down
+    RESTORE_SECONDS = 5.0   # sustained headroom before stepping up
+    HOLD_SECONDS = 1.0      # settle time after any step
+
+    LOW_GAIN = 0.1          # stems quieter than this are dropped at the last rung
+
+    def __init__(self):
+        self.level: int = 0
+        self.max_level: int = 2
+        self._fx_order: list = []  # stem ids with live effects, lowest priority first
+
+        self._hot_blocks: int = 0
+        self._cool_seconds: float = 0.0
+        self._hold_seconds: float = 0.0
+        self._log: deque = deque(maxlen=32)
+
+    # ── Ladder shape ───────────────────────────────────────────────
+
+    def set_effect_order(self, stem_ids: list):
+        """Set the per-stem effect bypass order for the current scene."""
+        self._fx_order = list(stem_ids)
+        self.max_level = 2 + len(self._fx_order)
+        if self.level > self.max_level:
+            self.level = self.max_level
+
+    @property
+    def bypass_master_fx(self) -> bool:
+        return self.level >= 1
+
+    @property
+    def bypassed_stem_fx(self) -> frozenset:
+        return frozenset(self._fx_order[:max(0, self.level - 1)])
+
+    @property
+    def drop_low_gain(self) -> bool:
+        return self.level >= self.max_level
+
+    def describe(self, level: Optional[int] = None) -> str:
+        level = self.level if level is None else level
+        if level <= 0:
+            return "full quality"
+        if level == 1:
+            return "master reverb bypassed"
+        if level < self.max_level:
+            return f"stem fx bypassed: {', '.join(self._fx_order[:level - 1])}"
+        return "low-gain stems dropped"
+
+    # ── Measurement (audio thread) ─────────────────────────────────
+
+    def update(self, elapsed_seconds: float, period_seconds: float):
+        """Feed one callback's cost. Cheap enough to call from the audio thread."""
+        if self._hold_seconds > 0.0:
+            self._hold_seconds -= period_seconds
+            return
+
+        load = elapsed_seconds / period_seconds
+        if load > self.DEGRADE_LOAD:
+            self._cool_seconds = 0.0
+            self._hot_blocks += 1
+            if self._hot_blocks >= self.DEGRADE_BLOCKS and self.level < self.max_level:
+                self._step(self.level + 1, load)
+        elif load < self.RESTORE_LOAD:
+            self._hot_blocks = 0
+            self._cool_seconds += period_seconds
+            if self._cool_seconds >= self.RESTORE_SECONDS and self.level > 0:
+                self._step(self.level - 1, load)
+        else:
+            self._hot_blocks = 0
+            self._cool_seconds = 0.0
+
+    def _step(self, level: int, load: float):
+        direction = "degrade" if level > self.level else "restore"
+        self.level = level
+        self._hot_blocks = 0
+        self._cool_seconds = 0.0
+        self._hold_seconds = self.HOLD_SECONDS
+        # Printed later from a non-audio thread (see flush_log)
+        self._log.append(f"{direction} to level {level} ({self.describe(level)}), load {load:.0%}")
+
+    def flush_log(self):
+        while self._log:
+            print(f"[QualityGovernor] {self._log.popleft()}")
@@ -0,0 +1,173 @@
+"""
+resample — Sample-rate conversion that streams block by block.
+
+A resampler keeps the state a block boundary needs (read position and the
+last input frames), so a file can be converted in fixed-size blocks and the
+output is the same as converting it in one piece. Input and output are
+planar float32 arrays of shape (channels, frames).
+
+PolyphaseResampler is the one to use for audio that is kept: a windowed-sinc
+low-pass split into one filter per output phase, applied to all channels at
+once. Filters are designed once per rate pair and cached. LinearResampler is
+cheap but aliases; it is kept for rate pairs too awkward for a filter bank.
+
+    data = resample(data, 48000, 44100)          # whole array
+    r = make_resampler(48000, 44100)             # streaming
+    out = [r.process(block) for block in blocks] + [r.flush()]
+
+tools/bench_resample.py measures throughput against np.interp.
+"""
+
+import math
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Filter zero crossings on each side of the centre, at the lower of the two rates
+ZERO_CROSSINGS = 32
+# Kaiser window shape; about 70 dB stopband attenuation
+KAISER_BETA = 7.0
+# Filter cutoff as a fraction of the lower Nyquist frequency, placed so the
+# stopband starts at Nyquist: flat to ~18 kHz at 44.1 kHz, aliases below -70 dB
+ROLLOFF = 0.93
+# Input frames filtered per pass; larger blocks are split (keeps the working set in cache)
+CHUNK_FRAMES = 1 << 16
+# Beyond this many phases (awkward ratios like 44100 -> 44101) the filter bank
+# gets too large and make_resampler() falls back to linear interpolation
+MAX_PHASES = 1024
+
+
+class LinearResampler:
+    """Streaming linear-interpolation resampler, planar in and out."""
+
+    def __init__(self, src_rate: int, dst_rate: int):
+        self._step = src_rate / dst_rate
+        self._pos = 0.0
+        self._prev: Optional[np.ndarray] = None
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self._step == 1.0:
+            return block
+        data = block if self._prev is None else np.concatenate((self._prev, block), axis=1)
+        last = data.shape[1] - 1
+        # Copied: the caller may reuse `block`'s buffer for its next read
+        self._prev = data[:, -1:].copy()
+        if self._pos >= last:
+            self._pos -= last
+            return np.zeros((data.shape[0], 0), dtype=np.float32)
+        idx = self._pos + self._step * np.arange(int(np.ceil((last - self._pos) / self._step)))
+        i0 = idx.astype(np.int64)
+        frac = (idx - i0).astype(np.float32)
+        out = data[:, i0] * (1.0 - frac) + data[:, i0 + 1] * frac
+        self._pos = idx[-1] + self._step - last
+        return out.astype(np.float32, copy=False)
+
+    def flush(self) -> np.ndarray:
+        """Nothing is held back; here so both resamplers stream the same way."""
+        channels = 0 if self._prev is None else self._prev.shape[0]
+        return np.zeros((channels, 0), dtype=np.float32)
+
+
+@lru_cache(maxsize=16)
+def _filter_bank(up: int, down: int, zero_crossings: int = ZERO_CROSSINGS) -> tuple:
+    """
+    Polyphase windowed-sinc filters for resampling by up/down.
+
+    Returns (bank, taps, centre): bank[p] holds the `taps` coefficients of
+    phase p, reversed so a window of input frames in order can be dotted
+    with it directly; `centre` is the filter's delay in upsampled samples.
+    """
+    taps = 2 * int(math.ceil(zero_crossings * max(1.0, down / up)))
+    length = taps * up
+    centre = length // 2
+    cutoff = ROLLOFF * 0.5 / max(up, down)  # cycles per upsampled sample
+    t = np.arange(length) - centre
+    window = np.kaiser(2 * centre + 1, KAISER_BETA)[:length]
+    proto = 2.0 * cutoff * np.sinc(2.0 * cutoff * t) * window * up
+    # proto[p + k * up] is tap k of phase p; reverse the taps for windowed dot products
+    bank = proto.reshape(taps, up).T[:, ::-1]
+    return np.ascontiguousarray(bank, dtype=np.float32), taps, centre
+
+
+class PolyphaseResampler:
+    """
+    Streaming polyphase windowed-sinc resampler, planar in and out, delay
+    compensated. Fewer `zero_crossings` trade steepness for speed, e.g. for
+    oversampling to find peaks.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: Optional[int] = None,
+                 zero_crossings: int = ZERO_CROSSINGS):
+        g = math.gcd(int(src_rate), int(dst_rate))
+        self._up = int(dst_rate) // g
+        self._down = int(src_rate) // g
+        self._bank, self._taps, self._centre = _filter_bank(self._up, self._down, zero_crossings)
+        self._history: Optional[np.ndarray] = None
+        if channels is not None:
+            self._history = np.zeros((channels, self._taps - 1), dtype=np.float32)
+        self._frames_in = 0   # input frames consumed so far
+        self._frames_out = 0  # output frames produced so far
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        if self._up == self._down:
+            return block
+        if block.shape[1] > CHUNK_FRAMES:
+            return np.concatenate([self.process(block[:, i: i + CHUNK_FRAMES])
+                                   for i in range(0, block.shape[1], CHUNK_FRAMES)], axis=1)
+        if self._history is None:
+            self._history = np.zeros((block.shape[0], self._taps - 1), dtype=np.float32)
+        up, down, taps = self._up, self._down, self._taps
+
+        # data[:, j] is input frame (ext_start + j); the history starts it off with taps-1 frames
+        data = np.concatenate((self._history, block.astype(np.float32, copy=False)), axis=1)
+        ext_start = self._frames_in - (taps - 1)
+        self._frames_in += block.shape[1]
+        self._history = data[:, data.shape[1] - (taps - 1):].copy()
+
+        # Output n sits at upsampled time n*down + centre; it needs input frames up to t // up
+        end = -(-(self._frames_in * up - self._centre) // down)
+        count = max(0, end - self._frames_out)
+        out = np.empty((data.shape[0], count), dtype=np.float32)
+        if count == 0:
+            return out
+        windows = sliding_window_view(data, taps, axis=1)  # windows[:, j] = data[:, j:j+taps]
+
+        # Outputs L apart share a phase and their windows are `down` frames apart,
+        # so each phase is one strided view times one filter
+        first = self._frames_out * down + self._centre
+        for j in range(min(up, count)):
+            t = first + j * down
+            start = t // up - ext_start - (taps - 1)
+            m = len(range(j, count, up))
+            out[:, j::up] = windows[:, start: start + down * (m - 1) + 1: down] @ self._bank[t % up]
+        self._frames_out = end
+        return out
+
+    def flush(self) -> np.ndarray:
+        """The output still held back by the filter delay, once the input has ended."""
+        if self._history is None:
+            return np.zeros((0, 0), dtype=np.float32)
+        remaining = -(-self._frames_in * self._up // self._down) - self._frames_out
+        if self._up == self._down or remaining <= 0:
+            return np.zeros((self._history.shape[0], 0), dtype=np.float32)
+        pad = np.zeros((self._history.shape[0], self._taps + self._centre // self._up + 1),
+                       dtype=np.float32)
+        return self.process(pad)[:, :remaining]
+
+
+def make_resampler(src_rate: int, dst_rate: int, channels: Optional[int] = None):
+    """A PolyphaseResampler, or a LinearResampler if the ratio needs too many phases."""
+    if int(dst_rate) // math.gcd(int(src_rate), int(dst_rate)) > MAX_PHASES:
+        return LinearResampler(src_rate, dst_rate)
+    return PolyphaseResampler(src_rate, dst_rate, channels)
+
+
+def resample(data: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Resample a whole planar array in one call."""
+    if src_rate == dst_rate:
+        return data
+    r = make_resampler(src_rate, dst_rate, data.shape[0])
+    return np.concatenate((r.process(data), r.flush()), axis=1)
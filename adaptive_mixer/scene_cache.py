@@ -0,0 +1,307 @@
+"""
+SceneCache — Keeps recently used scenes decoded in memory.
+
+Decoded stem arrays are held in an LRU bounded by a memory budget, so
+switching back to a scene from earlier in the session skips the decode.
+Scenes that are likely to be requested next (the next F10 scene, scenes
+bound to F-keys) can be preloaded on a background thread.
+
+Static per-stem effects are rendered in at decode time (see stem_fx), so a
+cached scene's arrays already carry their reverb/filter. Scenes with
+"premix_beds" also get one pre-mixed bed per intensity level (see
+intensity_beds). Scene packs (see scene_pack) are mapped rather than decoded
+and already carry both.
+
+If a MemoryAccountant is given, cached scenes are registered with it as
+"cached_scenes" and unpinned ones can be evicted to meet its global budget.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+from .intensity_beds import render_beds
+from .memory import MemoryAccountant
+from .scene_pack import is_scene_pack, load_scene_pack
+from .stem_analysis import scene_gains
+from .stem_fx import decode_stem_with_fx
+from .stem_player import DecodeCancelled
+from .stem_store import resolve_stem_path
+
+
+def _scene_key(scene_dir: str) -> str:
+    return str(Path(scene_dir).resolve())
+
+
+class CachedScene:
+    """A decoded scene: its parsed scene.json plus one audio array per stem."""
+
+    def __init__(self, scene_dir: str, config: dict, stems: dict,
+                 baked: Optional[set] = None, beds: Optional[dict] = None):
+        self.scene_dir = scene_dir
+        self.config = config
+        self.stems = stems  # stem_id -> np.ndarray (shared, read-only)
+        self.baked = baked or set()  # stem ids whose effects are already rendered in
+        self.beds = beds or {}  # intensity level -> pre-mixed np.ndarray
+        self.nbytes = (sum(a.nbytes for a in stems.values())
+                       + sum(a.nbytes for a in self.beds.values()))
+
+
+class SceneCache:
+    def __init__(self, budget_mb: float = 1024, sample_rate: int = 44100, channels: int = 2,
+                 memory: Optional[MemoryAccountant] = None):
+        """
+        Args:
+            budget_mb: Upper bound for decoded audio held by the cache.
+            sample_rate: Sample rate stems are decoded for.
+            channels: Channel count stems are decoded for.
+            memory: Process-wide accountant to register cached scenes with.
+        """
+        self._budget_bytes = int(budget_mb * 1024 * 1024)
+        self._sample_rate = sample_rate
+        self._channels = channels
+        self._memory = memory
+        self._tracked: set = set()  # keys registered with the accountant
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()  # key -> CachedScene, oldest first
+        self._pinned: set = set()
+        self._inflight: dict = {}  # key -> threading.Event while a decode runs
+
+        self._preload_cond = threading.Condition()
+        self._preload_queue: list = []
+        self._preload_thread: Optional[threading.Thread] = None
+
+    # ── Lookup ─────────────────────────────────────────────────────
+
+    def get(self, scene_dir: str,
+            cancelled: Optional[Callable[[], bool]] = None) -> CachedScene:
+        """
+        Return the decoded scene, decoding it now if it is not cached.
+        If a preload of the same scene is already running, waits for it
+        instead of decoding twice.
+
+        `cancelled` is polled while decoding or waiting; DecodeCancelled is
+        raised once it returns True and nothing is added to the cache.
+        """
+        key = _scene_key(scene_dir)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    if self._memory is not None:
+                        self._memory.touch("cached_scenes", key)
+                    return entry
+                pending = self._inflight.get(key)
+                if pending is None:
+                    pending = threading.Event()
+                    self._inflight[key] = pending
+                    break
+            while not pending.wait(timeout=0.05):
+                if cancelled is not None and cancelled():
+                    raise DecodeCancelled(scene_dir)
+
+        try:
+            entry = self._decode(scene_dir, cancelled)
+            with self._lock:
+                self._insert(key, entry, protect=self._pinned)
+            self._sync_memory()
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            pending.set()
+
+    def put(self, scene_dir: str, entry: CachedScene) -> bool:
+        """Insert a scene decoded elsewhere (e.g. by a warm start). Returns False if over budget."""
+        key = _scene_key(scene_dir)
+        with self._lock:
+            inserted = self._insert(key, entry, protect=self._pinned)
+        if inserted:
+            self._sync_memory()
+        return inserted
+
+    def contains(self, scene_dir: str) -> bool:
+        with self._lock:
+            return _scene_key(scene_dir) in self._entries
+
+    def pin(self, scene_dir: str):
+        """Protect a scene from eviction (e.g. the scene currently playing)."""
+        with self._lock:
+            self._pinned.add(_scene_key(scene_dir))
+
+    def unpin(self, scene_dir: str):
+        with self._lock:
+            self._pinned.discard(_scene_key(scene_dir))
+
+    def invalidate(self, scene_dir: str):
+        """Drop a scene so the next get() re-decodes it from disk."""
+        with self._lock:
+            self._entries.pop(_scene_key(scene_dir), None)
+        self._sync_memory()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._sync_memory()
+
+    # ── Preloading ─────────────────────────────────────────────────
+
+    def preload(self, scene_dirs: list):
+        """
+        Decode scenes in the background, most likely first.
+        Replaces any preload requests that have not started yet.
+        """
+        with self._preload_cond:
+            self._preload_queue = list(scene_dirs)
+            if self._preload_thread is None or not self._preload_thread.is_alive():
+                self._preload_thread = threading.Thread(
+                    target=self._preload_loop, daemon=True
+                )
+                self._preload_thread.start()
+            self._preload_cond.notify()
+
+    def _preload_loop(self):
+        batch: set = set()
+        while True:
+            with self._preload_cond:
+                while not self._preload_queue:
+                    batch = set()
+                    self._preload_cond.wait()
+                scene_dir = self._preload_queue.pop(0)
+            key = _scene_key(scene_dir)
+            batch.add(key)
+
+            with self._lock:
+                if key in self._entries or key in self._inflight:
+                    continue
+                # Only preload what fits without evicting pinned scenes or
+                # scenes that were preloaded earlier in this same batch.
+                protected = sum(
+                    e.nbytes for k, e in self._entries.items()
+                    if k in self._pinned or k in batch
+                )
+                if protected >= self._budget_bytes:
+                    continue
+                pending = threading.Event()
+                self._inflight[key] = pending
+
+            try:
+                entry = self._decode(scene_dir)
+                with self._lock:
+                    inserted = self._insert(key, entry, protect=self._pinned | batch)
+                if inserted:
+                    self._sync_memory()
+                else:
+                    print(f"[SceneCache] Skipped preload (over budget): "
+                          f"{entry.config.get('name', scene_dir)}")
+            except Exception as e:
+                print(f"[SceneCache] Preload failed for {scene_dir}: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                pending.set()
+
+    # ── Internals ──────────────────────────────────────────────────
+
+    def _decode(self, scene_dir: str,
+                cancelled: Optional[Callable[[], bool]] = None) -> CachedScene:
+        if is_scene_pack(scene_dir):
+            # Mapped, not decoded: effects and beds were rendered when packing
+            config, stems, baked, beds = load_scene_pack(scene_dir, self._sample_rate, self._channels)
+            return CachedScene(scene_dir, config, stems, baked, beds)
+
+        scene_path = Path(scene_dir)
+        config_path = scene_path / "scene.json"
+        if not config_path.exists():
+            raise FileNotFoundError(f"No scene.json found in {scene_dir}")
+
+        with open(config_path, "r") as f:
+            config = json.load(f)
+
+        fx_config = config.get("effects", {})
+        stems = {}
+        baked = set()
+        for stem_id, stem_config in config.get("stems", {}).items():
+            file_path = resolve_stem_path(scene_dir, stem_config)
+            if not file_path.exists():
+                print(f"[SceneCache] Warning: Stem file not found: {file_path}")
+                continue
+            try:
+                stems[stem_id], is_baked = decode_stem_with_fx(
+                    scene_dir, stem_config, fx_config.get(stem_id),
+                    self._sample_rate, self._channels, cancelled,
+                )
+                if is_baked:
+                    baked.add(stem_id)
+            except DecodeCancelled:
+                raise
+            except Exception as e:
+                print(f"[SceneCache] Error decoding stem '{stem_id}': {e}")
+
+        beds = {}
+        if config.get("premix_beds", False):
+            beds = render_beds(config, stems, baked, scene_gains(scene_dir, config))
+
+        return CachedScene(scene_dir, config, stems, baked, beds)
+
+    def _insert(self, key: str, entry: CachedScene, protect: set) -> bool:
+        """Insert an entry, evicting LRU entries outside `protect`. Caller holds _lock."""
+        if entry.nbytes > self._budget_bytes:
+            return False
+
+        used = sum(e.nbytes for e in self._entries.values())
+        for old_key in list(self._entries.keys()):
+            if used + entry.nbytes <= self._budget_bytes:
+                break
+            if old_key in protect:
+                continue
+            used -= self._entries.pop(old_key).nbytes
+
+        if used + entry.nbytes > self._budget_bytes:
+            return False
+
+        self._entries[key] = entry
+        return True
+
+    def _evict_cold(self, key: str) -> bool:
+        """Accountant eviction callback: drop an unpinned scene."""
+        with self._lock:
+            if key in self._pinned or key in self._inflight:
+                return False
+            if self._entries.pop(key, None) is None:
+                return False
+        self._tracked.discard(key)
+        return True
+
+    def _sync_memory(self):
+        """Mirror the cache's entries into the accountant. Call without holding _lock."""
+        if self._memory is None:
+            return
+        with self._lock:
+            entries = dict(self._entries)
+        for key in self._tracked - entries.keys():
+            self._memory.untrack("cached_scenes", key)
+        for key in entries.keys() - self._tracked:
+            entry = entries[key]
+            self._memory.track(
+                "cached_scenes", key,
+                arrays=list(entry.stems.values()) + list(entry.beds.values()),
+                evict=lambda k=key: self._evict_cold(k),
+            )
+        with self._lock:
+            # Anything the accountant evicted meanwhile is already untracked
+            self._tracked = {k for k in entries if k in self._entries}
+
+    # ── Status ─────────────────────────────────────────────────────
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "scenes": len(self._entries),
+                "bytes": sum(e.nbytes for e in self._entries.values()),
+                "budget_bytes": self._budget_bytes,
+            }
@@ -0,0 +1,109 @@
+"""
+SceneLoader — Latest-wins queue for scene switches.
+
+Scene requests (F-keys, the scene dropdown) are handed to a single worker
+thread. A newer request supersedes the one in flight: its decode and
+fade-out are abandoned before anything is swapped in, so pressing F10 three
+times quickly decodes and commits only the final scene.
+"""
+
+import threading
+from typing import Optional
+
+from .stem_player import DecodeCancelled
+
+
+class SceneLoader:
+    IDLE = "idle"
+    DECODING = "decoding"
+    CROSSFADING = "crossfading"
+
+    def __init__(self, mixer):
+        self._mixer = mixer
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+        self._generation: int = 0          # bumped on every request
+        self._pending: Optional[tuple] = None  # (generation, scene_dir, crossfade_seconds)
+
+        self._state: str = self.IDLE
+        self._target: Optional[str] = None     # scene currently being loaded
+        self._loaded: Optional[str] = None     # last scene swapped in
+        self._loaded_generation: int = 0
+        self._error: Optional[str] = None
+
+    def request(self, scene_dir: str, crossfade_seconds: float = 2.0) -> int:
+        """Queue a scene load, superseding any earlier request. Returns its generation."""
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, scene_dir, crossfade_seconds)
+            self._target = scene_dir
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._generation
+
+    def get_status(self) -> dict:
+        """
+        Snapshot of the loader for the view:
+            state: "idle" | "decoding" | "crossfading"
+            target: scene dir being loaded (None when idle)
+            loaded: scene dir most recently swapped in
+            loaded_generation: increases each time a scene is swapped in
+            error: message from the last failed load, if any
+        """
+        with self._cond:
+            return {
+                "state": self._state,
+                "target": self._target if self._state != self.IDLE else None,
+                "loaded": self._loaded,
+                "loaded_generation": self._loaded_generation,
+                "error": self._error,
+            }
+
+    def mark_loaded(self, scene_dir: str):
+        """Record a scene swapped in (or extended) outside the queue, e.g. by a warm start."""
+        with self._cond:
+            self._loaded = scene_dir
+            self._loaded_generation += 1
+
+    @property
+    def is_busy(self) -> bool:
+        with self._cond:
+            return self._state != self.IDLE or self._pending is not None
+
+    def _superseded(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _set_state(self, state: str):
+        with self._cond:
+            self._state = state
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._state = self.IDLE
+                    self._cond.wait()
+                generation, scene_dir, crossfade = self._pending
+                self._pending = None
+                self._state = self.DECODING
+                self._error = None
+
+            cancelled = lambda g=generation: self._superseded(g)
+            try:
+                prepared = self._mixer._prepare_scene(scene_dir, cancelled)
+                with self._mixer._commit_lock:
+                    if cancelled():
+                        continue
+                    self._set_state(self.CROSSFADING)
+                    self._mixer._commit_scene(prepared, crossfade, cancelled)
+                self.mark_loaded(scene_dir)
+            except DecodeCancelled:
+                print(f"[SceneLoader] Superseded: {scene_dir}")
+            except Exception as e:
+                print(f"[SceneLoader] Failed to load scene {scene_dir}: {e}")
+                with self._cond:
+                    if not self._superseded(generation):
+                        self._error = str(e)
@@ -1,42 +1,306 @@
 """
 SceneManager — Discovers and manages available scene packs.
+
+Scene metadata (name, BPM, key, stems with their length and format) is kept
+in an on-disk index, so startup reads one small file instead of opening every
+scene.json on a possibly network-mounted library. Rescans are incremental:
+a scene is only re-read when its directory or its scene.json changed mtime.
+The full scene.json is parsed lazily, when get_scene_config() asks for it.
+The entries also feed a LibraryIndex, queried through find_scenes() and
+find_stems().
+
+A scene is either a folder with scene.json or a "<id>.scenepack" file
+(see scene_pack); if both exist the pack wins.
+
+With an index on disk the constructor returns immediately and validates the
+index on a background thread; listeners (add_listener) are told when that
+or any later scan changes the scene list.
 """
 
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+
+import soundfile as sf
+
+from .library_index import LibraryIndex
+from .scene_pack import PACK_SUFFIX, is_scene_pack, load_scene_config, read_pack_header
+from .stem_store import resolve_stem_path
+
+
+INDEX_PATH = "config/scene_index.json"
+INDEX_VERSION = 2
+
+
+def _library_key(scenes_dir: Path) -> str:
+    return str(scenes_dir.resolve())
 
 
 class SceneManager:
-    def __init__(self, scenes_dir: str = "assets/music/scenes"):
+    def __init__(self, scenes_dir: str = "assets/music/scenes",
+                 index_path: Optional[str] = INDEX_PATH):
+        """
+        Args:
+            scenes_dir: Library directory holding one folder per scene.
+            index_path: Where the metadata index is kept (None = no index,
+                every start does a full scan).
+        """
         self._scenes_dir = Path(scenes_dir)
-        self._scenes: dict = {}  # scene_id -> {"path": ..., "config": ..., "name": ...}
-        self.scan()
+        self._index_path = Path(index_path) if index_path else None
+        self._scenes: dict = {}   # scene_id -> index entry (metadata only)
+        self._configs: dict = {}  # scene_id -> (json_mtime, parsed scene.json)
+        self._scan_lock = threading.Lock()
+        self._listeners: list = []
+        self.index = LibraryIndex()
+
+        if self._load_index():
+            threading.Thread(target=self.scan, daemon=True).start()
+        else:
+            self.scan()
+
+    # ── Scanning ───────────────────────────────────────────────────
+
+    def set_scenes_dir(self, scenes_dir: str):
+        """Switch to another library (its own index entry is loaded if present)."""
+        path = Path(scenes_dir)
+        if path == self._scenes_dir:
+            return
+        with self._scan_lock:
+            self._scenes_dir = path
+            self._scenes = {}
+            self._configs = {}
+            self.index.rebuild({})
+        self._load_index()
 
     def scan(self):
-        """Scan the scenes directory for valid scene packs."""
-        self._scenes.clear()
-        if not self._scenes_dir.exists():
+        """Bring the scene list up to date, re-reading only scenes whose mtime changed."""
+        with self._scan_lock:
+            old = self._scenes
+            new = {}
+            reread = 0
+            if self._scenes_dir.exists():
+                sources = {}
+                for path in sorted(self._scenes_dir.iterdir()):
+                    if is_scene_pack(path):
+                        sources[path.name[:-len(PACK_SUFFIX)]] = path
+                    else:
+                        sources.setdefault(path.name, path)
+                for scene_id, source in sorted(sources.items()):
+                    entry = self._index_scene(source, old.get(scene_id))
+                    if entry is None:
+                        continue
+                    if entry is not old.get(scene_id):
+                        reread += 1
+                    new[scene_id] = entry
+
+            changed = new.keys() != old.keys() or reread > 0
+            self._scenes = new
+            if changed:
+                for scene_id in old.keys() - new.keys():
+                    self.index.remove_scene(scene_id)
+                for scene_id, entry in new.items():
+                    if entry is not old.get(scene_id):
+                        self.index.update_scene(scene_id, entry)
+                self._save_index()
+
+        print(f"[SceneManager] Found {len(new)} scene(s), re-read {reread}")
+        if changed:
+            self._notify()
+
+    def rescan_scene(self, scene_id: str, force: bool = False) -> bool:
+        """
+        Re-check one scene directory (added, edited or removed). Returns True
+        if it changed. `force` re-reads it even if its mtimes did not move,
+        e.g. when a stem was overwritten in place.
+        """
+        with self._scan_lock:
+            old = self._scenes.get(scene_id)
+            entry = self._index_scene(self._scene_source(scene_id), None if force else old)
+            if entry is old:
+                return False
+            scenes = dict(self._scenes)
+            if entry is None:
+                scenes.pop(scene_id, None)
+                self.index.remove_scene(scene_id)
+            else:
+                scenes[scene_id] = entry
+                scenes = dict(sorted(scenes.items()))
+                self.index.update_scene(scene_id, entry)
+            self._scenes = scenes
+            self._configs.pop(scene_id, None)
+            self._save_index()
+        self._notify()
+        return True
+
+    def rescan_paths(self, paths) -> list:
+        """
+        Apply file changes reported by a watcher: every scene that owns one of
+        `paths` is re-read. Returns the ids of the scenes that were re-read.
+        """
+        root = self._scenes_dir.resolve()
+        scene_ids = set()
+        for path in paths:
+            try:
+                rel = Path(path).resolve().relative_to(root)
+            except ValueError:
+                continue
+            if not rel.parts:
+                # The watcher lost track (e.g. queue overflow): rescan everything
+                self.scan()
+                return list(self._scenes)
+            name = rel.parts[0]
+            if name.endswith(PACK_SUFFIX):
+                name = name[:-len(PACK_SUFFIX)]
+            scene_ids.add(name)
+        return [sid for sid in sorted(scene_ids) if self.rescan_scene(sid, force=True)]
+
+    def _scene_source(self, scene_id: str) -> Path:
+        pack = self._scenes_dir / (scene_id + PACK_SUFFIX)
+        return pack if pack.is_file() else self._scenes_dir / scene_id
+
+    def _index_scene(self, scene_dir: Path, old: Optional[dict]) -> Optional[dict]:
+        """Index entry for a scene directory or pack; `old` is returned as-is if nothing changed."""
+        if is_scene_pack(scene_dir):
+            return self._index_pack(scene_dir, old)
+        config_path = scene_dir / "scene.json"
+        try:
+            if not scene_dir.is_dir():
+                return None
+            dir_mtime = scene_dir.stat().st_mtime_ns
+            json_mtime = config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        if old and old["dir_mtime"] == dir_mtime and old["json_mtime"] == json_mtime:
+            return old
+
+        try:
+            with open(config_path, "r") as f:
+                config = json.load(f)
+        except Exception as e:
+            print(f"[SceneManager] Warning: Invalid scene config in {scene_dir}: {e}")
+            return None
+
+        stems = {}
+        for stem_id, stem_config in config.get("stems", {}).items():
+            info = {key: stem_config[key] for key in ("file", "layer", "role", "description")
+                    if stem_config.get(key) is not None}
+            try:
+                meta = sf.info(str(resolve_stem_path(scene_dir, stem_config)))
+                info.update(frames=meta.frames, samplerate=meta.samplerate,
+                            channels=meta.channels, duration=round(meta.duration, 3))
+            except Exception:
+                info["missing"] = True
+            stems[stem_id] = info
+
+        self._configs[scene_dir.name] = (json_mtime, config)
+        return {
+            "path": str(scene_dir),
+            "name": config.get("name", scene_dir.name),
+            "bpm": config.get("bpm"),
+            "key": config.get("key"),
+            "stems": stems,
+            "dir_mtime": dir_mtime,
+            "json_mtime": json_mtime,
+        }
+
+    def _index_pack(self, pack_path: Path, old: Optional[dict]) -> Optional[dict]:
+        try:
+            mtime = pack_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        if old and old["dir_mtime"] == mtime and old["json_mtime"] == mtime:
+            return old
+        try:
+            header = read_pack_header(str(pack_path))
+        except Exception as e:
+            print(f"[SceneManager] Warning: Invalid scene pack {pack_path}: {e}")
+            return None
+
+        config = header["config"]
+        rate, channels = header["sample_rate"], header["channels"]
+        stems = {}
+        for stem_id, stem_config in config.get("stems", {}).items():
+            info = {key: stem_config[key] for key in ("file", "layer", "role", "description")
+                    if stem_config.get(key) is not None}
+            block = header["stems"].get(stem_id)
+            if block is None:
+                info["missing"] = True
+            else:
+                info.update(frames=block["frames"], samplerate=rate, channels=channels,
+                            duration=round(block["frames"] / rate, 3))
+            stems[stem_id] = info
+
+        scene_id = pack_path.name[:-len(PACK_SUFFIX)]
+        self._configs[scene_id] = (mtime, config)
+        return {
+            "path": str(pack_path),
+            "name": config.get("name", scene_id),
+            "bpm": config.get("bpm"),
+            "key": config.get("key"),
+            "stems": stems,
+            "pack": True,
+            "dir_mtime": mtime,
+            "json_mtime": mtime,
+        }
+
+    # ── Index persistence ──────────────────────────────────────────
+
+    def _load_index(self) -> bool:
+        if self._index_path is None or not self._index_path.exists():
+            return False
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"[SceneManager] Ignoring unreadable index {self._index_path}: {e}")
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        scenes = data.get("libraries", {}).get(_library_key(self._scenes_dir))
+        if scenes is None:
+            return False
+        self._scenes = scenes
+        self.index.rebuild(scenes)
+        return True
+
+    def _save_index(self):
+        """Write this library's entries into the index file. Caller holds _scan_lock."""
+        if self._index_path is None:
             return
+        data = {"version": INDEX_VERSION, "libraries": {}}
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                existing = json.load(f)
+            if existing.get("version") == INDEX_VERSION:
+                data = existing
+        except Exception:
+            pass
+        data["libraries"][_library_key(self._scenes_dir)] = self._scenes
+        try:
+            self._index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = str(self._index_path) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self._index_path)
+        except Exception as e:
+            print(f"[SceneManager] Could not write index {self._index_path}: {e}")
+
+    # ── Listeners ──────────────────────────────────────────────────
+
+    def add_listener(self, callback: Callable[[], None]):
+        """`callback()` runs (on the scanning thread) whenever the scene list changes."""
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for cb in self._listeners:
+            try:
+                cb()
+            except Exception as e:
+                print(f"[SceneManager] Listener error: {e}")
 
-        for scene_dir in sorted(self._scenes_dir.iterdir()):
-            if scene_dir.is_dir():
-                config_path = scene_dir / "scene.json"
-                if config_path.exists():
-                    try:
-                        with open(config_path, "r") as f:
-                            config = json.load(f)
-                        scene_id = scene_dir.name
-                        self._scenes[scene_id] = {
-                            "path": str(scene_dir),
-                            "config": config,
-                            "name": config.get("name", scene_id),
-                        }
-                    except Exception as e:
-                        print(f"[SceneManager] Warning: Invalid scene config in {scene_dir}: {e}")
-
-        print(f"[SceneManager] Found {len(self._scenes)} scene(s): "
-              f"{[s['name'] for s in self._scenes.values()]}")
+    # ── Queries ────────────────────────────────────────────────────
 
     def get_scene_list(self) -> list:
         """Return list of available scenes with id, name, path."""
@@ -45,6 +309,26 @@ class SceneManager:
             for sid, s in self._scenes.items()
         ]
 
+    def get_scene_info(self, scene_id: str) -> dict:
+        """Indexed metadata: name, path, bpm, key and stems (file, layer, frames, rate...)."""
+        return self._scenes.get(scene_id, {})
+
+    def get_scene_config(self, scene_id: str) -> dict:
+        """The scene's full scene.json, parsed on first use and re-read if it changed."""
+        entry = self._scenes.get(scene_id)
+        if entry is None:
+            return {}
+        cached = self._configs.get(scene_id)
+        if cached is not None and cached[0] == entry["json_mtime"]:
+            return cached[1]
+        try:
+            config = load_scene_config(entry["path"])
+        except Exception as e:
+            print(f"[SceneManager] Could not read scene.json for {scene_id}: {e}")
+            return {}
+        self._configs[scene_id] = (entry["json_mtime"], config)
+        return config
+
     def get_scene_paths(self) -> list:
         """Return list of scene directory paths."""
         return [s["path"] for s in self._scenes.values()]
@@ -56,3 +340,11 @@ class SceneManager:
 
     def get_scene_count(self) -> int:
         return len(self._scenes)
+
+    def find_scenes(self, **filters) -> list:
+        """Scene ids matching text/key/bpm_min/bpm_max (see LibraryIndex.find_scenes)."""
+        return self.index.find_scenes(**filters)
+
+    def find_stems(self, **filters) -> list:
+        """Stems matching text/role/layer/key/bpm range (see LibraryIndex.find_stems)."""
+        return self.index.find_stems(**filters)
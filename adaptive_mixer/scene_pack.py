@@ -0,0 +1,255 @@
+"""
+scene_pack — Single-file scenes ("<name>.scenepack") loaded by mmap.
+
+A scene directory holds scene.json plus one compressed or PCM file per
+stem, each decoded on load. `prepare_stems.py pack` writes the same scene
+as one file instead: the decoded stems (static effects already rendered
+in) as planar PCM, each block page-aligned so it maps straight into a
+numpy array. Loading a float32 pack maps the file and creates views, with
+no decode, so it takes the same time whatever the scene's length. Pages are
+read from disk on first play, and the OS may drop them again under memory
+pressure. An int16 pack is half the size to copy between machines; it is
+converted to float32 in one vectorized pass on load.
+
+Layout (little-endian):
+
+    0   magic b"SCNPACK\\0", format version (u32), header size (u32),
+        header CRC-32 (u32), zero padding to 32 bytes
+    32  JSON header: name, sample_rate, channels, dtype, the scene.json
+        config, and a table {"stems": {id: block}, "beds": {level: block}}
+        where block = {"offset", "frames", "crc32", "baked"}, plus the
+        stem's "loudness" and "true_peak" if it had an analysis sidecar
+    ... zero padding, then each block at a multiple of PAGE_SIZE:
+        (channels, frames) samples, channel-major
+
+Per-block CRC-32s are checked by verify() (prepare_stems.py verify-pack),
+not on every load, since reading every page would defeat the mmap.
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from .intensity_beds import render_beds
+from .stem_analysis import load_analysis, scene_gains
+from .stem_fx import decode_stem_with_fx
+from .stem_store import resolve_stem_path
+
+
+PACK_SUFFIX = ".scenepack"
+PACK_VERSION = 1
+PAGE_SIZE = 4096
+DTYPES = {"float32": np.float32, "int16": np.int16}
+
+_MAGIC = b"SCNPACK\0"
+_PREFIX = struct.Struct("<8sIII12x")
+_INT16_SCALE = 32767.0
+
+
+def is_scene_pack(path) -> bool:
+    return str(path).endswith(PACK_SUFFIX)
+
+
+def scene_exists(scene_dir: str) -> bool:
+    """True for a scene directory with a scene.json or a .scenepack file."""
+    path = Path(scene_dir)
+    if is_scene_pack(path):
+        return path.is_file()
+    return (path / "scene.json").exists()
+
+
+def load_scene_config(scene_dir: str) -> dict:
+    """The scene's scene.json, from its directory or from a pack's header."""
+    if is_scene_pack(scene_dir):
+        return read_pack_header(scene_dir)["config"]
+    config_path = Path(scene_dir) / "scene.json"
+    if not config_path.exists():
+        raise FileNotFoundError(f"No scene.json found in {scene_dir}")
+    with open(config_path, "r") as f:
+        return json.load(f)
+
+
+def read_pack_header(path: str) -> dict:
+    """Parse a pack's JSON header without mapping its audio."""
+    with open(path, "rb") as f:
+        return _read_header(f, path)
+
+
+def _read_header(f, path) -> dict:
+    prefix = f.read(_PREFIX.size)
+    if len(prefix) != _PREFIX.size:
+        raise ValueError(f"Not a scene pack (truncated): {path}")
+    magic, version, size, crc = _PREFIX.unpack(prefix)
+    if magic != _MAGIC:
+        raise ValueError(f"Not a scene pack: {path}")
+    if version != PACK_VERSION:
+        raise ValueError(f"Unsupported scene pack version {version}: {path}")
+    raw = f.read(size)
+    if len(raw) != size or zlib.crc32(raw) != crc:
+        raise ValueError(f"Scene pack header is corrupt: {path}")
+    return json.loads(raw.decode("utf-8"))
+
+
+class ScenePack:
+    """An opened pack: its header plus the whole file mapped read-only."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            self.header = _read_header(f, self.path)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.config: dict = self.header["config"]
+        self.sample_rate: int = self.header["sample_rate"]
+        self.channels: int = self.header["channels"]
+        self.dtype: str = self.header["dtype"]
+
+    @property
+    def baked(self) -> set:
+        return {sid for sid, block in self.header["stems"].items() if block.get("baked")}
+
+    def stem(self, stem_id: str, channels: Optional[int] = None) -> np.ndarray:
+        return self._array(self.header["stems"][stem_id], channels)
+
+    def beds(self, channels: Optional[int] = None) -> dict:
+        return {int(level): self._array(block, channels)
+                for level, block in self.header.get("beds", {}).items()}
+
+    def _array(self, block: dict, channels: Optional[int]) -> np.ndarray:
+        """Planar view of one block (read-only); int16 is converted to float32."""
+        data = self._raw(block).reshape(self.channels, block["frames"])
+        if self.dtype == "int16":
+            data = data.astype(np.float32) * np.float32(1.0 / _INT16_SCALE)
+        if channels is not None and channels != self.channels:
+            if self.channels != 1:
+                raise ValueError(f"Pack has {self.channels} channels, expected {channels}.")
+            data = np.repeat(data, channels, axis=0)
+        return data
+
+    def _raw(self, block: dict) -> np.ndarray:
+        count = self.channels * block["frames"]
+        return np.frombuffer(self._mm, dtype=DTYPES[self.dtype], count=count,
+                             offset=block["offset"])
+
+    def verify(self) -> list:
+        """Ids of the stems and beds whose checksum does not match."""
+        bad = []
+        tables = [("", self.header["stems"]), ("bed_", self.header.get("beds", {}))]
+        for prefix, table in tables:
+            for name, block in table.items():
+                if zlib.crc32(self._raw(block).data) != block["crc32"]:
+                    bad.append(f"{prefix}{name}")
+        return bad
+
+
+def load_scene_pack(path: str, sample_rate: int, channels: int) -> tuple:
+    """
+    Map a pack for the mixer. Returns (config, stems, baked, beds) with
+    planar arrays shaped like decode_stem_with_fx() output.
+    """
+    pack = ScenePack(path)
+    if pack.sample_rate != sample_rate:
+        raise ValueError(
+            f"Scene pack {Path(path).name} is {pack.sample_rate} Hz, expected {sample_rate}. "
+            f"Re-pack it with --sr {sample_rate}."
+        )
+    stems = {sid: pack.stem(sid, channels) for sid in pack.header["stems"]}
+    return pack.config, stems, pack.baked, pack.beds(channels)
+
+
+# ── Writing ────────────────────────────────────────────────────────
+
+def write_scene_pack(scene_dir: str, out_path: Optional[str] = None,
+                     sample_rate: int = 44100, channels: int = 2, dtype: str = "float32",
+                     progress: Optional[Callable[[str], None]] = None) -> str:
+    """
+    Decode a scene directory (static effects rendered in, beds pre-mixed if
+    the scene asks for them) and write it as one pack. Returns the pack path.
+    The file is written next to the target and renamed over it when done.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {sorted(DTYPES)}")
+    scene_path = Path(scene_dir)
+    config = load_scene_config(scene_dir)
+    out = Path(out_path) if out_path else scene_path.parent / (scene_path.name + PACK_SUFFIX)
+
+    fx_config = config.get("effects", {})
+    stems, baked, analyses = {}, set(), {}
+    for stem_id, stem_config in config.get("stems", {}).items():
+        file_path = resolve_stem_path(scene_dir, stem_config)
+        if not file_path.exists():
+            if progress:
+                progress(f"  {stem_id}: MISSING {stem_config['file']}, skipped")
+            continue
+        stems[stem_id], is_baked = decode_stem_with_fx(
+            scene_dir, stem_config, fx_config.get(stem_id), sample_rate, channels,
+        )
+        if is_baked:
+            baked.add(stem_id)
+        analysis = load_analysis(file_path)
+        if analysis is not None and analysis.loudness is not None:
+            analyses[stem_id] = analysis
+        if progress:
+            progress(f"  {stem_id}: {stems[stem_id].shape[1]} frames"
+                     f"{' (effects baked)' if is_baked else ''}")
+    beds = {}
+    if config.get("premix_beds", False):
+        beds = render_beds(config, stems, baked, scene_gains(scene_dir, config))
+
+    blocks = [("stems", sid, data) for sid, data in stems.items()]
+    blocks += [("beds", str(level), data) for level, data in beds.items()]
+    encoded = [(table, name, _encode(data, dtype)) for table, name, data in blocks]
+
+    header = {
+        "name": config.get("name", scene_path.name),
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "dtype": dtype,
+        "config": config,
+        "stems": {},
+        "beds": {},
+    }
+    # Offsets depend on the header's size and vice versa: grow the data start until it fits
+    data_start = PAGE_SIZE
+    while True:
+        offset = data_start
+        for table, name, pcm in encoded:
+            header[table][name] = {
+                "offset": offset,
+                "frames": pcm.shape[1],
+                "crc32": zlib.crc32(pcm.data),
+                "baked": table == "stems" and name in baked,
+            }
+            if table == "stems" and name in analyses:
+                header[table][name].update(loudness=round(analyses[name].loudness, 2),
+                                           true_peak=round(analyses[name].true_peak, 2))
+            offset = _align(offset + pcm.nbytes)
+        raw = json.dumps(header, separators=(",", ":")).encode("utf-8")
+        if _PREFIX.size + len(raw) <= data_start:
+            break
+        data_start = _align(_PREFIX.size + len(raw))
+
+    tmp = str(out) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(_MAGIC, PACK_VERSION, len(raw), zlib.crc32(raw)))
+        f.write(raw)
+        for table, name, pcm in encoded:
+            f.write(b"\0" * (header[table][name]["offset"] - f.tell()))
+            f.write(pcm.data)
+    os.replace(tmp, out)
+    return str(out)
+
+
+def _encode(data: np.ndarray, dtype: str) -> np.ndarray:
+    if dtype == "int16":
+        data = np.clip(np.round(data * _INT16_SCALE), -_INT16_SCALE, _INT16_SCALE).astype(np.int16)
+    return np.ascontiguousarray(data, dtype=DTYPES[dtype])
+
+
+def _align(offset: int) -> int:
+    return -(-offset // PAGE_SIZE) * PAGE_SIZE
@@ -0,0 +1,236 @@
+"""
+SectionSequencer — Horizontal re-sequencing inside one decoded scene.
+
+A scene.json may name sections of its stems (all stems share one timeline):
+
+    "sections": {
+        "intro":  {"start_bar": 0, "end_bar": 4, "next": "explore"},
+        "explore": {"start_bar": 4, "end_bar": 20},
+        "combat": {"start_bar": 20, "end_bar": 28, "exit": "end"}
+    },
+    "start_section": "intro"
+
+Bounds are given in bars (from the scene's bpm and time signature) or in
+frames ("start"/"end"). At its end a section continues with "next", or loops
+to its own start. jump_to() requests another section; the jump happens at
+the current section's next bar line ("exit": "bar", the default) or only at
+its end ("exit": "end").
+
+The sequencer owns the scene's play position. Once per audio block,
+plan() turns the position and any pending jump into a BlockPlan: which
+frames of the stem arrays fill which part of the block, plus a short
+equal-power crossfade from the old position wherever the timeline jumps.
+Every scene stem then reads the same plan straight from its shared
+array (StemPlayer.read_plan), so nothing is copied or reloaded.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class Section:
+    __slots__ = ("name", "start", "end", "next", "exit")
+
+    def __init__(self, name: str, start: int, end: int,
+                 next_section: Optional[str] = None, exit_rule: str = "bar"):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.next = next_section
+        self.exit = exit_rule
+
+
+class BlockPlan:
+    """
+    How one block is laid out on the stem timeline.
+
+    runs:      [(dst_offset, src_frame, count)] covering the whole block
+    gain:      per-frame gain for the runs (a fade-in after a jump), or None
+    tail_runs: [(dst_offset, src_frame, count)] of the old position fading out
+    tail_gain: per-frame gain for the tail run
+    cursor:    play position after the block
+    """
+    __slots__ = ("frames", "runs", "gain", "tail_runs", "tail_gain", "cursor")
+
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.runs: list = []
+        self.gain: Optional[np.ndarray] = None
+        self.tail_runs: list = []
+        self.tail_gain: Optional[np.ndarray] = None
+        self.cursor = 0
+
+
+def parse_sections(config: dict, sample_rate: int, total_frames: int) -> dict:
+    """Read scene.json "sections" into Section objects (frame bounds, clamped to the stems)."""
+    bpm = config.get("bpm", 120)
+    beats_per_bar = config.get("time_signature", [4, 4])[0]
+    frames_per_bar = 60.0 / bpm * beats_per_bar * sample_rate
+
+    sections = {}
+    for name, spec in config.get("sections", {}).items():
+        if "start_bar" in spec:
+            start = int(round(spec["start_bar"] * frames_per_bar))
+        else:
+            start = int(spec.get("start", 0))
+        if "end_bar" in spec:
+            end = int(round(spec["end_bar"] * frames_per_bar))
+        else:
+            end = int(spec.get("end", total_frames))
+        start = max(0, min(start, total_frames))
+        end = min(end, total_frames)
+        if end <= start:
+            print(f"[SectionSequencer] Skipping empty section '{name}'")
+            continue
+        exit_rule = spec.get("exit", "bar")
+        if exit_rule not in ("bar", "end"):
+            exit_rule = "bar"
+        sections[name] = Section(name, start, end, spec.get("next"), exit_rule)
+
+    for section in sections.values():
+        if section.next is not None and section.next not in sections:
+            print(f"[SectionSequencer] Section '{section.name}': unknown next '{section.next}'")
+            section.next = None
+    return sections
+
+
+class SectionSequencer:
+    CROSSFADE_SECONDS = 0.03
+
+    def __init__(self, sections: dict, frames_per_bar: float, sample_rate: int,
+                 total_frames: int, start_section: Optional[str] = None):
+        self._sections = sections
+        self._frames_per_bar = max(1, int(round(frames_per_bar)))
+        self._total_frames = total_frames
+        self._fade_frames = max(1, int(self.CROSSFADE_SECONDS * sample_rate))
+
+        first = start_section if start_section in sections else next(iter(sections))
+        self._current: str = first
+        self._pos: int = sections[first].start
+        self._pending: Optional[str] = None  # set by any thread, taken by plan()
+
+        # Old position still fading out after a jump
+        self._tail_src = 0
+        self._tail_done = 0
+        self._tail_left = 0
+
+    @classmethod
+    def from_config(cls, config: dict, sample_rate: int,
+                    total_frames: int) -> Optional["SectionSequencer"]:
+        """A sequencer for the scene, or None if it defines no sections."""
+        sections = parse_sections(config, sample_rate, total_frames)
+        if not sections:
+            return None
+        bpm = config.get("bpm", 120)
+        beats_per_bar = config.get("time_signature", [4, 4])[0]
+        frames_per_bar = 60.0 / bpm * beats_per_bar * sample_rate
+        return cls(sections, frames_per_bar, sample_rate, total_frames,
+                   config.get("start_section"))
+
+    # ── Control (any thread) ───────────────────────────────────────
+
+    def jump_to(self, name: str):
+        """Request a jump; applied by plan() at the section's exit point."""
+        if name not in self._sections:
+            raise KeyError(f"Unknown section: {name}")
+        self._pending = name
+
+    @property
+    def current(self) -> str:
+        return self._current
+
+    @property
+    def pending(self) -> Optional[str]:
+        return self._pending
+
+    def get_section_names(self) -> list:
+        return list(self._sections)
+
+    def seek(self, frame: int):
+        """Move to `frame`, entering whichever section contains it. Caller holds the mixer lock."""
+        frame = max(0, min(frame, self._total_frames - 1))
+        for section in self._sections.values():
+            if section.start <= frame < section.end:
+                self._current = section.name
+                self._pos = frame
+                break
+        else:
+            section = self._sections[self._current]
+            self._pos = max(section.start, min(frame, section.end - 1))
+        self._tail_left = 0
+
+    def restart_at(self, name: str):
+        """Jump straight to the start of `name` without a crossfade. Caller holds the mixer lock."""
+        self._current = name
+        self._pos = self._sections[name].start
+        self._pending = None
+        self._tail_left = 0
+
+    # ── Planning (audio thread) ────────────────────────────────────
+
+    def plan(self, frames: int) -> BlockPlan:
+        plan = BlockPlan(frames)
+        tail_dst = 0
+        dst = 0
+        while dst < frames:
+            section = self._sections[self._current]
+            pending = self._pending
+            limit = section.end - self._pos
+            if pending is not None and section.exit == "bar":
+                limit = min(limit, -(self._pos - section.start) % self._frames_per_bar)
+
+            if limit > 0:
+                count = min(frames - dst, limit)
+                plan.runs.append((dst, self._pos, count))
+                self._pos += count
+                dst += count
+                continue
+
+            # At an exit point: a requested jump wins over the section's own follow-on
+            if pending is not None:
+                self._pending = None
+                target = pending
+            else:
+                target = section.next or section.name
+            if self._jump(target):
+                tail_dst = dst
+
+        if self._tail_left > 0:
+            self._plan_tail(plan, tail_dst)
+        plan.cursor = self._pos
+        return plan
+
+    def _jump(self, target: str) -> bool:
+        """Move to `target`'s start. Returns True if a crossfade was started."""
+        start = self._sections[target].start
+        self._current = target
+        if start == self._pos:
+            return False  # contiguous: the timeline just carries on
+        if self._pos >= self._total_frames:
+            # Past the end of the stems there is nothing to fade out: cut
+            # straight to the start, as a plain looping stem does
+            self._pos = start
+            return False
+        self._tail_src = self._pos
+        self._tail_done = 0
+        self._tail_left = self._fade_frames
+        self._pos = start
+        return True
+
+    def _plan_tail(self, plan: BlockPlan, tail_dst: int):
+        count = min(self._tail_left, plan.frames - tail_dst)
+        phase = (self._tail_done + np.arange(1, count + 1, dtype=np.float32)) \
+            * np.float32(np.pi / 2 / self._fade_frames)
+
+        plan.gain = np.ones(plan.frames, dtype=np.float32)
+        plan.gain[tail_dst: tail_dst + count] = np.sin(phase)
+
+        available = min(count, self._total_frames - self._tail_src)
+        if available > 0:
+            plan.tail_runs.append((tail_dst, self._tail_src, available))
+            plan.tail_gain = np.cos(phase[:available])
+
+        self._tail_src += count
+        self._tail_done += count
+        self._tail_left -= count
@@ -0,0 +1,249 @@
+"""
+SessionRecorder — Records the mixer's master output to disk.
+
+Two outputs share one capture path:
+    * a session recording to FLAC or WAV, started and stopped on demand;
+    * a rolling replay buffer holding the last `replay_minutes` of output,
+      which can be saved at any time ("that was a great moment — keep it").
+
+The audio callback only copies each finished block into a preallocated
+single-producer/single-consumer ring (push). A background writer thread
+drains the ring, feeds the replay buffer and does all encoding and file
+I/O. If the writer falls behind and the ring is full, the block is dropped
+and counted — the callback never blocks or allocates.
+"""
+
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+
+RECORDINGS_DIR = "recordings"
+
+
+class SessionRecorder:
+    RING_SECONDS = 4.0       # capture headroom if the writer stalls
+    DRAIN_INTERVAL = 0.05    # writer wake-up period
+
+    FORMATS = {
+        "flac": ("FLAC", "PCM_24"),
+        "wav": ("WAV", "PCM_24"),
+    }
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2,
+                 replay_minutes: float = 5.0, output_dir: str = RECORDINGS_DIR):
+        """
+        Args:
+            replay_minutes: Length of the rolling replay buffer (0 disables it).
+            output_dir: Where recordings and saved replays are written.
+        """
+        self._sample_rate = sample_rate
+        self._channels = channels
+        self._output_dir = Path(output_dir)
+
+        # Capture ring (planar). _written is advanced only by push(), _read
+        # only by the writer thread, so neither side needs a lock.
+        self._ring = np.zeros((channels, int(self.RING_SECONDS * sample_rate)), dtype=np.float32)
+        self._written = 0
+        self._read = 0
+        self._dropped_blocks = 0  # only ever incremented, by push()
+        self._recording_drops_base = 0  # _dropped_blocks when the recording started
+
+        # Replay buffer, owned by the writer thread; int16 halves its footprint
+        self._replay_frames = int(replay_minutes * 60 * sample_rate)
+        self._replay = (np.zeros((self._replay_frames, channels), dtype=np.int16)
+                        if self._replay_frames > 0 else None)
+        self._replay_pos = 0
+        self._replay_filled = 0
+
+        self._lock = threading.Lock()  # GUI/keyboard threads vs writer thread
+        self._file: Optional[sf.SoundFile] = None
+        self._path: Optional[Path] = None
+        self._recorded_frames = 0
+        self._replay_requests: list = []
+
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    # ── Lifecycle ──────────────────────────────────────────────────
+
+    @property
+    def armed(self) -> bool:
+        """True while the callback should push blocks."""
+        return self._running
+
+    def open(self):
+        """Start capturing (replay buffer only until start_recording())."""
+        if self._running:
+            return
+        self._written = self._read = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self.stop_recording()
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    # ── Capture (audio thread) ─────────────────────────────────────
+
+    def push(self, block: np.ndarray):
+        """Copy one planar (channels, frames) block into the ring. Never blocks."""
+        frames = block.shape[1]
+        size = self._ring.shape[1]
+        if frames > size - (self._written - self._read):
+            self._dropped_blocks += 1
+            return
+        start = self._written % size
+        first = min(frames, size - start)
+        self._ring[:, start: start + first] = block[:, :first]
+        if first < frames:
+            self._ring[:, : frames - first] = block[:, first:]
+        self._written += frames
+
+    # ── Recording control (any non-audio thread) ───────────────────
+
+    def start_recording(self, path: Optional[str] = None, fmt: str = "flac") -> str:
+        """Start writing the master output to a file. Returns its path."""
+        fmt = fmt.lower()
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unsupported recording format: {fmt}")
+        self.open()
+        with self._lock:
+            if self._file is not None:
+                return str(self._path)
+            target = Path(path) if path else self._default_path("session", fmt)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            container, subtype = self.FORMATS[fmt]
+            self._file = sf.SoundFile(
+                str(target), mode="w", samplerate=self._sample_rate,
+                channels=self._channels, format=container, subtype=subtype,
+            )
+            self._path = target
+            self._recorded_frames = 0
+            self._recording_drops_base = self._dropped_blocks
+        print(f"[SessionRecorder] Recording to {target}")
+        return str(target)
+
+    def stop_recording(self) -> Optional[str]:
+        """Finish the current recording. Returns its path, or None if not recording."""
+        self._drain()
+        with self._lock:
+            if self._file is None:
+                return None
+            self._file.close()
+            self._file = None
+            path = self._path
+            seconds = self._recorded_frames / self._sample_rate
+        dropped = self._dropped_blocks - self._recording_drops_base
+        drops = f", {dropped} blocks dropped" if dropped else ""
+        print(f"[SessionRecorder] Saved {path} ({seconds:.1f}s{drops})")
+        return str(path)
+
+    def save_replay(self, path: Optional[str] = None, fmt: str = "flac") -> Optional[str]:
+        """Write the replay buffer (the last few minutes of output) to a file."""
+        if self._replay is None:
+            return None
+        target = Path(path) if path else self._default_path("replay", fmt)
+        with self._lock:
+            self._replay_requests.append((target, fmt.lower()))
+        return str(target)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the capture ring and the replay buffer."""
+        return self._ring.nbytes + (self._replay.nbytes if self._replay is not None else 0)
+
+    @property
+    def is_recording(self) -> bool:
+        return self._file is not None
+
+    def get_status(self) -> dict:
+        return {
+            "recording": self._file is not None,
+            "path": str(self._path) if self._file is not None else None,
+            "seconds": self._recorded_frames / self._sample_rate,
+            "replay_seconds": self._replay_filled / self._sample_rate,
+            "dropped_blocks": self._dropped_blocks - self._recording_drops_base,
+        }
+
+    def _default_path(self, prefix: str, fmt: str) -> Path:
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self._output_dir / f"{prefix}_{stamp}.{fmt}"
+
+    # ── Writer thread ──────────────────────────────────────────────
+
+    def _writer_loop(self):
+        reported_drops = 0
+        while self._running:
+            time.sleep(self.DRAIN_INTERVAL)
+            self._drain()
+            self._write_replay_requests()
+            if self._dropped_blocks > reported_drops:
+                print(f"[SessionRecorder] Writer fell behind: "
+                      f"{self._dropped_blocks - reported_drops} blocks dropped")
+                reported_drops = self._dropped_blocks
+
+    def _drain(self):
+        """Move everything pushed so far into the file and the replay buffer."""
+        with self._lock:
+            written = self._written
+            frames = written - self._read
+            if frames <= 0:
+                return
+            size = self._ring.shape[1]
+            start = self._read % size
+            first = min(frames, size - start)
+            data = np.concatenate(
+                (self._ring[:, start: start + first], self._ring[:, : frames - first]), axis=1
+            ).T
+            self._read = written
+
+            if self._file is not None:
+                self._file.write(data)
+                self._recorded_frames += frames
+            if self._replay is not None:
+                self._append_replay(data)
+
+    def _append_replay(self, data: np.ndarray):
+        pcm = (np.clip(data, -1.0, 1.0) * 32767.0).astype(np.int16)
+        if len(pcm) >= self._replay_frames:
+            pcm = pcm[-self._replay_frames:]
+        start = self._replay_pos
+        first = min(len(pcm), self._replay_frames - start)
+        self._replay[start: start + first] = pcm[:first]
+        self._replay[: len(pcm) - first] = pcm[first:]
+        self._replay_pos = (start + len(pcm)) % self._replay_frames
+        self._replay_filled = min(self._replay_filled + len(pcm), self._replay_frames)
+
+    def _write_replay_requests(self):
+        with self._lock:
+            requests, self._replay_requests = self._replay_requests, []
+            if not requests or not self._replay_filled:
+                return
+            # Oldest sample first
+            end = self._replay_pos
+            start = (end - self._replay_filled) % self._replay_frames
+            if start < end:
+                snapshot = self._replay[start:end].copy()
+            else:
+                snapshot = np.concatenate((self._replay[start:], self._replay[:end]))
+
+        for target, fmt in requests:
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                container, _ = self.FORMATS.get(fmt, self.FORMATS["flac"])
+                sf.write(str(target), snapshot, self._sample_rate,
+                         format=container, subtype="PCM_16")
+                print(f"[SessionRecorder] Saved replay {target} "
+                      f"({len(snapshot) / self._sample_rate:.1f}s)")
+            except Exception as e:
+                print(f"[SessionRecorder] Could not save replay {target}: {e}")
@@ -0,0 +1,207 @@
+"""
+SfxPool — One-shot sound effects mixed inside the engine's audio callback.
+
+Soundboard and keyword sounds used to go through pygame.mixer.Sound, which
+adds its own buffering on a separate output stream. The pool plays them in
+the mixer's callback instead:
+
+    * Sounds are decoded once (resampled to the mixer rate) and the arrays
+      are shared by every voice that plays them.
+    * A fixed number of voices. When all are busy, a new sound steals the
+      lowest-priority voice, the oldest one among equals. A sound that
+      outranks nothing is dropped.
+    * play() only queues a trigger; the callback starts it at the beginning
+      of its next block, so trigger latency is at most one block. A sound
+      that was not preloaded is decoded on a worker thread first, so the
+      caller (usually the Tk thread) never waits on a decode.
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+import soundfile as sf
+
+from .memory import MemoryAccountant
+from .resample import resample
+
+
+class _SfxVoice:
+    __slots__ = ("data", "pos", "gain", "priority", "serial")
+
+    def __init__(self):
+        self.data: Optional[np.ndarray] = None  # None = free
+        self.pos = 0
+        self.gain = 1.0
+        self.priority = 0
+        self.serial = 0
+
+
+class SfxPool:
+    DECLICK_FRAMES = 64  # fade applied to a stolen voice
+
+    def __init__(self, sample_rate: int = 44100, channels: int = 2, max_voices: int = 16,
+                 memory: Optional[MemoryAccountant] = None):
+        self._sample_rate = sample_rate
+        self._memory = memory
+        self._channels = channels
+        self._voices = [_SfxVoice() for _ in range(max_voices)]
+        self._serial = 0
+
+        self._buffers: dict = {}  # path -> planar float32 array
+        self._load_lock = threading.Lock()
+        self._triggers: deque = deque()  # (data, gain, priority), appended by any thread
+
+        self._volume = 1.0
+        self._stop_requested = False
+        self.dropped = 0
+
+    # ── Loading (any non-audio thread) ─────────────────────────────
+
+    def load(self, path: str) -> np.ndarray:
+        """Decode a sound (once) and return its shared planar buffer."""
+        data = self._buffers.get(path)
+        if data is not None:
+            return data
+        with self._load_lock:
+            data = self._buffers.get(path)
+            if data is not None:
+                return data
+            data = self._decode(path)
+            self._buffers[path] = data
+        if self._memory is not None:
+            self._memory.track("sfx", path, arrays=[data], evict=lambda: self.unload(path))
+        return data
+
+    def unload(self, path: str) -> bool:
+        """Drop a decoded sound; voices still playing it finish first."""
+        if self._buffers.pop(path, None) is None:
+            return False
+        if self._memory is not None:
+            self._memory.untrack("sfx", path)
+        return True
+
+    def preload(self, paths: list):
+        for path in paths:
+            try:
+                self.load(path)
+            except Exception as e:
+                print(f"[SfxPool] Could not load {path}: {e}")
+
+    def _decode(self, path: str) -> np.ndarray:
+        data, sr = sf.read(path, dtype="float32", always_2d=True)
+        data = data.T
+        if sr != self._sample_rate and data.shape[1]:
+            data = resample(data, sr, self._sample_rate)
+        if data.shape[0] == 1:
+            data = np.repeat(data, self._channels, axis=0)
+        elif data.shape[0] > self._channels:
+            data = data[: self._channels]
+        return np.ascontiguousarray(data)
+
+    # ── Triggering (any thread) ────────────────────────────────────
+
+    def play(self, path: str, volume: float = 1.0, priority: int = 0,
+             on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Queue a one-shot. A sound that was not preloaded is decoded on a
+        worker thread and starts once it is ready; if that fails, `on_error`
+        is called with the exception (on the worker thread).
+        """
+        data = self._buffers.get(path)
+        if data is None:
+            threading.Thread(target=self._load_and_play, args=(path, volume, priority, on_error),
+                             daemon=True).start()
+            return
+        self._trigger(path, data, volume, priority)
+
+    def _load_and_play(self, path: str, volume: float, priority: int,
+                       on_error: Optional[Callable[[Exception], None]]):
+        try:
+            data = self.load(path)
+        except Exception as e:
+            print(f"[SfxPool] Could not load {path}: {e}")
+            if on_error is not None:
+                on_error(e)
+            return
+        self._trigger(path, data, volume, priority)
+
+    def _trigger(self, path: str, data: np.ndarray, volume: float, priority: int):
+        self._triggers.append((data, max(0.0, volume), priority))
+        if self._memory is not None:
+            self._memory.touch("sfx", path)
+
+    def stop_all(self):
+        self._stop_requested = True
+
+    def set_volume(self, level: float):
+        self._volume = max(0.0, min(2.0, level))
+
+    @property
+    def volume(self) -> float:
+        return self._volume
+
+    def active_voices(self) -> int:
+        return sum(1 for v in self._voices if v.data is not None)
+
+    # ── Rendering (audio thread) ───────────────────────────────────
+
+    def render(self, frames: int) -> Optional[np.ndarray]:
+        """Return this block's planar SFX mix, or None when nothing is playing."""
+        tails = []
+        if self._stop_requested:
+            self._stop_requested = False
+            self._triggers.clear()
+            for v in self._voices:
+                if v.data is not None:
+                    tails.append((v.data, v.pos, v.gain))
+                    v.data = None
+
+        while self._triggers:
+            data, gain, priority = self._triggers.popleft()
+            voice = self._allocate(priority)
+            if voice is None:
+                self.dropped += 1
+                continue
+            if voice.data is not None:
+                tails.append((voice.data, voice.pos, voice.gain))
+            self._serial += 1
+            voice.data, voice.pos, voice.gain = data, 0, gain
+            voice.priority, voice.serial = priority, self._serial
+
+        out = None
+        for v in self._voices:
+            if v.data is None:
+                continue
+            if out is None:
+                out = np.zeros((self._channels, frames), dtype=np.float32)
+            n = min(frames, v.data.shape[1] - v.pos)
+            out[:, :n] += v.data[:, v.pos: v.pos + n] * np.float32(v.gain)
+            v.pos += n
+            if v.pos >= v.data.shape[1]:
+                v.data = None
+
+        for data, pos, gain in tails:
+            n = min(frames, self.DECLICK_FRAMES, data.shape[1] - pos)
+            if n <= 0:
+                continue
+            if out is None:
+                out = np.zeros((self._channels, frames), dtype=np.float32)
+            out[:, :n] += data[:, pos: pos + n] * np.linspace(gain, 0.0, n, dtype=np.float32)
+
+        if out is not None and self._volume != 1.0:
+            out *= np.float32(self._volume)
+        return out
+
+    def _allocate(self, priority: int) -> Optional[_SfxVoice]:
+        """A free voice, else the lowest-priority (then oldest) voice not outranking `priority`."""
+        victim = None
+        for v in self._voices:
+            if v.data is None:
+                return v
+            if v.priority <= priority and (
+                victim is None or (v.priority, v.serial) < (victim.priority, victim.serial)
+            ):
+                victim = v
+        return victim
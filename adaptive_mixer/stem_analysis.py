@@ -0,0 +1,415 @@
+"""
+stem_analysis — Loudness, peaks and a waveform overview per stem, in a sidecar.
+
+`prepare_stems.py analyze <scene_dir>` reads each stem once, block by block,
+and writes "<stem file>.analysis" next to the audio (in the stem store for
+hashed stems, so scenes sharing a stem share its sidecar):
+
+    * integrated loudness (ITU-R BS.1770: K-weighting, 400 ms blocks,
+      -70 LUFS absolute and -10 LU relative gates), measured as the mixer
+      plays the stem, so a mono stem counts on both channels,
+    * true peak (4x oversampled) and sample peak,
+    * a min/max waveform pyramid: buckets of BASE_BUCKET frames, then
+      each level 4x coarser, stored as int8.
+
+Nothing here decodes audio at runtime. The GUI draws the timeline from
+waveform(). A scene whose scene.json sets "loudness_match": true has each
+stem trimmed by gain() so stems mastered at different levels start out
+loudness-matched; it is off by default because matching stems one by one
+also flattens the balance the scene was mixed with. A sidecar older than
+its stem is ignored.
+
+Layout (little-endian): a 52-byte header (magic b"STEMANA\\0", version,
+sample rate, frames, channels, base bucket, loudness, true peak, sample
+peak, level count, payload CRC-32), then each level's (count, 2) int8
+min/max pairs, finest first.
+"""
+
+import math
+import os
+import struct
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import soundfile as sf
+
+from .resample import PolyphaseResampler
+from .stem_store import resolve_stem_path
+
+
+SIDECAR_SUFFIX = ".analysis"
+ANALYSIS_VERSION = 1
+
+# Frames per bucket of the finest waveform level; each level above is 4x coarser
+BASE_BUCKET = 256
+LEVEL_FACTOR = 4
+# Levels stop being added once one has this few buckets
+MIN_LEVEL_BUCKETS = 64
+
+# Loudness every stem is trimmed towards, and the limits on that trim
+LOUDNESS_TARGET = -18.0  # LUFS
+MAX_BOOST_DB = 12.0
+MAX_CUT_DB = 24.0
+TRUE_PEAK_CEILING = -1.0  # dBTP; a boost never pushes a stem's true peak above this
+
+ANALYZE_BLOCK_FRAMES = 1 << 16
+
+_MAGIC = b"STEMANA\0"
+_HEADER = struct.Struct("<8sIIQIIfffII")
+_GATE_ABSOLUTE = -70.0
+_GATE_RELATIVE = -10.0
+_OVERSAMPLE = 4
+_OVERSAMPLE_ZERO_CROSSINGS = 6  # 12 taps per phase, as in BS.1770 Annex 2
+
+
+def sidecar_path(audio_path) -> Path:
+    return Path(str(audio_path) + SIDECAR_SUFFIX)
+
+
+def loudness_gain(loudness: Optional[float], true_peak: float,
+                  target: float = LOUDNESS_TARGET) -> float:
+    """Linear trim that brings a stem to `target` LUFS, within the boost/cut/peak limits."""
+    if loudness is None:
+        return 1.0
+    db = max(-MAX_CUT_DB, min(MAX_BOOST_DB, target - loudness))
+    if db > 0:
+        db = max(0.0, min(db, TRUE_PEAK_CEILING - true_peak))
+    return 10.0 ** (db / 20.0)
+
+
+class StemAnalysis:
+    """A stem's loudness, peaks and waveform pyramid, as stored in its sidecar."""
+
+    def __init__(self, sample_rate: int, frames: int, channels: int,
+                 loudness: Optional[float], true_peak: float, sample_peak: float,
+                 levels: list, base_bucket: int = BASE_BUCKET):
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.channels = channels
+        self.loudness = loudness        # LUFS, None if the stem is too short or silent
+        self.true_peak = true_peak      # dBTP
+        self.sample_peak = sample_peak  # dBFS
+        self.levels = levels            # [(count, 2) int8 min/max], finest first
+        self.base_bucket = base_bucket
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    def gain(self, target: float = LOUDNESS_TARGET) -> float:
+        return loudness_gain(self.loudness, self.true_peak, target)
+
+    def waveform(self, width: int) -> tuple:
+        """(mins, maxs) float32 arrays of `width` points in [-1, 1] covering the whole stem."""
+        if width <= 0 or not self.levels or len(self.levels[0]) == 0:
+            empty = np.zeros(max(width, 0), dtype=np.float32)
+            return empty, empty
+        # The coarsest level that still has a bucket for every point
+        level = self.levels[0]
+        for candidate in self.levels:
+            if len(candidate) >= width:
+                level = candidate
+        count = len(level)
+        if count <= width:
+            idx = np.arange(width) * count // width
+            mins, maxs = level[idx, 0], level[idx, 1]
+        else:
+            edges = np.arange(width) * count // width
+            mins = np.minimum.reduceat(level[:, 0], edges)
+            maxs = np.maximum.reduceat(level[:, 1], edges)
+        scale = np.float32(1.0 / 127.0)
+        return mins.astype(np.float32) * scale, maxs.astype(np.float32) * scale
+
+    # ── Serialization ──────────────────────────────────────────────
+
+    def to_bytes(self) -> bytes:
+        payload = b"".join(np.ascontiguousarray(level, dtype=np.int8).tobytes()
+                           for level in self.levels)
+        loudness = math.nan if self.loudness is None else self.loudness
+        header = _HEADER.pack(_MAGIC, ANALYSIS_VERSION, self.sample_rate, self.frames,
+                              self.channels, self.base_bucket, loudness, self.true_peak,
+                              self.sample_peak, len(self.levels), zlib.crc32(payload))
+        return header + payload
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "StemAnalysis":
+        if len(raw) < _HEADER.size:
+            raise ValueError("Analysis sidecar is truncated")
+        (magic, version, rate, frames, channels, base, loudness, true_peak, sample_peak,
+         count, crc) = _HEADER.unpack_from(raw)
+        if magic != _MAGIC:
+            raise ValueError("Not an analysis sidecar")
+        if version != ANALYSIS_VERSION:
+            raise ValueError(f"Unsupported analysis version {version}")
+        payload = memoryview(raw)[_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            raise ValueError("Analysis sidecar is corrupt")
+        levels, offset = [], 0
+        buckets = -(-frames // base)
+        for _ in range(count):
+            size = buckets * 2
+            levels.append(np.frombuffer(payload, dtype=np.int8, count=size,
+                                        offset=offset).reshape(buckets, 2))
+            offset += size
+            buckets = -(-buckets // LEVEL_FACTOR)
+        # Stored as float32; round back to the precision they were measured to
+        return cls(rate, frames, channels, None if math.isnan(loudness) else round(loudness, 2),
+                   round(true_peak, 3), round(sample_peak, 3), levels, base)
+
+
+def write_analysis(audio_path, analysis: StemAnalysis) -> Path:
+    """Write the sidecar next to `audio_path` (via a temp file). Returns its path."""
+    path = sidecar_path(audio_path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(analysis.to_bytes())
+    os.replace(tmp, path)
+    return path
+
+
+def load_analysis(audio_path) -> Optional[StemAnalysis]:
+    """The stem's sidecar, or None if there is none, it is unreadable or older than the audio."""
+    path = sidecar_path(audio_path)
+    try:
+        if path.stat().st_mtime_ns < Path(audio_path).stat().st_mtime_ns:
+            return None
+        with open(path, "rb") as f:
+            return StemAnalysis.from_bytes(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+# ── Scene-level helpers ────────────────────────────────────────────
+
+def stem_gain(scene_dir: str, stem_config: dict, config: Optional[dict] = None) -> float:
+    """
+    Loudness-matching trim for one stem of a scene directory: 1.0 without a
+    sidecar, unless scene.json sets "loudness_match": true on the scene, or
+    if it sets "loudness_match": false on the stem.
+    """
+    if config is not None and not config.get("loudness_match", False):
+        return 1.0
+    if not stem_config.get("loudness_match", True):
+        return 1.0
+    analysis = load_analysis(resolve_stem_path(scene_dir, stem_config))
+    return 1.0 if analysis is None else analysis.gain()
+
+
+def scene_gains(scene_dir: str, config: dict) -> dict:
+    """stem_id -> trim for the stems that have one (see stem_gain)."""
+    from .scene_pack import is_scene_pack, read_pack_header  # scene_pack imports this module
+
+    if not config.get("loudness_match", False):
+        return {}
+    gains = {}
+    if is_scene_pack(scene_dir):
+        # Packs carry their stems' analysis in the header (see write_scene_pack)
+        try:
+            blocks = read_pack_header(scene_dir)["stems"]
+        except (OSError, ValueError):
+            return {}
+        for stem_id, block in blocks.items():
+            stem_config = config.get("stems", {}).get(stem_id, {})
+            if block.get("loudness") is not None and stem_config.get("loudness_match", True):
+                gains[stem_id] = loudness_gain(block["loudness"], block["true_peak"])
+        return gains
+    for stem_id, stem_config in config.get("stems", {}).items():
+        gain = stem_gain(scene_dir, stem_config, config)
+        if gain != 1.0:
+            gains[stem_id] = gain
+    return gains
+
+
+def scene_analyses(scene_dir: str, config: dict) -> list:
+    """The sidecars of a scene directory's stems that have one, for scene_waveform()."""
+    analyses = []
+    for stem_config in config.get("stems", {}).values():
+        analysis = load_analysis(resolve_stem_path(scene_dir, stem_config))
+        if analysis is not None and analysis.frames:
+            analyses.append(analysis)
+    return analyses
+
+
+def scene_waveform(analyses: list, width: int) -> Optional[tuple]:
+    """
+    (mins, maxs) overview of a scene: the envelope over its stems' analyses
+    (see scene_analyses), each spread over the longest stem's duration.
+    None if no stem has been analysed.
+    """
+    if not analyses or width <= 0:
+        return None
+    longest = max(a.duration for a in analyses)
+    mins = np.zeros(width, dtype=np.float32)
+    maxs = np.zeros(width, dtype=np.float32)
+    for analysis in analyses:
+        span = max(1, min(width, int(round(width * analysis.duration / longest))))
+        lo, hi = analysis.waveform(span)
+        np.minimum(mins[:span], lo, out=mins[:span])
+        np.maximum(maxs[:span], hi, out=maxs[:span])
+    return mins, maxs
+
+
+# ── Analysis ───────────────────────────────────────────────────────
+
+def _biquad_response(b: tuple, a: tuple, x: np.ndarray) -> np.ndarray:
+    y = np.zeros_like(x)
+    x1 = x2 = y1 = y2 = 0.0
+    for n, xn in enumerate(x.tolist()):
+        yn = b[0] * xn + b[1] * x1 + b[2] * x2 - a[1] * y1 - a[2] * y2
+        x2, x1, y2, y1 = x1, xn, y1, yn
+        y[n] = yn
+    return y
+
+
+@lru_cache(maxsize=8)
+def _k_weighting(sample_rate: int) -> np.ndarray:
+    """
+    Impulse response of the BS.1770 K-weighting filter (pre-filter shelf plus
+    RLB high-pass) at `sample_rate`, long enough that the dropped tail is
+    below -150 dB. Filtering is then an FFT convolution, vectorized across
+    channels and streamed block by block.
+    """
+    k = math.tan(math.pi * 1681.974450955533 / sample_rate)
+    q = 0.7071752369554196
+    vh = 10.0 ** (3.999843853973347 / 20.0)
+    vb = vh ** 0.4996667741545416
+    a0 = 1.0 + k / q + k * k
+    shelf_b = ((vh + vb * k / q + k * k) / a0, 2.0 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0)
+    shelf_a = (1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0)
+
+    k = math.tan(math.pi * 38.13547087602444 / sample_rate)
+    q = 0.5003270373238773
+    a0 = 1.0 + k / q + k * k
+    hp_b = (1.0, -2.0, 1.0)
+    hp_a = (1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0)
+
+    impulse = np.zeros(int(0.25 * sample_rate))
+    impulse[0] = 1.0
+    h = _biquad_response(hp_b, hp_a, _biquad_response(shelf_b, shelf_a, impulse))
+    return h.astype(np.float64)
+
+
+class _Analyzer:
+    """One streaming pass over a stem: feed() planar blocks, then result()."""
+
+    def __init__(self, sample_rate: int, channels: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        # A mono stem is played on both output channels
+        self._weight = 2.0 if channels == 1 else 1.0
+
+        self._h = _k_weighting(sample_rate)
+        self._history = np.zeros((channels, len(self._h) - 1))
+        self._segment = int(round(0.1 * sample_rate))  # gating blocks are 4 of these
+        self._power_carry = np.zeros(0)
+        self._segment_powers: list = []
+
+        self._oversampler = PolyphaseResampler(1, _OVERSAMPLE, channels, _OVERSAMPLE_ZERO_CROSSINGS)
+        self._true_peak = 0.0
+        self._sample_peak = 0.0
+
+        self._bucket_carry = np.zeros((channels, 0), dtype=np.float32)
+        self._buckets: list = []
+        self._frames = 0
+
+    def feed(self, block: np.ndarray):
+        if block.shape[1] == 0:
+            return
+        self._frames += block.shape[1]
+        self._loudness(block)
+        self._sample_peak = max(self._sample_peak, float(np.abs(block).max()))
+        self._true_peak = max(self._true_peak, _abs_max(self._oversampler.process(block)))
+        self._waveform(block)
+
+    def _loudness(self, block: np.ndarray):
+        # Linear convolution of history + block with h; keep the part that depends on `block` only
+        data = np.concatenate((self._history, block), axis=1)
+        size = 1 << int(math.ceil(math.log2(data.shape[1] + len(self._h) - 1)))
+        spectrum = np.fft.rfft(data, size, axis=1) * np.fft.rfft(self._h, size)
+        filtered = np.fft.irfft(spectrum, size, axis=1)[:, len(self._h) - 1: data.shape[1]]
+        self._history = data[:, data.shape[1] - (len(self._h) - 1):]
+
+        power = np.concatenate((self._power_carry, (filtered * filtered).sum(axis=0)))
+        whole = len(power) // self._segment * self._segment
+        if whole:
+            self._segment_powers.append(power[:whole].reshape(-1, self._segment).mean(axis=1))
+        self._power_carry = power[whole:]
+
+    def _waveform(self, block: np.ndarray):
+        data = np.concatenate((self._bucket_carry, block), axis=1)
+        whole = data.shape[1] // BASE_BUCKET * BASE_BUCKET
+        if whole:
+            buckets = data[:, :whole].reshape(self.channels, -1, BASE_BUCKET)
+            self._buckets.append(np.stack((buckets.min(axis=(0, 2)), buckets.max(axis=(0, 2))), axis=1))
+        self._bucket_carry = data[:, whole:]
+
+    def result(self) -> StemAnalysis:
+        # The oversampler's filter delay holds the last few peaks
+        self._true_peak = max(self._true_peak, _abs_max(self._oversampler.flush()))
+        if self._bucket_carry.shape[1]:
+            carry = self._bucket_carry
+            self._buckets.append(np.array([[carry.min(), carry.max()]], dtype=np.float32))
+        level0 = np.concatenate(self._buckets) if self._buckets else np.zeros((0, 2), np.float32)
+        levels = [_quantize(level0)]
+        while len(levels[-1]) > MIN_LEVEL_BUCKETS:
+            levels.append(_coarsen(levels[-1]))
+
+        return StemAnalysis(
+            self.sample_rate, self._frames, self.channels, self._integrated_loudness(),
+            _db(max(self._true_peak, self._sample_peak)), _db(self._sample_peak), levels,
+        )
+
+    def _integrated_loudness(self) -> Optional[float]:
+        segments = np.concatenate(self._segment_powers) if self._segment_powers else np.zeros(0)
+        if len(segments) < 4:
+            return None
+        # 400 ms gating blocks with 75% overlap: the mean of 4 consecutive 100 ms segments
+        blocks = np.convolve(segments, np.full(4, 0.25), mode="valid") * self._weight
+        with np.errstate(divide="ignore"):
+            block_loudness = -0.691 + 10.0 * np.log10(blocks)
+        gated = blocks[block_loudness > _GATE_ABSOLUTE]
+        if len(gated) == 0:
+            return None
+        relative = -0.691 + 10.0 * math.log10(gated.mean()) + _GATE_RELATIVE
+        gated = blocks[block_loudness > max(relative, _GATE_ABSOLUTE)]
+        return round(-0.691 + 10.0 * math.log10(gated.mean()), 2)
+
+
+def analyze_stem(file_path: str, cancelled: Optional[Callable[[], bool]] = None) -> StemAnalysis:
+    """Analyse an audio file in one streaming pass (memory stays at a few blocks)."""
+    with sf.SoundFile(str(file_path)) as f:
+        analyzer = _Analyzer(f.samplerate, f.channels)
+        scratch = np.empty((ANALYZE_BLOCK_FRAMES, f.channels), dtype=np.float32)
+        while True:
+            if cancelled is not None and cancelled():
+                raise InterruptedError(str(file_path))
+            block = f.read(ANALYZE_BLOCK_FRAMES, dtype="float32", always_2d=True, out=scratch)
+            if len(block) == 0:
+                break
+            analyzer.feed(block.T.astype(np.float64))
+    return analyzer.result()
+
+
+def _abs_max(block: np.ndarray) -> float:
+    return float(np.abs(block).max()) if block.size else 0.0
+
+
+def _db(value: float) -> float:
+    return 20.0 * math.log10(value) if value > 0 else -200.0
+
+
+def _quantize(level: np.ndarray) -> np.ndarray:
+    # Round outwards so the drawn envelope never hides a peak
+    mins = np.floor(np.clip(level[:, 0], -1.0, 1.0) * 127.0)
+    maxs = np.ceil(np.clip(level[:, 1], -1.0, 1.0) * 127.0)
+    return np.stack((mins, maxs), axis=1).astype(np.int8)
+
+
+def _coarsen(level: np.ndarray) -> np.ndarray:
+    count = -(-len(level) // LEVEL_FACTOR)
+    padded = np.concatenate((level, np.repeat(level[-1:], count * LEVEL_FACTOR - len(level), axis=0)))
+    groups = padded.reshape(count, LEVEL_FACTOR, 2)
+    return np.stack((groups[:, :, 0].min(axis=1), groups[:, :, 1].max(axis=1)), axis=1)
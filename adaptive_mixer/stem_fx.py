@@ -0,0 +1,166 @@
+"""
+stem_fx — Per-stem effect chains from scene.json, live or pre-rendered.
+
+Most per-stem effects (a fixed reverb room size, a fixed low-pass) never
+change while a scene plays, so running them live burns CPU every block for a
+result that could be computed once. Static chains are rendered offline by
+`prepare_stems.py bake-fx` into a "<stem>.baked.wav" next to the stem, or at
+load time into the scene cache when no valid baked file exists. The mixer
+then plays the processed audio with no live effect for that stem.
+
+Rendering is loop-aware: the chain is run over the stem once to build up its
+tail, then again to produce the output, so the reverb tail from the end of
+the loop carries into its start exactly as it would during live playback.
+
+A stem opts out of baking with `"live": true` in its effects entry. A bake
+records the effect parameters and the source audio it was rendered from
+(content hash, or size and mtime), so re-exporting or normalizing a stem
+makes its baked file stale.
+
+Stems stored by content hash (see stem_store) are decoded once per process:
+scenes sharing the audio and the effect chain share the resulting array.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .stem_player import decode_stem
+from .stem_store import resolve_stem_path, share_buffer, shared_buffer
+
+try:
+    from pedalboard import Pedalboard, Reverb, LowpassFilter
+    PEDALBOARD_AVAILABLE = True
+except ImportError:
+    PEDALBOARD_AVAILABLE = False
+
+
+# Frames per pedalboard call when rendering offline
+RENDER_BLOCK_FRAMES = 1 << 16
+
+# Keys in an effects entry that describe the bake rather than the sound
+_BAKE_KEYS = ("live", "baked_file", "baked_signature")
+
+
+def build_stem_effects(fx_config: dict):
+    """Build the pedalboard chain for one stem's effects entry, or None."""
+    if not PEDALBOARD_AVAILABLE:
+        return None
+    effects = []
+    if "reverb_room_size" in fx_config:
+        effects.append(Reverb(
+            room_size=fx_config["reverb_room_size"],
+            wet_level=fx_config.get("reverb_wet", 0.3),
+            dry_level=fx_config.get("reverb_dry", 0.7),
+        ))
+    if "low_pass_hz" in fx_config:
+        effects.append(LowpassFilter(
+            cutoff_frequency_hz=fx_config["low_pass_hz"]
+        ))
+    return Pedalboard(effects) if effects else None
+
+
+def is_static(fx_config: dict) -> bool:
+    """True if the chain never changes at runtime and may be pre-rendered."""
+    return not fx_config.get("live", False)
+
+
+def source_identity(scene_dir: str, stem_config: dict) -> str:
+    """The stem's content hash if it is stored, else its file's size and mtime ("" if missing)."""
+    if stem_config.get("hash"):
+        return stem_config["hash"]
+    try:
+        st = resolve_stem_path(scene_dir, stem_config).stat()
+    except OSError:
+        return ""
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def fx_signature(fx_config: dict, sample_rate: int, source: str = "") -> str:
+    """
+    Stable hash of the sound-affecting parameters and the source audio
+    (see source_identity), used to detect stale bakes.
+    """
+    params = {k: v for k, v in fx_config.items() if k not in _BAKE_KEYS}
+    blob = json.dumps({"fx": params, "sr": sample_rate, "source": source}, sort_keys=True)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def baked_path(scene_dir: str, stem_config: dict, fx_config: dict,
+               sample_rate: int) -> Optional[Path]:
+    """Return the baked file for a stem if one exists and matches its effects and audio."""
+    name = fx_config.get("baked_file")
+    signature = fx_signature(fx_config, sample_rate, source_identity(scene_dir, stem_config))
+    if not name or fx_config.get("baked_signature") != signature:
+        return None
+    path = Path(scene_dir) / name
+    return path if path.exists() else None
+
+
+def baked_file_name(stem_config: dict) -> str:
+    return f"{Path(stem_config['file']).stem}.baked.wav"
+
+
+def render_static_effects(data: np.ndarray, sample_rate: int, fx_config: dict,
+                          loop: bool = True) -> Optional[np.ndarray]:
+    """
+    Render a stem through its effect chain offline.
+
+    Args:
+        data: Planar float32 audio, shape (channels, frames).
+        loop: Wrap the tail from the end of the stem into its start.
+
+    Returns the processed planar array, or None if there is nothing to render.
+    """
+    board = build_stem_effects(fx_config)
+    if board is None:
+        return None
+
+    frames = data.shape[1]
+    board.reset()
+    if loop:
+        # Warm-up pass: leaves the chain in its end-of-loop state
+        for start in range(0, frames, RENDER_BLOCK_FRAMES):
+            board(data[:, start: start + RENDER_BLOCK_FRAMES], sample_rate, reset=False)
+
+    out = np.empty_like(data)
+    for start in range(0, frames, RENDER_BLOCK_FRAMES):
+        block = data[:, start: start + RENDER_BLOCK_FRAMES]
+        out[:, start: start + block.shape[1]] = board(block, sample_rate, reset=False)
+    return out
+
+
+def decode_stem_with_fx(scene_dir: str, stem_config: dict, fx_config: Optional[dict],
+                        sample_rate: int, channels: int, cancelled=None) -> tuple:
+    """
+    Decode a stem with its static effects applied, preferring a valid baked file.
+
+    Returns (planar array, baked) where `baked` is True if the effects are
+    already in the audio and the stem needs no live chain. The array may be
+    shared with other scenes using the same stored stem; never modify it.
+    """
+    content = stem_config.get("hash")
+    static = fx_config is not None and is_static(fx_config)
+    if static:
+        signature = fx_signature(fx_config, sample_rate, content or "")
+        fx_key = (content, sample_rate, channels, signature)
+        shared = shared_buffer(fx_key)
+        if shared is not None:
+            return shared, True
+        path = baked_path(scene_dir, stem_config, fx_config, sample_rate)
+        if path is not None:
+            return share_buffer(fx_key, decode_stem(str(path), sample_rate, channels, cancelled)), True
+
+    dry_key = (content, sample_rate, channels, None)
+    data = shared_buffer(dry_key)
+    if data is None:
+        file_path = resolve_stem_path(scene_dir, stem_config)
+        data = share_buffer(dry_key, decode_stem(str(file_path), sample_rate, channels, cancelled))
+    if static:
+        rendered = render_static_effects(data, sample_rate, fx_config)
+        if rendered is not None:
+            return share_buffer(fx_key, rendered), True
+    return data, False
@@ -3,45 +3,104 @@ StemPlayer — Reads audio from a WAV/OGG file and provides sample chunks with g
 
 Each StemPlayer holds a pre-loaded numpy array of audio data and a read cursor.
 Supports looping, volume control with smooth ramping (vectorized), and mute/unmute.
+
+Audio is stored planar (channel-major), shape (channels, frames), which is the
+layout pedalboard processes natively. The mixing engine stays planar end to
+end and only interleaves once when writing the device buffer.
 """
 
 import numpy as np
 import soundfile as sf
 from pathlib import Path
+from typing import Callable, Optional
+
+from .resample import make_resampler
+
+
+# Frames decoded per read when loading a stem; cancellation is checked between reads.
+DECODE_BLOCK_FRAMES = 1 << 18
+
+
+class DecodeCancelled(Exception):
+    """Raised when a decode is abandoned because a newer request superseded it."""
+
+
+def decode_stem(file_path: str, sample_rate: int = 44100, channels: int = 2,
+                cancelled: Optional[Callable[[], bool]] = None) -> np.ndarray:
+    """
+    Decode an audio file into a planar float32 array of shape (channels, frames).
+
+    A file at another sample rate is resampled block by block as it is
+    decoded (see resample). Raises ValueError if the channel layout cannot
+    be mapped onto the requested channel count. If `cancelled` is given it
+    is polled between blocks and DecodeCancelled is raised as soon as it
+    returns True.
+    """
+    name = Path(file_path).stem
+    with sf.SoundFile(str(file_path)) as f:
+        if f.channels != channels and not (f.channels == 1 and channels == 2):
+            raise ValueError(
+                f"Stem '{name}' has {f.channels} channels, expected {channels}."
+            )
+
+        resampler = None
+        frames = f.frames
+        if f.samplerate != sample_rate:
+            resampler = make_resampler(f.samplerate, sample_rate, f.channels)
+            frames = -(-f.frames * sample_rate // f.samplerate)
+
+        # De-interleave block by block so only one block is ever held twice
+        data = np.empty((f.channels, frames), dtype=np.float32)
+        scratch = np.empty((DECODE_BLOCK_FRAMES, f.channels), dtype=np.float32)
+        pos = 0
+        while True:
+            if cancelled is not None and cancelled():
+                raise DecodeCancelled(name)
+            block = f.read(DECODE_BLOCK_FRAMES, dtype='float32', always_2d=True, out=scratch)
+            if len(block) == 0:
+                break
+            planar = block.T if resampler is None else resampler.process(block.T)
+            pos = _append(data, pos, planar)
+        if resampler is not None:
+            pos = _append(data, pos, resampler.flush())
+        data = data[:, :pos]
+
+    if data.shape[0] != channels:
+        data = np.repeat(data, channels, axis=0)
+
+    return data
+
+
+def _append(data: np.ndarray, pos: int, block: np.ndarray) -> int:
+    """Copy `block` into `data` at `pos` (dropping what does not fit); returns the new end."""
+    n = min(block.shape[1], data.shape[1] - pos)
+    data[:, pos: pos + n] = block[:, :n]
+    return pos + n
 
 
 class StemPlayer:
-    def __init__(self, file_path: str, sample_rate: int = 44100, channels: int = 2):
+    def __init__(self, file_path: str, sample_rate: int = 44100, channels: int = 2,
+                 data: Optional[np.ndarray] = None):
         """
         Load an audio file into memory.
 
         Args:
             file_path: Path to WAV or OGG file.
-            sample_rate: Expected sample rate. Raises ValueError if file differs.
+            sample_rate: Mixer sample rate; the file is resampled on load if it differs.
             channels: Expected number of channels (2 for stereo).
+            data: Already-decoded planar audio, shape (channels, frames), e.g.
+                from SceneCache. When given the file is not read; the array is
+                shared, never modified.
         """
         self.file_path = Path(file_path)
         self.name = self.file_path.stem
 
-        data, file_sr = sf.read(str(file_path), dtype='float32', always_2d=True)
-
-        if file_sr != sample_rate:
-            raise ValueError(
-                f"Stem '{self.name}' has sample rate {file_sr}, expected {sample_rate}. "
-                f"Pre-convert all stems to {sample_rate} Hz."
-            )
-
-        if data.shape[1] != channels:
-            if data.shape[1] == 1 and channels == 2:
-                data = np.column_stack([data[:, 0], data[:, 0]])
-            else:
-                raise ValueError(
-                    f"Stem '{self.name}' has {data.shape[1]} channels, expected {channels}."
-                )
+        if data is None:
+            data = decode_stem(file_path, sample_rate, channels)
 
         self._data: np.ndarray = data
         self._cursor: int = 0
-        self._total_frames: int = data.shape[0]
+        self._total_frames: int = data.shape[1]
         self._channels: int = channels
         self._sample_rate: int = sample_rate
 
@@ -51,6 +110,8 @@ class StemPlayer:
         self._muted: bool = True
 
         self.loop: bool = True
+        # Fixed trim on top of the volume envelope (loudness matching, see stem_analysis)
+        self.gain: float = 1.0
 
     @property
     def current_volume(self) -> float:
@@ -90,16 +151,74 @@ class StemPlayer:
         """Reset playback to the beginning."""
         self._cursor = 0
 
+    def skip(self, num_frames: int):
+        """Advance the cursor and volume envelope without producing audio."""
+        if self._total_frames > 0:
+            if self.loop:
+                self._cursor = (self._cursor + num_frames) % self._total_frames
+            else:
+                self._cursor = min(self._cursor + num_frames, self._total_frames)
+        self._advance_volume(num_frames)
+
+    def _advance_volume(self, num_frames: int) -> tuple:
+        """Step the volume envelope by num_frames. Returns (start_volume, end_volume)."""
+        start_vol = self._current_volume
+        if self._volume_ramp_per_sample != 0.0:
+            vol = self._current_volume + self._volume_ramp_per_sample * num_frames
+            lo = min(self._current_volume, self._target_volume)
+            hi = max(self._current_volume, self._target_volume)
+            self._current_volume = max(lo, min(hi, vol))
+            if abs(self._current_volume - self._target_volume) < 1e-6:
+                self._current_volume = self._target_volume
+                self._volume_ramp_per_sample = 0.0
+        return start_vol, self._current_volume
+
+    # ── Section playback (see SectionSequencer) ───────────────────
+
+    def skip_plan(self, plan):
+        """Follow a BlockPlan's timeline without producing audio."""
+        self._cursor = plan.cursor
+        self._advance_volume(plan.frames)
+
+    def read_plan(self, plan) -> np.ndarray:
+        """
+        Read one block laid out by SectionSequencer.plan(), volume envelope
+        applied. All scene stems read the same plan, so they stay in sync
+        across section jumps.
+        """
+        if not self.is_audible and self._volume_ramp_per_sample == 0.0:
+            self.skip_plan(plan)
+            return np.zeros((self._channels, plan.frames), dtype=np.float32)
+
+        output = np.empty((self._channels, plan.frames), dtype=np.float32)
+        for dst, src, count in plan.runs:
+            output[:, dst: dst + count] = self._data[:, src: src + count]
+        if plan.gain is not None:
+            output *= plan.gain
+        for dst, src, count in plan.tail_runs:
+            output[:, dst: dst + count] += self._data[:, src: src + count] * plan.tail_gain
+
+        self._cursor = plan.cursor
+        start_vol, end_vol = self._advance_volume(plan.frames)
+        if start_vol == end_vol:
+            output *= np.float32(end_vol * self.gain)
+        else:
+            output *= np.linspace(start_vol * self.gain, end_vol * self.gain, plan.frames,
+                                  dtype=np.float32)
+        return output
+
     def read_chunk(self, num_frames: int) -> np.ndarray:
         """
         Read the next chunk of audio with volume envelope applied.
 
-        Returns numpy array of shape (num_frames, channels), dtype float32.
+        Returns numpy array of shape (channels, num_frames), dtype float32.
         """
         if not self.is_audible and self._volume_ramp_per_sample == 0.0:
-            return np.zeros((num_frames, self._channels), dtype=np.float32)
+            # Keep time while silent so layers stay in sync when unmuted
+            self.skip(num_frames)
+            return np.zeros((self._channels, num_frames), dtype=np.float32)
 
-        output = np.empty((num_frames, self._channels), dtype=np.float32)
+        output = np.empty((self._channels, num_frames), dtype=np.float32)
         frames_written = 0
 
         while frames_written < num_frames:
@@ -111,11 +230,12 @@ class StemPlayer:
                     self._cursor = 0
                     available = self._total_frames
                 else:
-                    output[frames_written:] = 0.0
+                    output[:, frames_written:] = 0.0
                     break
 
             to_read = min(remaining, available)
-            chunk = self._data[self._cursor: self._cursor + to_read]
+            chunk = self._data[:, self._cursor: self._cursor + to_read]
+            dest = output[:, frames_written: frames_written + to_read]
             self._cursor += to_read
 
             if self._volume_ramp_per_sample != 0.0:
@@ -126,7 +246,8 @@ class StemPlayer:
                 hi = max(start_vol, self._target_volume)
                 end_vol = max(lo, min(hi, end_vol))
 
-                gains = np.linspace(start_vol, end_vol, to_read, dtype=np.float32)
+                gains = np.linspace(start_vol * self.gain, end_vol * self.gain, to_read,
+                                    dtype=np.float32)
                 self._current_volume = float(end_vol)
 
                 # Stop ramping if we've reached the target
@@ -134,9 +255,9 @@ class StemPlayer:
                     self._current_volume = self._target_volume
                     self._volume_ramp_per_sample = 0.0
 
-                output[frames_written: frames_written + to_read] = chunk * gains[:, np.newaxis]
+                np.multiply(chunk, gains[np.newaxis, :], out=dest)
             else:
-                output[frames_written: frames_written + to_read] = chunk * self._current_volume
+                np.multiply(chunk, np.float32(self._current_volume * self.gain), out=dest)
 
             frames_written += to_read
 
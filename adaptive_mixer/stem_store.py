@@ -0,0 +1,127 @@
+"""
+stem_store — Content-addressed stem files shared between scenes.
+
+The same stem often sits in several scene folders (motif stems, remixes of
+one track). `prepare_stems.py import-store <scene_dir>` moves a scene's
+stems into the library's store, "<library>/.stems/<hash><ext>", and writes
+each stem's hash into scene.json:
+
+    "drums": {"file": "drums.wav", "hash": "5f1c...", "layer": "combat"}
+
+The hash is taken over the decoded samples (plus rate and channel count),
+so a stem that several scenes use is stored once. "file" stays as the
+stem's display name. Stems without a "hash" are read from the scene folder
+as before.
+
+At runtime the decoded arrays of hashed stems are shared: a second scene
+(or extra stem) with the same audio and the same static effects gets the
+array that is already in memory instead of decoding its own copy. The
+registry holds weak references, so a buffer goes away with its last user.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import weakref
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+
+STORE_DIRNAME = ".stems"
+
+# Frames hashed per read, so a long stem is never decoded in one piece
+_HASH_BLOCK_FRAMES = 1 << 18
+
+_shared = weakref.WeakValueDictionary()  # (hash, rate, channels, fx signature) -> array
+_shared_lock = threading.Lock()
+
+
+def content_hash(file_path: str) -> str:
+    """Hash of a file's decoded audio; identical audio in different folders hashes the same."""
+    h = hashlib.blake2b(digest_size=16)
+    with sf.SoundFile(str(file_path)) as f:
+        h.update(f"{f.samplerate}:{f.channels}:".encode("ascii"))
+        while True:
+            block = f.read(_HASH_BLOCK_FRAMES, dtype="float32", always_2d=True)
+            if len(block) == 0:
+                break
+            h.update(np.ascontiguousarray(block).data)
+    return h.hexdigest()
+
+
+def store_dir(scene_dir: str) -> Path:
+    """The store serving a scene: ".stems" in the library the scene lives in."""
+    return Path(scene_dir).parent / STORE_DIRNAME
+
+
+def resolve_stem_path(scene_dir: str, stem_config: dict) -> Path:
+    """Where a stem's audio is: the store for hashed stems, else the scene folder."""
+    content = stem_config.get("hash")
+    if content:
+        stored = find_stored(store_dir(scene_dir), content, Path(stem_config["file"]).suffix)
+        if stored is not None:
+            return stored
+    return Path(scene_dir) / stem_config["file"]
+
+
+def find_stored(store: Path, content: str, suffix: str = "") -> Optional[Path]:
+    """The stored file for a hash; `suffix` is tried first, then any extension."""
+    if suffix:
+        direct = store / (content + suffix.lower())
+        if direct.exists():
+            return direct
+    try:
+        for entry in os.scandir(store):
+            name = entry.name
+            # "<hash>.<ext>" only: not "<hash>.<ext>.tmp" or an analysis sidecar
+            if name.startswith(content) and name[len(content):][:1] == "." \
+                    and name.count(".") == 1:
+                return Path(entry.path)
+    except OSError:
+        pass
+    return None
+
+
+def import_stem(store: Path, file_path: Path, keep_original: bool = False) -> tuple:
+    """
+    Put a stem file into the store. Returns (hash, added) where `added` is
+    False if identical audio was already stored. The scene's copy is deleted
+    unless `keep_original`.
+    """
+    content = content_hash(str(file_path))
+    added = find_stored(store, content) is None
+    if added:
+        store.mkdir(parents=True, exist_ok=True)
+        target = store / (content + file_path.suffix.lower())
+        tmp = target.with_name(target.name + ".tmp")
+        shutil.copyfile(file_path, tmp)
+        os.replace(tmp, target)
+    if not keep_original:
+        file_path.unlink()
+    return content, added
+
+
+# ── Shared runtime buffers ─────────────────────────────────────────
+
+def shared_buffer(key: tuple) -> Optional[np.ndarray]:
+    """The array already decoded for `key`, if something still holds it."""
+    if key[0] is None:
+        return None
+    with _shared_lock:
+        return _shared.get(key)
+
+
+def share_buffer(key: tuple, data: np.ndarray) -> np.ndarray:
+    """Register a decoded array; returns the one to use (an earlier one wins a race)."""
+    if key[0] is None:
+        return data
+    with _shared_lock:
+        existing = _shared.get(key)
+        if existing is not None:
+            return existing
+        _shared[key] = data
+        return data
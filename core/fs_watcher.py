@@ -0,0 +1,274 @@
+"""
+fs_watcher.py — Watch folders for added, changed and removed files.
+
+On Linux the watcher uses inotify (through ctypes, no extra package), so
+an idle library costs nothing. Elsewhere, or if inotify is unavailable, it
+falls back to polling. Every POLL_SECONDS it stats only the directories: a
+folder whose mtime is unchanged has had nothing added, removed or renamed,
+so its files are not listed again. Every FULL_SCAN_SECONDS it lists all
+folders (os.scandir, which on Windows returns file mtimes and sizes without
+a stat per file) to catch files rewritten in place. On a network-mounted
+library that is one request per folder instead of one per file.
+
+Writes usually arrive as a burst of events (create, several modifies,
+close). Events are collected per watched root and delivered once the root
+has been quiet for DEBOUNCE_SECONDS, as one set of changed paths. The
+callback decides what each path means: a path that no longer exists was
+removed. If the kernel queue overflowed, the root itself is reported so the
+consumer can fall back to a full rescan.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+
+# inotify(7) constants
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not (hasattr(libc, "inotify_init1") and hasattr(libc, "inotify_add_watch")):
+        return None
+    return libc
+
+
+class _Root:
+    __slots__ = ("path", "callback", "pending", "last_event", "snapshot", "last_full_scan")
+
+    def __init__(self, path: str, callback: Callable[[set], None]):
+        self.path = path
+        self.callback = callback
+        self.pending: set = set()
+        self.last_event = 0.0
+        # Polling backend: directory -> (mtime_ns, {file: (mtime_ns, size)}, subdirectories)
+        self.snapshot: dict = {}
+        self.last_full_scan = 0.0
+
+
+class FileWatcher:
+    """Recursive folder watcher delivering debounced sets of changed paths."""
+
+    DEBOUNCE_SECONDS = 0.5
+    POLL_SECONDS = 10.0       # directory mtimes
+    FULL_SCAN_SECONDS = 30.0  # every file, for in-place rewrites
+
+    def __init__(self, use_inotify: bool = True):
+        self._roots: list = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._libc = _load_libc() if use_inotify else None
+        self._fd = -1
+        self._wds: dict = {}  # watch descriptor -> (root, directory)
+        if self._libc is not None:
+            self._fd = self._libc.inotify_init1(_IN_CLOEXEC)
+            if self._fd < 0:
+                print(f"[FileWatcher] inotify unavailable (errno {ctypes.get_errno()}), polling")
+                self._libc = None
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._libc is not None else "polling"
+
+    def watch(self, path: str, callback: Callable[[set], None]):
+        """
+        Watch `path` recursively. `callback(paths)` runs on the watcher
+        thread with the absolute paths that changed since the last call.
+        """
+        root = _Root(os.path.abspath(path), callback)
+        with self._lock:
+            self._roots.append(root)
+            if self._libc is not None:
+                self._add_tree(root, root.path)
+            else:
+                root.snapshot = self._snapshot(root.path, {}, full=True)
+                root.last_full_scan = time.monotonic()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        target = self._run_inotify if self._libc is not None else self._run_polling
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        print(f"[FileWatcher] Watching {len(self._roots)} folder(s) ({self.backend})")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    # ── inotify backend ────────────────────────────────────────────
+
+    def _add_tree(self, root: _Root, directory: str) -> list:
+        """Watch `directory` and its subfolders; returns the files found in them."""
+        files = []
+        for dirpath, _, filenames in os.walk(directory):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), _WATCH_MASK)
+            if wd < 0:
+                print(f"[FileWatcher] Cannot watch {dirpath} (errno {ctypes.get_errno()})")
+                continue
+            self._wds[wd] = (root, dirpath)
+            files.extend(os.path.join(dirpath, f) for f in filenames)
+        return files
+
+    def _run_inotify(self):
+        while not self._stop.is_set():
+            timeout = self.DEBOUNCE_SECONDS if any(r.pending for r in self._roots) else 1.0
+            try:
+                ready, _, _ = select.select([self._fd], [], [], timeout)
+            except (OSError, ValueError):
+                return  # closed by stop()
+            if ready:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except OSError:
+                    return
+                self._parse_events(data)
+            self._flush()
+
+    def _parse_events(self, data: bytes):
+        now = time.monotonic()
+        offset = 0
+        with self._lock:
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset: offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & _IN_Q_OVERFLOW:
+                    for root in self._roots:
+                        root.pending.add(root.path)
+                        root.last_event = now
+                    continue
+                watched = self._wds.get(wd)
+                if watched is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    self._wds.pop(wd, None)
+                    continue
+
+                root, directory = watched
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                root.pending.add(path)
+                root.last_event = now
+                # A folder created or moved in: watch it and report what is already inside
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    root.pending.update(self._add_tree(root, path))
+
+    # ── Polling backend ────────────────────────────────────────────
+
+    @staticmethod
+    def _scan_dir(directory: str) -> tuple:
+        """(mtime_ns, {file: (mtime_ns, size)}, subdirectories) of one folder."""
+        files, subdirs = {}, []
+        mtime = os.stat(directory).st_mtime_ns
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    else:
+                        st = entry.stat()
+                        files[entry.path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return mtime, files, subdirs
+
+    @classmethod
+    def _snapshot(cls, directory: str, old: dict, full: bool) -> dict:
+        """
+        Snapshot the tree under `directory`, reusing `old` entries for
+        folders whose mtime is unchanged unless `full`.
+        """
+        snapshot = {}
+        stack = [directory]
+        while stack:
+            path = stack.pop()
+            entry = old.get(path)
+            try:
+                if full or entry is None or os.stat(path).st_mtime_ns != entry[0]:
+                    entry = cls._scan_dir(path)
+            except OSError:
+                continue  # removed
+            snapshot[path] = entry
+            stack.extend(entry[2])
+        return snapshot
+
+    @staticmethod
+    def _changed_files(old: dict, new: dict) -> set:
+        changed = set()
+        for directory in old.keys() | new.keys():
+            before, after = old.get(directory), new.get(directory)
+            if before is after:
+                continue  # not rescanned
+            before = before[1] if before else {}
+            after = after[1] if after else {}
+            changed |= {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+        return changed
+
+    def _run_polling(self):
+        while not self._stop.wait(self.POLL_SECONDS):
+            now = time.monotonic()
+            for root in list(self._roots):
+                full = now - root.last_full_scan >= self.FULL_SCAN_SECONDS
+                if full:
+                    root.last_full_scan = now
+                snapshot = self._snapshot(root.path, root.snapshot, full)
+                changed = self._changed_files(root.snapshot, snapshot)
+                root.snapshot = snapshot
+                if changed:
+                    with self._lock:
+                        root.pending |= changed
+                        root.last_event = now
+            # Polling is already coarser than the debounce window
+            self._flush(force=True)
+
+    # ── Delivery ───────────────────────────────────────────────────
+
+    def _flush(self, force: bool = False):
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for root in self._roots:
+                if root.pending and (force or now - root.last_event >= self.DEBOUNCE_SECONDS):
+                    due.append((root, root.pending))
+                    root.pending = set()
+        for root, paths in due:
+            try:
+                root.callback(paths)
+            except Exception as e:
+                print(f"[FileWatcher] Callback for {root.path} failed: {e}")
@@ -2,8 +2,8 @@
 music_controller.py — Music playback controller for ConductorSBN.
 
 Provides a unified interface for controlling background music tracks,
-with a local file implementation via pygame.mixer.music and an optional
-Spotify scaffold.
+with a local file implementation via pygame.mixer.music, one that streams
+through the adaptive mixer's music deck, and an optional Spotify scaffold.
 """
 
 import os
@@ -60,6 +60,23 @@ class MusicController(ABC):
 SUPPORTED_EXTENSIONS = {".mp3", ".wav", ".ogg", ".flac", ".mp4", ".m4a"}
 
 
+def scan_music_folder(source: str, extensions: set = SUPPORTED_EXTENSIONS) -> list[Track]:
+    """List playable tracks in a folder, sorted by file name."""
+    if not os.path.isdir(source):
+        print(f"[Music] Folder not found: {source}")
+        return []
+
+    tracks = []
+    for fname in sorted(os.listdir(source)):
+        ext = os.path.splitext(fname)[1].lower()
+        if ext in extensions:
+            path = os.path.join(source, fname)
+            name = os.path.splitext(fname)[0].replace("_", " ").replace("-", " ").title()
+            tracks.append(Track(name=name, source=path))
+    print(f"[Music] Loaded {len(tracks)} tracks from {source}")
+    return tracks
+
+
 class LocalMusicController(MusicController):
     """Plays music from a local folder using pygame.mixer.music."""
 
@@ -82,19 +99,9 @@ class LocalMusicController(MusicController):
         if not os.path.isdir(source):
             print(f"[Music] Folder not found: {source}")
             return []
-
-        tracks = []
-        for fname in sorted(os.listdir(source)):
-            ext = os.path.splitext(fname)[1].lower()
-            if ext in SUPPORTED_EXTENSIONS:
-                path = os.path.join(source, fname)
-                name = os.path.splitext(fname)[0].replace("_", " ").replace("-", " ").title()
-                tracks.append(Track(name=name, source=path))
-
-        self._library = tracks
+        self._library = scan_music_folder(source)
         self._library_index = 0
-        print(f"[Music] Loaded {len(tracks)} tracks from {source}")
-        return tracks
+        return self._library
 
     @property
     def library(self) -> list[Track]:
@@ -207,6 +214,122 @@ class LocalMusicController(MusicController):
         return self._current_track
 
 
+# Formats the mixer's music deck can stream (decoded with soundfile)
+DECK_EXTENSIONS = {".mp3", ".wav", ".ogg", ".flac"}
+
+
+class MixerMusicController(MusicController):
+    """
+    Plays music from a local folder through the adaptive mixer's music deck.
+
+    Shares the mixer's output stream instead of opening a second one, decodes
+    ahead, continues into the next library track without a gap and
+    crossfades when a new track is picked while one is playing.
+    """
+
+    CROSSFADE_SECONDS = 2.0
+
+    def __init__(self, mixer):
+        self._mixer = mixer
+        self._deck = mixer.music_deck
+        self._deck.set_next_provider(self._next_path)
+
+        self._library: list[Track] = []
+        self._library_index = 0
+
+    def load_library(self, source: str) -> list[Track]:
+        if not os.path.isdir(source):
+            print(f"[Music] Folder not found: {source}")
+            return []
+        self._library = scan_music_folder(source, DECK_EXTENSIONS)
+        self._library_index = 0
+        return self._library
+
+    @property
+    def library(self) -> list[Track]:
+        return self._library
+
+    def play(self, track: Track):
+        self._mixer.open_stream()  # without resuming a stopped scene
+        crossfade = self.CROSSFADE_SECONDS if self._deck.is_active else 0.0
+        self._deck.play(track.source, crossfade_seconds=crossfade)
+        for i, t in enumerate(self._library):
+            if t.source == track.source:
+                self._library_index = i
+                break
+        print(f"[Music] Playing: {track.name}")
+
+    def play_by_index(self, index: int):
+        if 0 <= index < len(self._library):
+            self.play(self._library[index])
+
+    def play_next(self):
+        if not self._library:
+            return
+        self._library_index = (self._library_index + 1) % len(self._library)
+        self.play(self._library[self._library_index])
+
+    def play_previous(self):
+        if not self._library:
+            return
+        self._library_index = (self._library_index - 1) % len(self._library)
+        self.play(self._library[self._library_index])
+
+    def pause(self):
+        if self.get_state() in (PlaybackState.PLAYING, PlaybackState.FADING_IN):
+            self._deck.pause()
+
+    def resume(self):
+        if self._deck.is_paused:
+            self._deck.resume()
+        elif not self._deck.is_active and self._library:
+            self.play(self._library[self._library_index])
+
+    def stop(self):
+        self._deck.stop()
+
+    def set_volume(self, level: float):
+        self._deck.set_volume(level)
+
+    def get_volume(self) -> float:
+        return self._deck.volume
+
+    def fade_in(self, duration_ms: int = 2000):
+        if self._deck.is_paused:
+            self._deck.resume(fade_seconds=0.0)
+            self._deck.fade_to(0.0, 0.0)
+        self._deck.fade_to(1.0, duration_ms / 1000.0)
+
+    def fade_out(self, duration_ms: int = 2000):
+        self._deck.fade_to(0.0, duration_ms / 1000.0, pause=True)
+
+    def get_state(self) -> PlaybackState:
+        if not self._deck.is_active:
+            return PlaybackState.STOPPED
+        if self._deck.is_paused:
+            return PlaybackState.PAUSED
+        if self._deck.is_fading:
+            return PlaybackState.FADING_OUT if self._deck.fading_out else PlaybackState.FADING_IN
+        return PlaybackState.PLAYING
+
+    def get_current_track(self) -> Optional[Track]:
+        path = self._deck.current_path
+        if path is None:
+            return None
+        for i, t in enumerate(self._library):
+            if t.source == path:
+                self._library_index = i
+                return t
+        return Track(name=os.path.splitext(os.path.basename(path))[0], source=path)
+
+    def _next_path(self, path: str) -> Optional[str]:
+        """Gapless continuation: the library track after `path` (called by the deck's decoder)."""
+        for i, t in enumerate(self._library):
+            if t.source == path:
+                return self._library[(i + 1) % len(self._library)].source
+        return None
+
+
 # ── Binding Manager ───────────────────────────────────────────────
 
 MUSIC_CONFIG_PATH = "config/music_config.yaml"
@@ -250,6 +373,20 @@ class MusicBindingManager:
 
 # ── Factory ───────────────────────────────────────────────────────
 
-def create_music_controller() -> MusicController:
-    """Return the best available music controller (local file by default)."""
-    return LocalMusicController()
+def create_music_controller(mixer=None, source: Optional[str] = None) -> MusicController:
+    """
+    Return the best available music controller: the adaptive mixer's music
+    deck when a mixer is given, else local playback via pygame. If the
+    library folder `source` holds formats the deck cannot stream (.mp4,
+    .m4a), pygame is used so those tracks stay playable.
+    """
+    if mixer is None or not hasattr(mixer, "music_deck"):
+        return LocalMusicController()
+    if source and os.path.isdir(source):
+        unsupported = sorted({
+            os.path.splitext(fname)[1].lower() for fname in os.listdir(source)
+        } & (SUPPORTED_EXTENSIONS - DECK_EXTENSIONS))
+        if unsupported:
+            print(f"[Music] {', '.join(unsupported)} tracks found, using pygame playback")
+            return LocalMusicController()
+    return MixerMusicController(mixer)
@@ -0,0 +1,92 @@
+"""
+session_snapshot.py — Periodic snapshots of the live session for warm restarts.
+
+Subsystems register a capture function returning a small JSON-able dict
+(mixer scene and volumes, music track, voice preset, ...). A background
+thread collects them every few seconds and rewrites the snapshot file only
+when something changed. The write goes to a temp file that is then renamed
+over the old one, so a crash mid-write never leaves a torn snapshot.
+
+On startup, load_snapshot() returns the last saved state (or None) for
+the app to restore.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+SNAPSHOT_PATH = "config/session_snapshot.json"
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[dict]:
+    """Return the last saved snapshot, or None if there is none or it is unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[SessionSnapshot] Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+
+class SessionSnapshotter:
+    """Collects registered state sources and saves them periodically."""
+
+    INTERVAL_SECONDS = 5.0
+
+    def __init__(self, path: str = SNAPSHOT_PATH, interval: float = INTERVAL_SECONDS):
+        self.path = path
+        self.interval = interval
+        self._sources: dict = {}  # name -> capture()
+        self._last_written: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_source(self, name: str, capture: Callable[[], dict]):
+        self._sources[name] = capture
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.save_now()
+
+    def save_now(self):
+        state = {"saved_at": None}
+        for name, capture in self._sources.items():
+            try:
+                state[name] = capture()
+            except Exception as e:
+                print(f"[SessionSnapshot] Could not capture '{name}': {e}")
+
+        # Compare without the timestamp so an idle session is not rewritten
+        body = json.dumps(state, separators=(",", ":"), sort_keys=True)
+        if body == self._last_written:
+            return
+        state["saved_at"] = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._last_written = body
+        except Exception as e:
+            print(f"[SessionSnapshot] Could not write {self.path}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.save_now()
@@ -2,7 +2,9 @@
 voice_effects.py — Real-time voice DSP processing for ConductorSBN.
 
 Opens a full-duplex sounddevice stream and processes microphone audio
-through a pedalboard effect chain in real time.
+through a pedalboard effect chain in real time. When attached to an
+AdaptiveMixer (attach_engine), the chain runs instead as the input bus of
+the mixer's own full-duplex stream: one device stream, one callback.
 
 Dependencies:
     pip install pedalboard scipy sounddevice numpy
@@ -124,6 +126,12 @@ class VoiceEffectsProcessor:
 
     If mic_buffer_callback is set, raw int16 mono audio at the stream
     sample rate is forwarded there (for use with Vosk speech recognition).
+
+    With an engine attached, start()/stop() plug the processor in and out
+    of the engine's stream, which then calls process_block() once per block
+    at the engine's block size. Presets using PitchShift sound cleanest
+    with larger engine blocks. If output_device is not the engine's output
+    device, the processor keeps its own stream instead.
     """
 
     SAMPLE_RATE = 44100
@@ -153,14 +161,39 @@ class VoiceEffectsProcessor:
         self._dry_wet = 0.7   # 0 = all dry, 1 = all wet
         self._enabled = False
         self._stream = None
+        self._engine = None   # AdaptiveMixer hosting us as its input bus
 
         self.input_level = 0.0
         self.output_level = 0.0
 
     # ── Public API ────────────────────────────────────────────────
 
+    def attach_engine(self, engine):
+        """Run through `engine`'s full-duplex stream instead of a stream of our own (None detaches)."""
+        was_running = self.is_running
+        if was_running:
+            self.stop()
+        self._engine = engine
+        if engine is not None:
+            self.sample_rate = engine.SAMPLE_RATE
+        if was_running:
+            self.start()
+
     def start(self):
         """Open the audio stream and begin processing."""
+        if self._engine is not None:
+            self._enabled = True
+            try:
+                self._engine.set_input_bus(self)
+                self._engine.open_stream()  # without resuming a stopped scene
+                print("[VoiceFX] Running as the mixer's input bus.")
+                return
+            except ValueError as e:
+                print(f"[VoiceFX] Not joining the mixer stream ({e}), using own stream.")
+            except Exception as e:
+                print(f"[VoiceFX] Failed to join the mixer stream: {e}")
+                self._enabled = False
+                return
         if not HAS_SD:
             print("[VoiceFX] sounddevice not available.")
             return
@@ -187,6 +220,9 @@ class VoiceEffectsProcessor:
     def stop(self):
         """Stop and close the audio stream."""
         self._enabled = False
+        if self._engine is not None and self._engine.input_bus is self:
+            self._engine.set_input_bus(None)
+            self._engine.release_stream()
         if self._stream:
             try:
                 self._stream.stop()
@@ -198,6 +234,8 @@ class VoiceEffectsProcessor:
 
     @property
     def is_running(self) -> bool:
+        if self._engine is not None and self._engine.input_bus is self:
+            return self._engine.is_stream_open
         return self._stream is not None and self._stream.active
 
     def set_preset(self, preset: EffectPreset):
@@ -230,7 +268,11 @@ class VoiceEffectsProcessor:
     # ── Audio Callback ────────────────────────────────────────────
 
     def _audio_callback(self, indata, outdata, frames, time_info, status):
-        audio = indata[:, 0].copy()
+        outdata[:, 0] = self.process_block(indata[:, 0].copy())
+
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        """Process one block of mono float32 mic audio; returns the mono output."""
+        frames = len(audio)
 
         # Level metering
         self.input_level = float(np.abs(audio).mean())
@@ -257,7 +299,7 @@ class VoiceEffectsProcessor:
             result = np.zeros(frames, dtype=np.float32)
 
         self.output_level = float(np.abs(result).mean())
-        outdata[:, 0] = np.clip(result, -1.0, 1.0)
+        return np.clip(result, -1.0, 1.0).astype(np.float32, copy=False)
 
     def _apply_effects(self, audio: np.ndarray) -> np.ndarray:
         """Apply the current effect chain to mono float32 audio."""
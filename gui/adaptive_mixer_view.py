@@ -19,7 +19,8 @@ Layout:
   └──────────────────────────────────────────────────────────┘
 """
 
-import threading
+import math
+import re
 import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog
@@ -31,6 +32,36 @@ import yaml
 MIXER_CONFIG_PATH = "config/mixer_config.yaml"
 MOTIF_STEMS_CONFIG_PATH = "config/motif_stems.yaml"
 DEFAULT_LIBRARY_PATH = "assets/music/scenes"
+METER_COLOR = ("#2e7d32", "#43a047")
+WAVEFORM_COLOR = ("#90a4ae", "#546e7a")
+PLAYHEAD_COLOR = ("#1565c0", "#64b5f6")
+WAVEFORM_HEIGHT = 28
+METER_CLIP_COLOR = ("#c62828", "#e53935")
+
+# Memory report categories shown in the status bar, in display order
+MEMORY_LABELS = (
+    ("scene_stems", "scene"),
+    ("extra_stems", "extra"),
+    ("buffers", "buffers"),
+    ("sfx", "sfx"),
+    ("pygame_sounds", "sounds"),
+    ("cached_scenes", "cache"),
+)
+
+
+MOTIF_SEARCH_LIMIT = 200  # stems listed per search in the motif picker
+_BPM_RANGE_RE = re.compile(r"\b(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\b")
+
+
+def _parse_stem_search(text: str) -> dict:
+    """Picker search text -> find_stems() filters; "110-130" is read as a BPM range."""
+    filters = {}
+    m = _BPM_RANGE_RE.search(text)
+    if m:
+        filters["bpm_min"], filters["bpm_max"] = float(m.group(1)), float(m.group(2))
+        text = text[:m.start()] + text[m.end():]
+    filters["text"] = text.strip()
+    return filters
 
 
 def _fmt_time(seconds: float) -> str:
@@ -38,6 +69,17 @@ def _fmt_time(seconds: float) -> str:
     return f"{s // 60}:{s % 60:02d}"
 
 
+def _mode_color(color) -> str:
+    """A CTk (light, dark) color pair resolved for plain tk widgets."""
+    if isinstance(color, (tuple, list)):
+        return color[1] if ctk.get_appearance_mode() == "Dark" else color[0]
+    return color
+
+
+def _to_dbfs(level: float, floor: float = -60.0) -> float:
+    return max(floor, 20.0 * math.log10(level)) if level > 0.0 else floor
+
+
 def _load_library_path() -> str:
     try:
         with open(MIXER_CONFIG_PATH, "r") as f:
@@ -48,8 +90,14 @@ def _load_library_path() -> str:
 
 def _save_library_path(path: str):
     try:
+        try:
+            with open(MIXER_CONFIG_PATH, "r") as f:
+                cfg = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            cfg = {}
+        cfg["library_path"] = path
         with open(MIXER_CONFIG_PATH, "w") as f:
-            yaml.dump({"library_path": path}, f, default_flow_style=False)
+            yaml.dump(cfg, f, default_flow_style=False)
     except Exception as e:
         print(f"[MixerView] Could not save library path: {e}")
 
@@ -70,11 +118,13 @@ class AdaptiveMixerView(ctk.CTkFrame):
         # Per-stem widget references (scene stems)
         self._stem_sliders: dict = {}   # stem_id -> CTkSlider
         self._stem_vol_labels: dict = {}
+        self._stem_level_bars: dict = {}  # stem_id -> CTkProgressBar (signal level)
         self._stem_mute_btns: dict = {}
 
         # Per-extra-stem widget references
         self._extra_stem_sliders: dict = {}   # key -> CTkSlider
         self._extra_stem_vol_labels: dict = {}
+        self._extra_stem_level_bars: dict = {}
         self._extra_stem_mute_btns: dict = {}
 
         # Scene list: display-string -> scene path
@@ -89,9 +139,15 @@ class AdaptiveMixerView(ctk.CTkFrame):
 
         self._poll_job = None
         self._loading = False  # True while a scene is loading in background
+        self._start_after_load = False  # Start the stream once the requested scene is in
+        self._seen_load_generation = 0
+        self._levels: dict = {}  # latest AdaptiveMixer.get_levels() snapshot
 
         self._build_ui()
 
+        # Background rescans (e.g. index validation at startup) refresh the dropdown
+        self._scene_mgr.add_listener(lambda: self.after(0, self._populate_scene_dropdown))
+
     # ── Public API (called from gesture controller) ───────────────
 
     def on_gesture_changed(self):
@@ -158,6 +214,13 @@ class AdaptiveMixerView(ctk.CTkFrame):
             font=ctk.CTkFont(size=10), text_color="gray50",
         ).grid(row=0, column=2, padx=8)
 
+        # Scene loader state (decoding / switching / error)
+        self._load_state_var = tk.StringVar(value="")
+        ctk.CTkLabel(
+            bar, textvariable=self._load_state_var,
+            font=ctk.CTkFont(size=10), text_color="orange",
+        ).grid(row=2, column=0, columnspan=4, padx=14, pady=(0, 6), sticky="w")
+
         btn_frame = ctk.CTkFrame(bar, fg_color="transparent")
         btn_frame.grid(row=0, column=3, padx=(0, 14), pady=10)
 
@@ -180,26 +243,36 @@ class AdaptiveMixerView(ctk.CTkFrame):
         tl.grid(row=1, column=0, columnspan=4, sticky="ew", padx=14, pady=(0, 10))
         tl.grid_columnconfigure(1, weight=1)
 
+        # Waveform overview above the slider, drawn from the stems' analysis
+        # sidecars (prepare_stems.py analyze); hidden for unanalysed scenes
+        self._waveform_canvas = ctk.CTkCanvas(
+            tl, height=WAVEFORM_HEIGHT, highlightthickness=0, bd=0,
+            bg=_mode_color(bar.cget("fg_color")),
+        )
+        self._waveform_canvas.grid(row=0, column=1, sticky="ew", pady=(0, 2))
+        self._waveform_canvas.grid_remove()
+        self._waveform_canvas.bind("<Configure>", lambda _e: self._draw_waveform())
+
         self._timeline_pos_var = tk.StringVar(value="0:00")
         ctk.CTkLabel(
             tl, textvariable=self._timeline_pos_var,
             font=ctk.CTkFont(size=10, family="Courier"),
             width=36, anchor="e", text_color="gray55",
-        ).grid(row=0, column=0, padx=(0, 6))
+        ).grid(row=1, column=0, padx=(0, 6))
 
         self._timeline_slider = ctk.CTkSlider(
             tl, from_=0.0, to=1.0, height=16,
             command=self._on_timeline_seek,
         )
         self._timeline_slider.set(0.0)
-        self._timeline_slider.grid(row=0, column=1, sticky="ew")
+        self._timeline_slider.grid(row=1, column=1, sticky="ew")
 
         self._timeline_dur_var = tk.StringVar(value="0:00")
         ctk.CTkLabel(
             tl, textvariable=self._timeline_dur_var,
             font=ctk.CTkFont(size=10, family="Courier"),
             width=36, anchor="w", text_color="gray55",
-        ).grid(row=0, column=2, padx=(6, 0))
+        ).grid(row=1, column=2, padx=(6, 0))
 
     def _build_library_bar(self):
         bar = ctk.CTkFrame(self, corner_radius=10, fg_color=("gray90", "gray17"))
@@ -300,7 +373,10 @@ class AdaptiveMixerView(ctk.CTkFrame):
             bar, text=f"{int((self._mixer._master_volume if self._mixer else 0.8) * 100)}%",
             font=ctk.CTkFont(size=11), width=38,
         )
-        self._master_label.grid(row=0, column=6, padx=(4, 14))
+        self._master_label.grid(row=0, column=6, padx=(4, 4))
+
+        self._master_level_bar = self._make_level_bar(bar)
+        self._master_level_bar.grid(row=0, column=7, padx=(4, 14))
 
     def _build_motif_stems_bar(self):
         outer = ctk.CTkFrame(self, corner_radius=10)
@@ -363,18 +439,45 @@ class AdaptiveMixerView(ctk.CTkFrame):
         )
         self._gesture_lbl.grid(row=0, column=3, padx=8, pady=8)
 
+        self._memory_var = tk.StringVar(value="")
+        ctk.CTkLabel(
+            bar, textvariable=self._memory_var,
+            font=ctk.CTkFont(size=11), text_color="gray55",
+        ).grid(row=0, column=4, padx=8, pady=8, sticky="e")
+
+        self._quality_var = tk.StringVar(value="")
+        ctk.CTkLabel(
+            bar, textvariable=self._quality_var,
+            font=ctk.CTkFont(size=11), text_color="orange",
+        ).grid(row=0, column=5, padx=8, pady=8, sticky="e")
+
+        self._rec_btn = ctk.CTkButton(
+            bar, text="⏺ Rec", width=90, height=26,
+            fg_color="gray35", hover_color="gray25",
+            font=ctk.CTkFont(size=11, weight="bold"),
+            command=self._toggle_recording,
+        )
+        self._rec_btn.grid(row=0, column=6, padx=(0, 6), pady=8, sticky="e")
+
+        ctk.CTkButton(
+            bar, text="⟲ Save Replay", width=100, height=26,
+            fg_color="gray35", hover_color="gray25",
+            font=ctk.CTkFont(size=11),
+            command=self._save_replay,
+        ).grid(row=0, column=7, padx=(0, 6), pady=8, sticky="e")
+
         ctk.CTkButton(
             bar, text="⚠ Panic", width=80, height=26,
             fg_color="#c62828", hover_color="#b71c1c",
             font=ctk.CTkFont(size=11, weight="bold"),
             command=self._panic,
-        ).grid(row=0, column=5, padx=(0, 14), pady=8, sticky="e")
+        ).grid(row=0, column=8, padx=(0, 14), pady=8, sticky="e")
 
     # ── Scene population ──────────────────────────────────────────
 
     def _rescan_and_refresh(self):
         path = self._lib_path_var.get() if hasattr(self, "_lib_path_var") else _load_library_path()
-        self._scene_mgr._scenes_dir = Path(path)
+        self._scene_mgr.set_scenes_dir(path)
         self._scene_mgr.scan()
         self._populate_scene_dropdown()
 
@@ -390,10 +493,10 @@ class AdaptiveMixerView(ctk.CTkFrame):
 
         display_values = []
         for scene in scenes:
-            cfg = self._scene_mgr._scenes.get(scene["id"], {}).get("config", {})
-            bpm = cfg.get("bpm", "?")
-            key = cfg.get("key", "?")
-            n_stems = len(cfg.get("stems", {}))
+            info = self._scene_mgr.get_scene_info(scene["id"])
+            bpm = info.get("bpm") or "?"
+            key = info.get("key") or "?"
+            n_stems = len(info.get("stems", {}))
             display = f"{scene['name']}  —  {bpm} BPM  {key}  ({n_stems} stems)"
             self._scene_map[display] = scene["path"]
             display_values.append(display)
@@ -423,10 +526,12 @@ class AdaptiveMixerView(ctk.CTkFrame):
             w.destroy()
         self._stem_sliders.clear()
         self._stem_vol_labels.clear()
+        self._stem_level_bars.clear()
         self._stem_mute_btns.clear()
         self._stem_last_source.clear()
         self._extra_stem_sliders.clear()
         self._extra_stem_vol_labels.clear()
+        self._extra_stem_level_bars.clear()
         self._extra_stem_mute_btns.clear()
 
         if not self._mixer:
@@ -434,7 +539,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 self._stem_scroll,
                 text="Adaptive mixer not available.\nInstall soundfile and numpy.",
                 font=ctk.CTkFont(size=12), text_color="gray50", justify="center",
-            ).grid(row=0, column=0, columnspan=5, pady=30)
+            ).grid(row=0, column=0, columnspan=6, pady=30)
             return
 
         stems = self._mixer.get_stem_names()
@@ -443,7 +548,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 self._stem_scroll,
                 text="No stems loaded — select a scene above and press Play.",
                 font=ctk.CTkFont(size=12), text_color="gray50",
-            ).grid(row=0, column=0, columnspan=5, pady=30)
+            ).grid(row=0, column=0, columnspan=6, pady=30)
             # Still show any active extra stems
             self._append_extra_stems_to_scroll(row_offset=1)
             return
@@ -458,7 +563,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
             target_vol = stem_obj._target_volume if stem_obj else default_vol
             is_muted = stem_obj._muted if stem_obj else True
 
-            # Row: [name] [slider] [vol%] [M]  (col 4 empty — alignment with extra stems)
+            # Row: [name] [slider] [level] [vol%] [M]  (col 5 empty — alignment with extra stems)
             row = ctk.CTkFrame(self._stem_scroll, fg_color="transparent")
             row.grid(row=idx, column=0, sticky="ew", pady=2)
             row.grid_columnconfigure(1, weight=1)
@@ -476,11 +581,14 @@ class AdaptiveMixerView(ctk.CTkFrame):
             slider.set(target_vol)
             slider.grid(row=0, column=1, sticky="ew", padx=4)
 
+            level_bar = self._make_level_bar(row)
+            level_bar.grid(row=0, column=2, padx=4)
+
             vol_lbl = ctk.CTkLabel(
                 row, text=f"{int(target_vol * 100):3d}%",
                 font=ctk.CTkFont(size=11, family="Courier"), width=40, anchor="e",
             )
-            vol_lbl.grid(row=0, column=2, padx=4)
+            vol_lbl.grid(row=0, column=3, padx=4)
 
             mute_btn = ctk.CTkButton(
                 row, text="M", width=30, height=28,
@@ -489,13 +597,14 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 font=ctk.CTkFont(size=11, weight="bold"),
                 command=lambda sid=stem_id: self._toggle_mute(sid),
             )
-            mute_btn.grid(row=0, column=3, padx=(4, 4))
+            mute_btn.grid(row=0, column=4, padx=(4, 4))
 
             # Spacer column so widths match extra stem rows (which have a "-" button)
-            ctk.CTkLabel(row, text="", width=30).grid(row=0, column=4, padx=(0, 8))
+            ctk.CTkLabel(row, text="", width=30).grid(row=0, column=5, padx=(0, 8))
 
             self._stem_sliders[stem_id] = slider
             self._stem_vol_labels[stem_id] = vol_lbl
+            self._stem_level_bars[stem_id] = level_bar
             self._stem_mute_btns[stem_id] = mute_btn
             self._stem_last_source[stem_id] = None
 
@@ -547,11 +656,14 @@ class AdaptiveMixerView(ctk.CTkFrame):
             slider.set(target_vol)
             slider.grid(row=0, column=1, sticky="ew", padx=4)
 
+            level_bar = self._make_level_bar(row)
+            level_bar.grid(row=0, column=2, padx=4)
+
             vol_lbl = ctk.CTkLabel(
                 row, text=f"{int(target_vol * 100):3d}%",
                 font=ctk.CTkFont(size=11, family="Courier"), width=40, anchor="e",
             )
-            vol_lbl.grid(row=0, column=2, padx=4)
+            vol_lbl.grid(row=0, column=3, padx=4)
 
             mute_btn = ctk.CTkButton(
                 row, text="M", width=30, height=28,
@@ -560,7 +672,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 font=ctk.CTkFont(size=11, weight="bold"),
                 command=lambda k=key: self._toggle_extra_mute(k),
             )
-            mute_btn.grid(row=0, column=3, padx=(4, 4))
+            mute_btn.grid(row=0, column=4, padx=(4, 4))
 
             remove_btn = ctk.CTkButton(
                 row, text="−", width=28, height=28,
@@ -569,10 +681,11 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 font=ctk.CTkFont(size=14, weight="bold"),
                 command=lambda k=key: self._remove_extra_stem(k),
             )
-            remove_btn.grid(row=0, column=4, padx=(0, 8))
+            remove_btn.grid(row=0, column=5, padx=(0, 8))
 
             self._extra_stem_sliders[key] = slider
             self._extra_stem_vol_labels[key] = vol_lbl
+            self._extra_stem_level_bars[key] = level_bar
             self._extra_stem_mute_btns[key] = mute_btn
 
     # ── Motif stems config persistence ────────────────────────────
@@ -610,6 +723,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
             return
 
         active_keys = set(self._mixer.get_extra_stem_keys()) if self._mixer else set()
+        pending_keys = set(self._mixer.get_pending_extra_stem_keys()) if self._mixer else set()
 
         for entry in self._motif_stems_config:
             scene_dir = entry["scene_dir"]
@@ -618,8 +732,11 @@ class AdaptiveMixerView(ctk.CTkFrame):
             scene_id = entry["scene_id"]
             key = f"{scene_id}::{stem_id}"
             is_active = key in active_keys
+            is_pending = key in pending_keys
 
             label = f"{scene_name} › {stem_id}"
+            if is_pending:
+                label = f"⏳ {label}"
             btn = ctk.CTkButton(
                 self._motif_btns_frame,
                 text=label,
@@ -627,6 +744,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 fg_color=("#1565c0", "#0d47a1") if is_active else ("gray30", "gray22"),
                 hover_color=("#0d47a1", "#01579b") if is_active else ("gray22", "gray15"),
                 font=ctk.CTkFont(size=11),
+                state="disabled" if is_pending else "normal",
                 command=lambda sd=scene_dir, sid=stem_id, k=key: self._on_motif_stem_click(sd, sid, k),
             )
             btn.pack(side="left", padx=3, pady=4)
@@ -653,49 +771,86 @@ class AdaptiveMixerView(ctk.CTkFrame):
     # ── Motif stem picker dialog ──────────────────────────────────
 
     def _open_motif_picker(self):
-        """Open a two-step dialog: pick scene → pick stem → add to motif bar."""
+        """Open a two-step dialog: pick scene → pick stem → add to motif bar.
+
+        Typing in the search box (or picking a role) lists matching stems
+        across the whole library instead, e.g. "drums 110-130".
+        """
         scenes = self._scene_mgr.get_scene_list() if self._scene_mgr else []
         if not scenes:
             return
+        scenes_by_name = {s["name"]: s for s in scenes}
 
         dlg = ctk.CTkToplevel(self)
         dlg.title("Add Motif Stem")
-        dlg.geometry("360x280")
+        dlg.geometry("380x380")
         dlg.resizable(False, False)
         dlg.grab_set()
         dlg.grid_columnconfigure(0, weight=1)
 
+        search_row = ctk.CTkFrame(dlg, fg_color="transparent")
+        search_row.grid(row=0, column=0, padx=20, pady=(18, 6), sticky="ew")
+        search_row.grid_columnconfigure(0, weight=1)
+        search_var = tk.StringVar()
+        ctk.CTkEntry(
+            search_row, textvariable=search_var,
+            placeholder_text="Search stems, e.g. drums 110-130",
+        ).grid(row=0, column=0, sticky="ew")
+        any_role = "any role"
+        role_var = tk.StringVar(value=any_role)
+        ctk.CTkOptionMenu(
+            search_row, variable=role_var, width=100,
+            values=[any_role] + self._scene_mgr.index.get_roles(),
+            command=lambda _: _populate_stems(),
+        ).grid(row=0, column=1, padx=(6, 0))
+
         ctk.CTkLabel(
             dlg, text="Select Song",
             font=ctk.CTkFont(size=13, weight="bold"),
-        ).grid(row=0, column=0, padx=20, pady=(18, 6), sticky="w")
+        ).grid(row=1, column=0, padx=20, pady=(0, 6), sticky="w")
 
-        scene_names = [s["name"] for s in scenes]
+        scene_names = list(scenes_by_name)
         scene_var = tk.StringVar(value=scene_names[0])
         scene_combo = ctk.CTkComboBox(
             dlg, values=scene_names, variable=scene_var,
             state="readonly", width=310,
         )
-        scene_combo.grid(row=1, column=0, padx=20, pady=(0, 12), sticky="ew")
+        scene_combo.grid(row=2, column=0, padx=20, pady=(0, 12), sticky="ew")
 
         ctk.CTkLabel(
             dlg, text="Select Stem",
             font=ctk.CTkFont(size=13, weight="bold"),
-        ).grid(row=2, column=0, padx=20, pady=(0, 6), sticky="w")
+        ).grid(row=3, column=0, padx=20, pady=(0, 6), sticky="w")
 
-        stem_frame = ctk.CTkScrollableFrame(dlg, height=110, fg_color="transparent")
-        stem_frame.grid(row=3, column=0, padx=20, pady=(0, 12), sticky="ew")
+        stem_frame = ctk.CTkScrollableFrame(dlg, height=150, fg_color="transparent")
+        stem_frame.grid(row=4, column=0, padx=20, pady=(0, 12), sticky="ew")
         stem_frame.grid_columnconfigure(0, weight=1)
 
         def _populate_stems(*_):
             for w in stem_frame.winfo_children():
                 w.destroy()
-            selected_name = scene_var.get()
-            scene_entry = next((s for s in scenes if s["name"] == selected_name), None)
+            query = search_var.get().strip()
+            role = role_var.get()
+            if query or role != any_role:
+                # Library-wide search through the scene index
+                hits = self._scene_mgr.find_stems(
+                    role=None if role == any_role else role,
+                    limit=MOTIF_SEARCH_LIMIT, **_parse_stem_search(query),
+                )
+                for row_idx, hit in enumerate(hits):
+                    scene_entry = {"id": hit["scene_id"], "path": hit["path"], "name": hit["scene_name"]}
+                    ctk.CTkButton(
+                        stem_frame, text=f"{hit['stem_id']}  —  {hit['scene_name']}",
+                        height=26, anchor="w",
+                        command=lambda s=scene_entry, st=hit["stem_id"]: _pick(s, st, dlg),
+                    ).grid(row=row_idx, column=0, columnspan=4, padx=3, pady=2, sticky="ew")
+                return
+
+            scene_entry = scenes_by_name.get(scene_var.get())
             if not scene_entry:
                 return
-            cfg = self._scene_mgr._scenes.get(scene_entry["id"], {}).get("config", {})
-            stems = list(cfg.get("stems", {}).keys())
+            info = self._scene_mgr.get_scene_info(scene_entry["id"])
+            stems = list(info.get("stems", {}).keys())
             for col_idx, sid in enumerate(stems):
                 ctk.CTkButton(
                     stem_frame, text=sid,
@@ -722,13 +877,14 @@ class AdaptiveMixerView(ctk.CTkFrame):
             self._refresh_motif_stems()
 
         scene_combo.configure(command=_populate_stems)
+        search_var.trace_add("write", _populate_stems)
         _populate_stems()
 
         ctk.CTkButton(
             dlg, text="Cancel", width=90, height=28,
             fg_color=("gray35", "gray25"), hover_color=("gray25", "gray15"),
             command=dlg.destroy,
-        ).grid(row=4, column=0, padx=20, pady=(0, 16), sticky="e")
+        ).grid(row=5, column=0, padx=20, pady=(0, 16), sticky="e")
 
     # ── User actions ──────────────────────────────────────────────
 
@@ -764,31 +920,72 @@ class AdaptiveMixerView(ctk.CTkFrame):
             self._mixer.stop()
 
     def _load_scene(self, scene_path: str):
-        if not self._mixer or self._loading:
+        if not self._mixer:
             return
+        # Latest wins: a newer selection supersedes a load still in flight
         self._loading = True
-        self._play_btn.configure(state="disabled", text="Loading…")
-        t = threading.Thread(
-            target=self._load_scene_bg, args=(scene_path,), daemon=True
-        )
-        t.start()
+        self._start_after_load = True
+        self._play_btn.configure(text="Loading…")
+        self._mixer.request_scene(scene_path)
 
-    def _load_scene_bg(self, scene_path: str):
-        try:
-            self._mixer.load_scene(scene_path)
-            if not self._mixer._running:
-                self._mixer.start()
-        except Exception as e:
-            print(f"[MixerView] Failed to load scene: {e}")
-        self.after(0, self._on_scene_loaded)
+    def _sync_load_state(self):
+        """Reflect the mixer's scene loader in the UI and react to completed loads."""
+        if not self._mixer:
+            return
+        st = self._mixer.get_load_state()
+        if st["loaded_generation"] != self._seen_load_generation:
+            self._seen_load_generation = st["loaded_generation"]
+            self._on_scene_loaded()
+
+        busy = st["state"] != "idle"
+        if busy:
+            self._loading = True
+            target = Path(st["target"]).name if st["target"] else ""
+            verb = "Decoding" if st["state"] == "decoding" else "Switching to"
+            self._load_state_var.set(f"{verb} {target}…")
+            self._play_btn.configure(text="Loading…")
+        elif self._loading:
+            self._loading = False
+            self._start_after_load = False
+            self._play_btn.configure(text="⏵  Play")
+            self._load_state_var.set(f"Load failed: {st['error']}" if st["error"] else "")
 
     def _on_scene_loaded(self):
-        self._loading = False
-        self._play_btn.configure(state="normal", text="⏵  Play")
+        if self._start_after_load and not self._mixer._running:
+            self._mixer.start()
+        self._load_state_var.set("")
         self._populate_scene_dropdown()
         self._refresh_stems()
         self._refresh_motif_stems()
         self._sync_bpm_key()
+        self._show_waveform()
+
+    def _show_waveform(self):
+        """Show the loaded scene's waveform overview, or hide the strip if it has none."""
+        has_waveform = bool(self._mixer) and self._mixer.get_scene_waveform(1) is not None
+        if has_waveform:
+            self._waveform_canvas.grid()
+            self._draw_waveform()
+        else:
+            self._waveform_canvas.grid_remove()
+
+    def _draw_waveform(self):
+        canvas = self._waveform_canvas
+        canvas.delete("all")
+        width = canvas.winfo_width()
+        if not self._mixer or width <= 1:
+            return
+        overview = self._mixer.get_scene_waveform(width)
+        if overview is None:
+            return
+        mins, maxs = overview
+        mid = WAVEFORM_HEIGHT / 2
+        # One polygon: the upper envelope left to right, the lower one back
+        top = [(x, mid - v * mid) for x, v in enumerate(maxs.tolist())]
+        bottom = [(x, mid - v * mid) for x, v in reversed(list(enumerate(mins.tolist())))]
+        canvas.create_polygon(top + bottom, fill=_mode_color(WAVEFORM_COLOR), outline="")
+        canvas.create_line(0, 0, 0, WAVEFORM_HEIGHT, fill=_mode_color(PLAYHEAD_COLOR),
+                           width=2, tags="playhead")
 
     def _on_stem_slider(self, stem_id: str, value: float):
         if self._updating_sliders:
@@ -846,13 +1043,20 @@ class AdaptiveMixerView(ctk.CTkFrame):
             # Already active — toggle off
             self._remove_extra_stem(key)
         else:
-            try:
-                self._mixer.add_extra_stem(scene_dir, stem_id, volume=0.5)
-            except Exception as e:
-                print(f"[MixerView] Could not add motif stem: {e}")
-            self._refresh_stems()
+            # Decode off the Tk thread; the button shows a loading state meanwhile
+            self._mixer.add_extra_stem_async(
+                scene_dir, stem_id, volume=0.5,
+                callback=lambda fut: self.after(0, lambda: self._on_motif_stem_ready(fut)),
+            )
             self._refresh_motif_stems()
 
+    def _on_motif_stem_ready(self, future):
+        error = future.exception()
+        if error is not None:
+            print(f"[MixerView] Could not add motif stem: {error}")
+        self._refresh_stems()
+        self._refresh_motif_stems()
+
     def _on_timeline_seek(self, value: float):
         if self._updating_sliders or not self._mixer:
             return
@@ -892,14 +1096,35 @@ class AdaptiveMixerView(ctk.CTkFrame):
         self._intensity_var.set(0)
         self._intensity_label.configure(text="0 / 3  (base)")
 
+    def _toggle_recording(self):
+        if not self._mixer:
+            return
+        recorder = self._mixer.recorder
+        try:
+            if recorder.is_recording:
+                recorder.stop_recording()
+            else:
+                recorder.start_recording()
+        except Exception as e:
+            print(f"[MixerView] Recording failed: {e}")
+        self._sync_recording()
+
+    def _save_replay(self):
+        if self._mixer:
+            self._mixer.recorder.save_replay()
+
     # ── Periodic poll ─────────────────────────────────────────────
 
     def _poll(self):
+        self._sync_load_state()
+        self._levels = self._mixer.get_levels() if self._mixer else {}
         self._sync_stem_meters()
         self._sync_extra_stem_meters()
+        self._sync_master_level()
         self._sync_master_slider()
         self._sync_timeline()
         self._sync_status_bar()
+        self._sync_recording()
         self._update_music_now_playing()
         self._poll_job = self.after(self.POLL_MS, self._poll)
 
@@ -927,6 +1152,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
                 lbl = self._stem_vol_labels.get(stem_id)
                 if lbl:
                     lbl.configure(text=f"{int(live_vol * 100):3d}%")
+                self._show_level(self._stem_level_bars.get(stem_id), stem_id)
 
                 # Update mute button appearance
                 btn = self._stem_mute_btns.get(stem_id)
@@ -968,6 +1194,7 @@ class AdaptiveMixerView(ctk.CTkFrame):
             lbl = self._extra_stem_vol_labels.get(key)
             if lbl:
                 lbl.configure(text=f"{int(live_vol * 100):3d}%")
+            self._show_level(self._extra_stem_level_bars.get(key), key)
 
             btn = self._extra_stem_mute_btns.get(key)
             if btn:
@@ -979,6 +1206,51 @@ class AdaptiveMixerView(ctk.CTkFrame):
                         hover_color=("#0d47a1", "#01579b"),
                     )
 
+    def _sync_master_level(self):
+        if hasattr(self, "_master_level_bar"):
+            master = self._levels.get("master", {})
+            self._set_level_bar(self._master_level_bar, master.get("peak", 0.0))
+
+    def _show_level(self, bar, name: str):
+        """Show a stem's metered peak; falls back to its gain while beds play."""
+        if bar is None:
+            return
+        level = self._levels.get("stems", {}).get(name)
+        if level and level["live"]:
+            self._set_level_bar(bar, level["peak"])
+        else:
+            stem = self._mixer._stems.get(name) or self._mixer._extra_stems.get(name)
+            self._set_level_bar(bar, stem.current_volume if stem else 0.0)
+
+    @staticmethod
+    def _make_level_bar(parent):
+        bar = ctk.CTkProgressBar(parent, width=60, height=8, progress_color=METER_COLOR)
+        bar.set(0.0)
+        bar.meter_color = METER_COLOR  # last colour set, so polls only reconfigure on change
+        return bar
+
+    @staticmethod
+    def _set_level_bar(bar, peak: float):
+        """Peak on a -60..0 dBFS scale; turns red at full scale."""
+        bar.set((_to_dbfs(peak) + 60.0) / 60.0)
+        color = METER_CLIP_COLOR if peak >= 0.999 else METER_COLOR
+        if color != bar.meter_color:
+            bar.meter_color = color
+            bar.configure(progress_color=color)
+
+    def _sync_recording(self):
+        if not self._mixer or not hasattr(self, "_rec_btn"):
+            return
+        status = self._mixer.recorder.get_status()
+        if status["recording"]:
+            drops = f" ⚠{status['dropped_blocks']}" if status["dropped_blocks"] else ""
+            self._rec_btn.configure(
+                text=f"⏹ {_fmt_time(status['seconds'])}{drops}",
+                fg_color="#c62828", hover_color="#b71c1c",
+            )
+        else:
+            self._rec_btn.configure(text="⏺ Rec", fg_color="gray35", hover_color="gray25")
+
     def _sync_timeline(self):
         if not self._mixer or not hasattr(self, "_timeline_slider"):
             return
@@ -992,6 +1264,9 @@ class AdaptiveMixerView(ctk.CTkFrame):
             self._timeline_slider.set(current / total)
         finally:
             self._updating_sliders = False
+        if self._waveform_canvas.winfo_ismapped():
+            x = current / total * self._waveform_canvas.winfo_width()
+            self._waveform_canvas.coords("playhead", x, 0, x, WAVEFORM_HEIGHT)
 
     def _sync_master_slider(self):
         if not self._mixer:
@@ -1026,6 +1301,26 @@ class AdaptiveMixerView(ctk.CTkFrame):
             bar, beat, _ = self._mixer.clock.get_position()
             self._beat_var.set(f"Bar {bar + 1} | Beat {beat + 1}")
 
+        # Overload degradation (blank at full quality)
+        quality = self._mixer.get_quality_status()
+        self._quality_var.set(
+            f"⚡ {quality['description']}" if quality["level"] > 0 else ""
+        )
+
+        self._sync_memory()
+
+    def _sync_memory(self):
+        report = self._mixer.get_memory_report()
+        cats = report["categories"]
+        parts = [
+            f"{label} {cats[name]['mb']:.0f}"
+            for name, label in MEMORY_LABELS
+            if cats.get(name, {}).get("mb", 0.0) >= 1.0
+        ]
+        budget = f"/{report['budget_mb']:.0f}" if report["budget_mb"] else ""
+        detail = f" ({' · '.join(parts)})" if parts else ""
+        self._memory_var.set(f"RAM {report['total_mb']:.0f}{budget} MB{detail}")
+
     def _sync_bpm_key(self):
         if not self._mixer or not self._mixer._scene_config:
             self._bpm_var.set("BPM: —")
@@ -4,6 +4,9 @@ Provides a sidebar to switch between views: Keywords, Soundboard,
 Gestures, Voice FX, and Adaptive Mixer.
 """
 
+import os
+import threading
+
 import customtkinter as ctk
 from pygame import mixer
 
@@ -13,9 +16,11 @@ from gui.gesture_view import GestureView
 from gui.effects_view import EffectsView
 from gui.adaptive_mixer_view import AdaptiveMixerView
 
-from core.music_controller import create_music_controller, MusicBindingManager
+from core.music_controller import create_music_controller, MusicBindingManager, PlaybackState, Track
 from core.gesture_detector import GestureDetector, GestureEvent, HAS_MEDIAPIPE
-from core.voice_effects import VoiceEffectsProcessor
+from core.fs_watcher import FileWatcher
+from core.session_snapshot import SessionSnapshotter, load_snapshot
+from core.voice_effects import EffectPreset, VoiceEffectsProcessor
 
 # Adaptive mixer — optional, gracefully disabled if dependencies missing
 try:
@@ -47,9 +52,6 @@ class ConductorApp(ctk.CTk):
         mixer.set_num_channels(32)
 
         # ── Shared subsystems ──────────────────────────────────────
-        self.music_controller = create_music_controller()
-        self.music_controller.load_library("music/")
-
         self.music_bindings = MusicBindingManager()
 
         self.effects_processor = VoiceEffectsProcessor()
@@ -63,9 +65,20 @@ class ConductorApp(ctk.CTk):
         self.adaptive_mixer = None
         self._mixer_gesture_ctrl = None
         self._mixer_keyboard_ctrl = None
+        self._mixer_scene_mgr = None
+        self._restore_on_start = True
+        self._library_path = None
         if _ADAPTIVE_MIXER_AVAILABLE:
             self._init_adaptive_mixer()
 
+        # Background music streams through the mixer's deck when it is available
+        self.music_controller = create_music_controller(self.adaptive_mixer, "music/")
+        self.music_controller.load_library("music/")
+
+        # ── Session snapshot (warm start after a crash/restart) ────
+        self._snapshotter = SessionSnapshotter()
+        self._init_session_snapshot()
+
         # ── Layout ─────────────────────────────────────────────────
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -73,6 +86,10 @@ class ConductorApp(ctk.CTk):
         self._build_sidebar()
         self._build_content()
 
+        # ── Library watcher (new/edited scenes and sounds) ─────────
+        self._file_watcher = FileWatcher()
+        self._init_file_watcher()
+
         self._current: str | None = None
         self._show_keywords()
 
@@ -152,6 +169,7 @@ class ConductorApp(ctk.CTk):
             self._content, CONFIG,
             music_controller=self.music_controller,
             music_bindings=self.music_bindings,
+            audio_engine=self.adaptive_mixer,
         )
         self._gesture_view = GestureView(
             self._content,
@@ -231,18 +249,27 @@ class ConductorApp(ctk.CTk):
             import yaml as _yaml
             try:
                 with open("config/mixer_config.yaml", "r") as _f:
-                    _mcfg = _yaml.safe_load(_f)
-                library_path = _mcfg.get("library_path", "assets/music/scenes")
+                    _mcfg = _yaml.safe_load(_f) or {}
             except Exception:
-                library_path = "assets/music/scenes"
-
-            self.adaptive_mixer = AdaptiveMixer()
+                _mcfg = {}
+            library_path = _mcfg.get("library_path", "assets/music/scenes")
+            self._library_path = library_path
+
+            self.adaptive_mixer = AdaptiveMixer(
+                cache_budget_mb=_mcfg.get("scene_cache_mb", 1024),
+                auto_tune_block_size=_mcfg.get("auto_tune_block_size", False),
+                replay_minutes=_mcfg.get("replay_minutes", 5.0),
+                memory_budget_mb=_mcfg.get("memory_budget_mb", 0),
+            )
+            self._restore_on_start = _mcfg.get("restore_session", True)
             self._mixer_scene_mgr = SceneManager(library_path)
             self._mixer_gesture_ctrl = MixerGestureController(self.adaptive_mixer)
             self._mixer_keyboard_ctrl = MixerKeyboardController(self.adaptive_mixer)
             self._mixer_keyboard_ctrl.set_available_scenes(
                 self._mixer_scene_mgr.get_scene_paths()
             )
+            if _mcfg.get("voice_fx_in_engine", False):
+                self.effects_processor.attach_engine(self.adaptive_mixer)
         except Exception as e:
             print(f"[App] Adaptive mixer init failed: {e}")
             self.adaptive_mixer = None
@@ -305,6 +332,8 @@ class ConductorApp(ctk.CTk):
         """Preview a gesture action — used by GestureView for testing only."""
         if action == "cut_all":
             mixer.stop()
+            if self.adaptive_mixer:
+                self.adaptive_mixer.sfx.stop_all()
 
     # ── Voice command dispatcher (called from soundboard_view) ────
     def handle_music_voice_command(self, action: str):
@@ -334,8 +363,112 @@ class ConductorApp(ctk.CTk):
         except KeyError:
             pass
 
+    # ── Session snapshot ──────────────────────────────────────────
+    def _init_session_snapshot(self):
+        """Restore the last session, then keep snapshotting it."""
+        if self.adaptive_mixer:
+            self._snapshotter.add_source("mixer", self.adaptive_mixer.get_session_state)
+        self._snapshotter.add_source("music", self._capture_music_state)
+        self._snapshotter.add_source("voice_fx", self._capture_voice_fx_state)
+
+        snapshot = load_snapshot() if self._restore_on_start else None
+        if not snapshot:
+            self._snapshotter.start()
+            return
+        self._restore_voice_fx_state(snapshot.get("voice_fx") or {})
+        self._restore_music_state(snapshot.get("music") or {})
+        # Decoding takes a moment even for a warm start: keep the UI responsive
+        threading.Thread(
+            target=self._restore_mixer_state, args=(snapshot.get("mixer") or {},), daemon=True,
+        ).start()
+
+    def _restore_mixer_state(self, state: dict):
+        try:
+            if self.adaptive_mixer and state and self.adaptive_mixer.restore_session(state):
+                if self._mixer_gesture_ctrl:
+                    self._mixer_gesture_ctrl._current_intensity = state.get("intensity", 0)
+                print("[App] Restored previous session")
+        except Exception as e:
+            print(f"[App] Session restore failed: {e}")
+        finally:
+            # Only start overwriting the snapshot once it has been restored
+            self._snapshotter.start()
+
+    def _capture_music_state(self) -> dict:
+        mc = self.music_controller
+        track = mc.get_current_track()
+        return {
+            "source": track.source if track else None,
+            "playing": mc.get_state() in (PlaybackState.PLAYING, PlaybackState.FADING_IN),
+            "volume": round(mc.get_volume(), 3),
+        }
+
+    def _restore_music_state(self, state: dict):
+        mc = self.music_controller
+        if "volume" in state:
+            mc.set_volume(state["volume"])
+        source = state.get("source")
+        if state.get("playing") and source:
+            track = next((t for t in mc.library if t.source == source), None)
+            if track is None:
+                if not os.path.exists(source):
+                    return
+                track = Track(name=os.path.splitext(os.path.basename(source))[0], source=source)
+            mc.play(track)
+
+    def _capture_voice_fx_state(self) -> dict:
+        fx = self.effects_processor
+        return {"preset": fx.preset.name, "dry_wet": round(fx.dry_wet, 3)}
+
+    def _restore_voice_fx_state(self, state: dict):
+        fx = self.effects_processor
+        if "dry_wet" in state:
+            fx.set_dry_wet(state["dry_wet"])
+        try:
+            preset = EffectPreset[state.get("preset", "NONE")]
+        except KeyError:
+            return
+        if preset != EffectPreset.NONE:
+            fx.set_preset(preset)
+
+    # ── Library watcher ───────────────────────────────────────────
+    def _init_file_watcher(self):
+        """Pick up added, edited and removed scenes and sounds without a manual rescan."""
+        if self._mixer_scene_mgr and self._library_path and os.path.isdir(self._library_path):
+            self._file_watcher.watch(self._library_path, self._on_library_changed)
+        if os.path.isdir("sounds"):
+            # The soundboard's caches belong to the Tk thread
+            self._file_watcher.watch(
+                "sounds", lambda paths: self.after(0, lambda p=paths: self._sb_view.reload_sounds(p))
+            )
+        self._file_watcher.start()
+
+    def _on_library_changed(self, paths: set):
+        """Watcher thread: re-index only the scenes that own the changed files."""
+        scene_mgr = self._mixer_scene_mgr
+        # Paths as cached (folder or .scenepack), taken before removed scenes drop out
+        old_paths = {s["id"]: s["path"] for s in scene_mgr.get_scene_list()}
+        changed = scene_mgr.rescan_paths(paths)
+        if not changed:
+            return
+        for scene_id in changed:
+            # Cached decodes of an edited, re-packed or removed scene are stale
+            for path in {old_paths.get(scene_id), scene_mgr.get_scene_path(scene_id)} - {None}:
+                self.adaptive_mixer.scene_cache.invalidate(path)
+        if self._mixer_keyboard_ctrl:
+            self._mixer_keyboard_ctrl.set_available_scenes(scene_mgr.get_scene_paths())
+        print(f"[App] Library changed: {', '.join(changed)}")
+
     def destroy(self):
         """Clean up all subsystems on exit."""
+        try:
+            self._file_watcher.stop()
+        except Exception:
+            pass
+        try:
+            self._snapshotter.stop()
+        except Exception:
+            pass
         if self.adaptive_mixer:
             try:
                 self.adaptive_mixer.cleanup()
@@ -347,8 +480,12 @@ class ConductorApp(ctk.CTk):
 class _NoOpSceneManager:
     """Placeholder when adaptive mixer is unavailable."""
     def scan(self): pass
+    def set_scenes_dir(self, scenes_dir): pass
+    def add_listener(self, callback): pass
     def get_scene_list(self): return []
+    def get_scene_info(self, scene_id): return {}
     def get_scene_paths(self): return []
+    def find_stems(self, **filters): return []
 
 
 class _NoOpDetector:
@@ -35,6 +35,7 @@ class EffectsView(ctk.CTkFrame):
         self.fx = effects_processor
         self._meter_job = None
         self._preset_btns: dict[EffectPreset, ctk.CTkButton] = {}
+        self._fx_shown_active = False
         self._build_ui()
 
     def activate(self):
@@ -164,7 +165,7 @@ class EffectsView(ctk.CTkFrame):
         self._out_meter.grid(row=2, column=1, padx=10, pady=8)
 
         # Highlight current preset (NONE at start)
-        self._highlight_preset(EffectPreset.NONE)
+        self._highlight_preset(self.fx.preset)
 
     def _build_device_panel(self):
         panel = ctk.CTkFrame(self, corner_radius=10)
@@ -200,21 +201,32 @@ class EffectsView(ctk.CTkFrame):
     def _toggle_fx(self):
         if self.fx.is_running:
             self.fx.stop()
-            self._enable_btn.configure(
-                text="🎙 Enable Voice FX",
-                fg_color=("#3a7ebf", "#1f538d"),
-                hover_color=("#325882", "#14375e"))
-            self._status_var.set("Inactive")
+            self._show_fx_state(False, "Inactive")
         else:
             self.fx.start()
             if self.fx.is_running:
-                self._enable_btn.configure(
-                    text="⏹ Disable Voice FX",
-                    fg_color="#c62828", hover_color="#b71c1c")
-                self._status_var.set("Active")
+                self._show_fx_state(True, "Active")
             else:
                 self._status_var.set("Failed to start — check audio devices")
 
+    def _show_fx_state(self, active: bool, status: str):
+        self._fx_shown_active = active
+        if active:
+            self._enable_btn.configure(
+                text="⏹ Disable Voice FX",
+                fg_color="#c62828", hover_color="#b71c1c")
+        else:
+            self._enable_btn.configure(
+                text="🎙 Enable Voice FX",
+                fg_color=("#3a7ebf", "#1f538d"),
+                hover_color=("#325882", "#14375e"))
+        self._status_var.set(status)
+
+    def _sync_fx_state(self):
+        """Catch the stream going away underneath us (e.g. the mixer dropped its input bus)."""
+        if self._fx_shown_active and not self.fx.is_running:
+            self._show_fx_state(False, "Stopped — audio stream closed")
+
     def _select_preset(self, preset: EffectPreset):
         self.fx.set_preset(preset)
         self._highlight_preset(preset)
@@ -253,6 +265,7 @@ class EffectsView(ctk.CTkFrame):
     # ── Level meters ──────────────────────────────────────────────
     def _schedule_meters(self):
         self._update_meters()
+        self._sync_fx_state()
         self._meter_job = self.after(66, self._schedule_meters)
 
     def _update_meters(self):
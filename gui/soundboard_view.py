@@ -48,11 +48,13 @@ class SoundboardView(ctk.CTkFrame):
     SB_PATH = "config/soundboard_config.yaml"
 
     def __init__(self, parent, config_path: str,
-                 music_controller=None, music_bindings=None):
+                 music_controller=None, music_bindings=None, audio_engine=None):
         super().__init__(parent, fg_color="transparent")
         self.config_path = config_path
         self.music_controller = music_controller
         self.music_bindings = music_bindings
+        # AdaptiveMixer whose SFX pool plays the sounds; pygame is the fallback
+        self.audio_engine = audio_engine
         self.active = False
         self.listening = False
         self._listen_thread: Thread | None = None
@@ -61,6 +63,8 @@ class SoundboardView(ctk.CTkFrame):
         self._sound_cache: dict[str, mixer.Sound] = {}
         self._load_configs()
         self._build_ui()
+        if self.audio_engine is not None:
+            Thread(target=self._preload_sounds, daemon=True).start()
 
     # ── Config I/O ────────────────────────────────────────────────────
     def _load_configs(self):
@@ -175,12 +179,85 @@ class SoundboardView(ctk.CTkFrame):
         fp = os.path.join("sounds", bind["file"])
         if not os.path.exists(fp):
             return
-        if fp not in self._sound_cache:
-            self._sound_cache[fp] = mixer.Sound(fp)
-        snd = self._sound_cache[fp]
-        snd.set_volume(bind.get("volume", 0.5))
+        self._play_file(fp, bind.get("volume", 0.5), bind.get("priority", 1))
+
+    def _play_file(self, fp: str, volume: float, priority: int = 0):
+        if self.audio_engine is not None:
+            try:
+                self.audio_engine.open_stream()  # without resuming a stopped scene
+                self.audio_engine.sfx.play(
+                    fp, volume, priority,
+                    on_error=lambda e: self.after(0, lambda: self._play_pygame(fp, volume)),
+                )
+                return
+            except Exception as e:
+                print(f"[SoundboardView] SFX pool failed, using pygame: {e}")
+        self._play_pygame(fp, volume)
+
+    def _play_pygame(self, fp: str, volume: float):
+        # Keep our own reference: the memory budget may evict the cache entry at any time
+        snd = self._sound_cache.get(fp)
+        if snd is None:
+            snd = self._cache_pygame_sound(fp)
+        snd.set_volume(volume)
         snd.play()
 
+    def _cache_pygame_sound(self, fp: str) -> "mixer.Sound":
+        snd = mixer.Sound(fp)
+        self._sound_cache[fp] = snd
+        memory = getattr(self.audio_engine, "memory", None)
+        init = mixer.get_init()
+        if memory is not None and init:
+            freq, size, channels = init
+            nbytes = int(snd.get_length() * freq) * channels * (abs(size) // 8)
+            memory.track("pygame_sounds", fp, nbytes=nbytes,
+                         evict=lambda: self._sound_cache.pop(fp, None) is not None)
+        return snd
+
+    def _bound_sound_paths(self) -> list:
+        files = {b["file"] for b in self._bindings.values() if b.get("file")}
+        files |= {p["file"] for p in self.triggers.values() if p.get("file")}
+        return [os.path.join("sounds", f) for f in sorted(files)]
+
+    def _preload_sounds(self):
+        """Decode every bound and trigger sound so the first press is instant."""
+        paths = self._bound_sound_paths()
+        self.audio_engine.sfx.preload([p for p in paths if os.path.exists(p)])
+
+    def reload_sounds(self, changed: set):
+        """
+        Drop decoded copies of sound files that changed on disk and re-decode
+        the bound ones. `changed` holds absolute paths from the file watcher;
+        the sounds folder itself means "anything may have changed".
+        Runs on the Tk thread; the re-decode happens in the background.
+        """
+        sounds_dir = os.path.abspath("sounds")
+        bound = self._bound_sound_paths()
+        stale = set()
+        for path in changed:
+            try:
+                rel = os.path.relpath(path, sounds_dir)
+            except ValueError:
+                continue  # on another drive (Windows), so not under sounds/
+            if rel == os.curdir:
+                stale.update(bound)
+                stale.update(list(self._sound_cache))
+            elif not rel.startswith(os.pardir):
+                stale.add(os.path.join("sounds", rel))
+
+        memory = getattr(self.audio_engine, "memory", None)
+        for fp in stale:
+            if self.audio_engine is not None:
+                self.audio_engine.sfx.unload(fp)
+            if self._sound_cache.pop(fp, None) is not None and memory is not None:
+                memory.untrack("pygame_sounds", fp)
+        if self.audio_engine is not None:
+            Thread(target=self.audio_engine.sfx.preload,
+                   args=([p for p in bound if p in stale and os.path.exists(p)],),
+                   daemon=True).start()
+        if stale:
+            print(f"[SoundboardView] Reloaded {len(stale)} changed sound file(s)")
+
     def _remove(self, key: str):
         self._bindings.pop(key, None)
         self._save_bindings()
@@ -362,11 +439,7 @@ class SoundboardView(ctk.CTkFrame):
             if trigger in text_l and trigger not in played:
                 fp = os.path.join("sounds", params["file"])
                 if os.path.exists(fp):
-                    if fp not in self._sound_cache:
-                        self._sound_cache[fp] = mixer.Sound(fp)
-                    snd = self._sound_cache[fp]
-                    snd.set_volume(params["volume"])
-                    snd.play()
+                    self._play_file(fp, params["volume"])
                     played.add(trigger)
 
                     # Highlight matching soundboard cards (green flash)
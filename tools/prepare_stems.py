@@ -3,48 +3,91 @@ Stem preparation utility for ConductorSBN adaptive mixer.
 
 Run standalone to:
 1. Verify all stems in a scene have matching sample rate, channels, and duration
-2. Normalize/pad stems to match
+2. Normalize/pad stems to match (one scene, or the whole library in parallel)
 3. Run Demucs on a full track to extract stems (optional)
+4. Pre-render static per-stem effects so the mixer doesn't run them live
+5. Pack a scene into one .scenepack file the mixer maps without decoding
+6. Move stems into the library's content-addressed store (shared between scenes)
+7. Analyse stems (loudness, peaks, waveform) into sidecars the GUI and mixer read
 
 Usage:
     python tools/prepare_stems.py verify assets/music/scenes/enchanted_forest/
     python tools/prepare_stems.py normalize assets/music/scenes/enchanted_forest/ --sr 44100
+    python tools/prepare_stems.py verify-all --report verify_report.json
+    python tools/prepare_stems.py normalize-all assets/music/scenes/ --workers 8
     python tools/prepare_stems.py split input_track.mp3 --output assets/music/scenes/new_scene/
+    python tools/prepare_stems.py bake-fx assets/music/scenes/enchanted_forest/
+    python tools/prepare_stems.py pack assets/music/scenes/enchanted_forest/ --dtype int16
+    python tools/prepare_stems.py verify-pack assets/music/scenes/enchanted_forest.scenepack
+    python tools/prepare_stems.py import-store assets/music/scenes/enchanted_forest/
+    python tools/prepare_stems.py analyze assets/music/scenes/enchanted_forest/
 """
 
 import argparse
+import contextlib
+import io
 import json
+import math
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 import numpy as np
 import soundfile as sf
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from adaptive_mixer.stem_fx import (  # noqa: E402
+    PEDALBOARD_AVAILABLE, baked_file_name, fx_signature, is_static, render_static_effects,
+    source_identity,
+)
+from adaptive_mixer.resample import make_resampler  # noqa: E402
+from adaptive_mixer.scene_pack import ScenePack, write_scene_pack  # noqa: E402
+from adaptive_mixer.stem_analysis import (  # noqa: E402
+    analyze_stem, load_analysis, sidecar_path, write_analysis,
+)
+from adaptive_mixer.stem_player import decode_stem  # noqa: E402
+from adaptive_mixer.stem_store import import_stem, resolve_stem_path, store_dir  # noqa: E402
 
-def verify_scene(scene_dir: str):
-    """Check that all stems in a scene have matching properties."""
+
+# Frames per read when normalizing; bounds memory for any stem length
+NORMALIZE_BLOCK_FRAMES = 1 << 16
+
+
+def inspect_scene(scene_dir: str) -> dict:
+    """
+    Check a scene's stems from their headers only (sf.info, nothing is decoded).
+
+    Returns {"scene", "name", "ok", "stems": {stem_id: properties}, "issues": [...]}.
+    """
     scene_path = Path(scene_dir)
     config_path = scene_path / "scene.json"
+    result = {"scene": str(scene_dir), "name": scene_path.name, "ok": False,
+              "stems": {}, "issues": []}
 
     if not config_path.exists():
-        print(f"ERROR: No scene.json in {scene_dir}")
-        return False
+        result["issues"].append(f"No scene.json in {scene_dir}")
+        return result
 
     with open(config_path, "r") as f:
         config = json.load(f)
+    result["name"] = config.get("name", scene_dir)
 
-    print(f"Verifying scene: {config.get('name', scene_dir)}")
-    issues = []
-    properties = {}
-
+    issues = result["issues"]
+    properties = result["stems"]
     for stem_id, stem_config in config.get("stems", {}).items():
-        file_path = scene_path / stem_config["file"]
+        file_path = resolve_stem_path(scene_dir, stem_config)
         if not file_path.exists():
-            issues.append(f"  MISSING: {stem_config['file']}")
+            issues.append(f"MISSING: {stem_config['file']}")
             continue
 
-        info = sf.info(str(file_path))
-        props = {
+        try:
+            info = sf.info(str(file_path))
+        except Exception as e:
+            issues.append(f"UNREADABLE: {stem_config['file']} ({e})")
+            continue
+        properties[stem_id] = {
             "samplerate": info.samplerate,
             "channels": info.channels,
             "frames": info.frames,
@@ -52,39 +95,98 @@ def verify_scene(scene_dir: str):
             "format": info.format,
             "subtype": info.subtype,
         }
-        properties[stem_id] = props
-        print(f"  {stem_id}: {info.samplerate}Hz, {info.channels}ch, "
-              f"{info.duration:.1f}s, {info.subtype}")
 
     if not properties:
-        print("No stems found!")
-        return False
+        issues.append("No stems found!")
+        return result
 
     srs = set(p["samplerate"] for p in properties.values())
     chs = set(p["channels"] for p in properties.values())
     durs = set(round(p["duration"], 1) for p in properties.values())
 
     if len(srs) > 1:
-        issues.append(f"  MISMATCH sample rates: {srs}")
+        issues.append(f"MISMATCH sample rates: {srs}")
     if len(chs) > 1:
-        issues.append(f"  MISMATCH channel counts: {chs}")
+        issues.append(f"MISMATCH channel counts: {chs}")
     if len(durs) > 1:
-        issues.append(f"  MISMATCH durations: {durs} "
+        issues.append(f"MISMATCH durations: {durs} "
                       f"(shortest: {min(p['duration'] for p in properties.values()):.1f}s, "
                       f"longest: {max(p['duration'] for p in properties.values()):.1f}s)")
 
-    if issues:
+    result["ok"] = not issues
+    return result
+
+
+def verify_scene(scene_dir: str):
+    """Check that all stems in a scene have matching properties."""
+    result = inspect_scene(scene_dir)
+    if not (Path(scene_dir) / "scene.json").exists():
+        print(f"ERROR: No scene.json in {scene_dir}")
+        return False
+
+    print(f"Verifying scene: {result['name']}")
+    for stem_id, props in result["stems"].items():
+        print(f"  {stem_id}: {props['samplerate']}Hz, {props['channels']}ch, "
+              f"{props['duration']:.1f}s, {props['subtype']}")
+
+    if not result["stems"]:
+        print("No stems found!")
+        return False
+
+    if result["issues"]:
         print("\nISSUES FOUND:")
-        for issue in issues:
-            print(issue)
+        for issue in result["issues"]:
+            print(f"  {issue}")
         return False
     else:
         print("\nAll stems OK!")
         return True
 
 
-def normalize_scene(scene_dir: str, target_sr: int = 44100, target_channels: int = 2):
-    """Convert all stems to matching sample rate, channels, and pad to same duration."""
+def _remap_channels(block: np.ndarray, channels: int) -> np.ndarray:
+    """Planar block to `channels`: mono is duplicated, a mixdown to mono averages."""
+    if block.shape[0] == channels:
+        return block
+    if block.shape[0] == 1:
+        return np.repeat(block, channels, axis=0)
+    return block.mean(axis=0, keepdims=True)
+
+
+def _stream_normalized(src: Path, dst: Path, target_sr: int, target_channels: int,
+                       target_frames: int):
+    """
+    Read `src` block by block, resample, remap channels, and write exactly
+    `target_frames` frames of PCM_16 to `dst`, trimming or padding with silence.
+    Memory stays at a few blocks whatever the file's length.
+    """
+    with sf.SoundFile(str(src)) as fin, \
+            sf.SoundFile(str(dst), "w", target_sr, target_channels, subtype="PCM_16") as fout:
+        resampler = make_resampler(fin.samplerate, target_sr, fin.channels)
+        scratch = np.empty((NORMALIZE_BLOCK_FRAMES, fin.channels), dtype=np.float32)
+        written = 0
+        while written < target_frames:
+            block = fin.read(NORMALIZE_BLOCK_FRAMES, dtype="float32", always_2d=True, out=scratch)
+            # At the end of the input, the resampler's filter delay still holds the last frames
+            out = resampler.process(block.T) if len(block) else resampler.flush()
+            out = _remap_channels(out, target_channels)
+            n = min(out.shape[1], target_frames - written)
+            fout.write(out[:, :n].T)
+            written += n
+            if len(block) == 0:
+                break
+        silence = np.zeros((min(NORMALIZE_BLOCK_FRAMES, target_frames - written), target_channels),
+                           dtype=np.float32)
+        while written < target_frames:
+            n = min(len(silence), target_frames - written)
+            fout.write(silence[:n])
+            written += n
+
+
+def normalize_scene(scene_dir: str, target_sr: int = 44100, target_channels: int = 2) -> list:
+    """
+    Convert all stems to matching sample rate, channels, and pad to same duration.
+    Returns the ids of the stems that were rewritten.
+    """
     scene_path = Path(scene_dir)
     config_path = scene_path / "scene.json"
 
@@ -96,7 +198,7 @@ def normalize_scene(scene_dir: str, target_sr: int = 44100, target_channels: int
     # First pass: find max duration
     max_duration = 0
     for stem_config in config.get("stems", {}).values():
-        file_path = scene_path / stem_config["file"]
+        file_path = resolve_stem_path(scene_dir, stem_config)
         if file_path.exists():
             info = sf.info(str(file_path))
             max_duration = max(max_duration, info.duration)
@@ -104,51 +206,314 @@ def normalize_scene(scene_dir: str, target_sr: int = 44100, target_channels: int
     target_frames = int(max_duration * target_sr)
     print(f"Target: {target_sr}Hz, {target_channels}ch, {max_duration:.1f}s ({target_frames} frames)")
 
+    rewritten = []
+
     for stem_id, stem_config in config.get("stems", {}).items():
+        if stem_config.get("hash"):
+            # Other scenes may share the stored file; normalize before import-store
+            print(f"  {stem_id}: In the stem store, skipping")
+            continue
         file_path = scene_path / stem_config["file"]
         if not file_path.exists():
             continue
 
-        data, sr = sf.read(str(file_path), dtype="float32", always_2d=True)
-        changed = False
-
-        if sr != target_sr:
-            print(f"  {stem_id}: Resampling {sr} -> {target_sr} Hz")
-            ratio = target_sr / sr
-            new_length = int(data.shape[0] * ratio)
-            indices = np.linspace(0, data.shape[0] - 1, new_length)
-            new_data = np.zeros((new_length, data.shape[1]), dtype=np.float32)
-            for ch in range(data.shape[1]):
-                new_data[:, ch] = np.interp(indices, np.arange(data.shape[0]), data[:, ch])
-            data = new_data
-            changed = True
-
-        if data.shape[1] != target_channels:
-            print(f"  {stem_id}: Converting {data.shape[1]}ch -> {target_channels}ch")
-            if data.shape[1] == 1 and target_channels == 2:
-                data = np.column_stack([data[:, 0], data[:, 0]])
-            elif data.shape[1] == 2 and target_channels == 1:
-                data = np.mean(data, axis=1, keepdims=True)
-            changed = True
-
-        if data.shape[0] != target_frames:
-            if data.shape[0] < target_frames:
-                print(f"  {stem_id}: Padding {data.shape[0]} -> {target_frames} frames")
-                pad = np.zeros((target_frames - data.shape[0], target_channels), dtype=np.float32)
-                data = np.vstack([data, pad])
-            else:
-                print(f"  {stem_id}: Trimming {data.shape[0]} -> {target_frames} frames")
-                data = data[:target_frames]
-            changed = True
-
-        if changed:
-            backup_path = file_path.with_suffix(file_path.suffix + ".bak")
-            if not backup_path.exists():
-                file_path.rename(backup_path)
-            sf.write(str(file_path), data, target_sr, subtype="PCM_16")
-            print(f"  {stem_id}: Saved (backup: {backup_path.name})")
-        else:
+        # Decide from the header; stems that already match are not decoded
+        info = sf.info(str(file_path))
+        frames = info.frames
+        if info.samplerate != target_sr:
+            print(f"  {stem_id}: Resampling {info.samplerate} -> {target_sr} Hz")
+            frames = int(np.ceil(frames * target_sr / info.samplerate))
+        if info.channels != target_channels:
+            if info.channels != 1 and target_channels != 1:
+                print(f"  {stem_id}: Cannot convert {info.channels}ch -> {target_channels}ch, skipping")
+                continue
+            print(f"  {stem_id}: Converting {info.channels}ch -> {target_channels}ch")
+        if frames < target_frames:
+            print(f"  {stem_id}: Padding {frames} -> {target_frames} frames")
+        elif frames > target_frames:
+            print(f"  {stem_id}: Trimming {frames} -> {target_frames} frames")
+        if (info.samplerate, info.channels, info.frames) == (target_sr, target_channels, target_frames):
             print(f"  {stem_id}: No changes needed")
+            continue
+
+        # Write next to the stem (same extension, so the same format) and swap in when done
+        tmp_path = file_path.with_name(file_path.stem + ".tmp" + file_path.suffix)
+        _stream_normalized(file_path, tmp_path, target_sr, target_channels, target_frames)
+        backup_path = file_path.with_suffix(file_path.suffix + ".bak")
+        if not backup_path.exists():
+            file_path.rename(backup_path)
+        os.replace(tmp_path, file_path)
+        print(f"  {stem_id}: Saved (backup: {backup_path.name})")
+        rewritten.append(stem_id)
+
+    # A bake rendered from the old audio no longer matches it
+    stale = [sid for sid in rewritten
+             if config.get("effects", {}).get(sid, {}).pop("baked_signature", None) is not None]
+    if stale:
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+        print(f"  Baked effects out of date: {', '.join(stale)} (run bake-fx)")
+
+    return rewritten
+
+
+# ── Whole-library runs ───────────────────────────────────────────────
+
+def default_library_path() -> str:
+    """library_path from config/mixer_config.yaml, as the app uses it."""
+    try:
+        import yaml
+        with open("config/mixer_config.yaml", "r") as f:
+            return (yaml.safe_load(f) or {}).get("library_path", "assets/music/scenes")
+    except Exception:
+        return "assets/music/scenes"
+
+
+def find_library_scenes(library_path: str) -> list:
+    """Scene folders (those with a scene.json) directly under the library."""
+    root = Path(library_path)
+    if not root.is_dir():
+        print(f"ERROR: Library not found: {library_path}")
+        sys.exit(1)
+    return sorted(str(p) for p in root.iterdir() if (p / "scene.json").is_file())
+
+
+def _normalize_task(job: tuple) -> dict:
+    """Worker: normalize one scene, keeping its log for the report."""
+    scene_dir, target_sr, target_channels = job
+    log = io.StringIO()
+    result = {"scene": scene_dir, "name": Path(scene_dir).name, "ok": True, "changed": []}
+    try:
+        with contextlib.redirect_stdout(log):
+            result["changed"] = normalize_scene(scene_dir, target_sr, target_channels)
+    except Exception as e:
+        result["ok"] = False
+        result["issues"] = [str(e)]
+    result["log"] = log.getvalue().splitlines()
+    return result
+
+
+def run_across_library(task, jobs: list, label: str, report_path: str, workers: int = 0) -> bool:
+    """
+    Run `task(job)` for every job on a process pool, printing one progress
+    line per finished scene, then write all results to a JSON report.
+    Each result needs "scene" and "ok". Returns True if every scene passed.
+    """
+    total = len(jobs)
+    workers = workers or os.cpu_count() or 1
+    print(f"{label}: {total} scene(s) on {min(workers, max(total, 1))} worker(s)")
+    start = time.perf_counter()
+    results = []
+    width = len(str(total))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(task, job): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                result = future.result()
+            except Exception as e:
+                job = futures[future]
+                scene = job[0] if isinstance(job, tuple) else job
+                result = {"scene": scene, "name": Path(scene).name, "ok": False, "issues": [str(e)]}
+            results.append(result)
+            status = "OK  " if result["ok"] else "FAIL"
+            print(f"[{done:>{width}}/{total}] {status} {Path(result['scene']).name}", flush=True)
+
+    elapsed = time.perf_counter() - start
+    results.sort(key=lambda r: r["scene"])
+    failed = [r for r in results if not r["ok"]]
+    report = {
+        "command": label,
+        "elapsed_seconds": round(elapsed, 2),
+        "scenes": total,
+        "failed": len(failed),
+        "results": results,
+    }
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for r in failed:
+        print(f"\n{Path(r['scene']).name}:")
+        for issue in r.get("issues", []):
+            print(f"  {issue}")
+    print(f"\n{total - len(failed)}/{total} scene(s) OK in {elapsed:.1f}s (report: {report_path})")
+    return not failed
+
+
+def verify_library(library_path: str, report_path: str, workers: int = 0) -> bool:
+    return run_across_library(inspect_scene, find_library_scenes(library_path),
+                              "verify-all", report_path, workers)
+
+
+def normalize_library(library_path: str, report_path: str, target_sr: int = 44100,
+                      target_channels: int = 2, workers: int = 0) -> bool:
+    jobs = [(scene, target_sr, target_channels) for scene in find_library_scenes(library_path)]
+    return run_across_library(_normalize_task, jobs, "normalize-all", report_path, workers)
+
+
+def bake_scene_fx(scene_dir: str, sample_rate: int = 44100, channels: int = 2):
+    """
+    Render each stem's static effects into "<stem>.baked.wav" and record it in
+    scene.json. Stems marked "live": true are left alone. Re-running after
+    changing an effect re-bakes only the stems whose parameters changed.
+    """
+    if not PEDALBOARD_AVAILABLE:
+        print("ERROR: pedalboard not installed. Install with: pip install pedalboard")
+        sys.exit(1)
+
+    scene_path = Path(scene_dir)
+    config_path = scene_path / "scene.json"
+
+    with open(config_path, "r") as f:
+        config = json.load(f)
+
+    print(f"Baking effects for scene: {config.get('name', scene_dir)}")
+    changed = False
+
+    for stem_id, fx_config in config.get("effects", {}).items():
+        stem_config = config.get("stems", {}).get(stem_id)
+        if not stem_config:
+            print(f"  {stem_id}: No such stem, skipping")
+            continue
+        if not is_static(fx_config):
+            print(f"  {stem_id}: Live effects, skipping")
+            continue
+
+        signature = fx_signature(fx_config, sample_rate, source_identity(scene_dir, stem_config))
+        out_name = baked_file_name(stem_config)
+        if (fx_config.get("baked_signature") == signature
+                and (scene_path / out_name).exists()):
+            print(f"  {stem_id}: Up to date")
+            continue
+
+        file_path = resolve_stem_path(scene_dir, stem_config)
+        if not file_path.exists():
+            print(f"  {stem_id}: MISSING {stem_config['file']}")
+            continue
+
+        data = decode_stem(str(file_path), sample_rate, channels)
+        rendered = render_static_effects(data, sample_rate, fx_config)
+        if rendered is None:
+            print(f"  {stem_id}: No effects to bake")
+            continue
+
+        # Float keeps reverb build-up above 0 dBFS intact; the mixer clips at the end
+        sf.write(str(scene_path / out_name), rendered.T, sample_rate, subtype="FLOAT")
+        fx_config["baked_file"] = out_name
+        fx_config["baked_signature"] = signature
+        changed = True
+        print(f"  {stem_id}: Baked -> {out_name}")
+
+    if changed:
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+        print("Updated scene.json")
+
+
+def import_scene_to_store(scene_dir: str, keep_files: bool = False):
+    """
+    Move a scene's stems into the library's content-addressed store and
+    reference them by hash in scene.json (see adaptive_mixer/stem_store.py).
+    Audio already in the store is not stored again.
+    """
+    scene_path = Path(scene_dir)
+    config_path = scene_path / "scene.json"
+
+    with open(config_path, "r") as f:
+        config = json.load(f)
+
+    store = store_dir(scene_dir)
+    print(f"Importing scene into {store}: {config.get('name', scene_dir)}")
+    added = shared = 0
+    saved_bytes = 0
+    changed = False
+
+    for stem_id, stem_config in config.get("stems", {}).items():
+        if stem_config.get("hash"):
+            print(f"  {stem_id}: Already in the store")
+            continue
+        file_path = scene_path / stem_config["file"]
+        if not file_path.exists():
+            print(f"  {stem_id}: MISSING {stem_config['file']}")
+            continue
+
+        size = file_path.stat().st_size
+        analysis = load_analysis(file_path)
+        content, is_new = import_stem(store, file_path, keep_original=keep_files)
+        stem_config["hash"] = content
+        changed = True
+        # The analysis describes the same audio: keep it with the stored copy
+        stored = resolve_stem_path(scene_dir, stem_config)
+        if analysis is not None and load_analysis(stored) is None:
+            write_analysis(stored, analysis)
+        if not keep_files and sidecar_path(file_path).exists():
+            sidecar_path(file_path).unlink()
+        if is_new:
+            added += 1
+            print(f"  {stem_id}: Stored as {content}")
+        else:
+            shared += 1
+            if not keep_files:
+                saved_bytes += size
+            print(f"  {stem_id}: Same audio already stored ({content})")
+
+    if changed:
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+        print("Updated scene.json")
+    print(f"{added} stem(s) stored, {shared} shared with other scenes "
+          f"({saved_bytes / (1024 * 1024):.1f} MB saved)")
+
+
+def analyze_scene(scene_dir: str, force: bool = False):
+    """
+    Write a loudness/peak/waveform sidecar for every stem (see
+    adaptive_mixer/stem_analysis.py). Stems with an up-to-date sidecar are
+    skipped unless `force`.
+    """
+    scene_path = Path(scene_dir)
+    with open(scene_path / "scene.json", "r") as f:
+        config = json.load(f)
+
+    print(f"Analysing scene: {config.get('name', scene_dir)}")
+    for stem_id, stem_config in config.get("stems", {}).items():
+        file_path = resolve_stem_path(scene_dir, stem_config)
+        if not file_path.exists():
+            print(f"  {stem_id}: MISSING {stem_config['file']}")
+            continue
+        analysis = None if force else load_analysis(file_path)
+        if analysis is None:
+            analysis = analyze_stem(str(file_path))
+            write_analysis(file_path, analysis)
+            status = "analysed"
+        else:
+            status = "up to date"
+        loudness = "n/a" if analysis.loudness is None else f"{analysis.loudness:.1f} LUFS"
+        print(f"  {stem_id}: {loudness}, true peak {analysis.true_peak:.1f} dBTP, "
+              f"trim {20 * math.log10(analysis.gain()):+.1f} dB ({status})")
+
+
+def pack_scene(scene_dir: str, output: str = None, sample_rate: int = 44100,
+               channels: int = 2, dtype: str = "float32"):
+    """Write a scene directory as a single .scenepack (see adaptive_mixer/scene_pack.py)."""
+    print(f"Packing scene: {scene_dir} ({dtype})")
+    out = write_scene_pack(scene_dir, output, sample_rate, channels, dtype, progress=print)
+    size_mb = Path(out).stat().st_size / (1024 * 1024)
+    print(f"Wrote {out} ({size_mb:.1f} MB)")
+    return out
+
+
+def verify_pack(pack_path: str) -> bool:
+    """Check every block of a .scenepack against its checksum."""
+    pack = ScenePack(pack_path)
+    print(f"Verifying pack: {pack.header.get('name', pack_path)} "
+          f"({pack.sample_rate}Hz, {pack.channels}ch, {pack.dtype})")
+    bad = pack.verify()
+    if bad:
+        print("\nCORRUPT blocks: " + ", ".join(bad))
+        return False
+    print(f"\nAll {len(pack.header['stems']) + len(pack.header.get('beds', {}))} blocks OK!")
+    return True
 
 
 def split_with_demucs(input_file: str, output_dir: str, model: str = "htdemucs_ft"):
@@ -276,11 +641,47 @@ if __name__ == "__main__":
     norm_p.add_argument("--sr", type=int, default=44100)
     norm_p.add_argument("--channels", type=int, default=2)
 
+    vall_p = sub.add_parser("verify-all", help="Verify every scene in the library (headers only)")
+    vall_p.add_argument("library", nargs="?", default=None, help="Default: library_path from mixer_config.yaml")
+    vall_p.add_argument("--workers", type=int, default=0, help="Default: one per CPU")
+    vall_p.add_argument("--report", default="verify_report.json")
+
+    nall_p = sub.add_parser("normalize-all", help="Normalize every scene in the library")
+    nall_p.add_argument("library", nargs="?", default=None, help="Default: library_path from mixer_config.yaml")
+    nall_p.add_argument("--sr", type=int, default=44100)
+    nall_p.add_argument("--channels", type=int, default=2)
+    nall_p.add_argument("--workers", type=int, default=0, help="Default: one per CPU")
+    nall_p.add_argument("--report", default="normalize_report.json")
+
     split_p = sub.add_parser("split", help="Split a track with Demucs")
     split_p.add_argument("input_file")
     split_p.add_argument("--output", default="assets/music/scenes/new_scene/")
     split_p.add_argument("--model", default="htdemucs_ft")
 
+    bake_p = sub.add_parser("bake-fx", help="Pre-render static per-stem effects")
+    bake_p.add_argument("scene_dir")
+    bake_p.add_argument("--sr", type=int, default=44100)
+    bake_p.add_argument("--channels", type=int, default=2)
+
+    pack_p = sub.add_parser("pack", help="Write a scene as one mmap-loadable .scenepack")
+    pack_p.add_argument("scene_dir")
+    pack_p.add_argument("--output", default=None, help="Default: <scene_dir>.scenepack")
+    pack_p.add_argument("--sr", type=int, default=44100)
+    pack_p.add_argument("--channels", type=int, default=2)
+    pack_p.add_argument("--dtype", choices=["float32", "int16"], default="float32")
+
+    vpack_p = sub.add_parser("verify-pack", help="Check a .scenepack's checksums")
+    vpack_p.add_argument("pack_file")
+
+    analyze_p = sub.add_parser("analyze", help="Write loudness/peak/waveform sidecars for each stem")
+    analyze_p.add_argument("scene_dir")
+    analyze_p.add_argument("--force", action="store_true", help="Re-analyse up-to-date stems")
+
+    store_p = sub.add_parser("import-store", help="Move stems into the shared content-addressed store")
+    store_p.add_argument("scene_dir")
+    store_p.add_argument("--keep-files", action="store_true",
+                         help="Leave the scene's own copies in place")
+
     test_p = sub.add_parser("create-test", help="Generate a test scene with synthesized tones")
     test_p.add_argument("--output", default="assets/music/scenes/test_scene/")
     test_p.add_argument("--bpm", type=float, default=120.0)
@@ -292,8 +693,26 @@ if __name__ == "__main__":
         verify_scene(args.scene_dir)
     elif args.command == "normalize":
         normalize_scene(args.scene_dir, args.sr, args.channels)
+    elif args.command == "verify-all":
+        if not verify_library(args.library or default_library_path(), args.report, args.workers):
+            sys.exit(1)
+    elif args.command == "normalize-all":
+        if not normalize_library(args.library or default_library_path(), args.report,
+                                 args.sr, args.channels, args.workers):
+            sys.exit(1)
     elif args.command == "split":
         split_with_demucs(args.input_file, args.output, args.model)
+    elif args.command == "bake-fx":
+        bake_scene_fx(args.scene_dir, args.sr, args.channels)
+    elif args.command == "pack":
+        pack_scene(args.scene_dir, args.output, args.sr, args.channels, args.dtype)
+    elif args.command == "verify-pack":
+        if not verify_pack(args.pack_file):
+            sys.exit(1)
+    elif args.command == "analyze":
+        analyze_scene(args.scene_dir, args.force)
+    elif args.command == "import-store":
+        import_scene_to_store(args.scene_dir, args.keep_files)
     elif args.command == "create-test":
         create_test_scene(args.output, args.bpm, args.duration)
     else: